@@ -2,4 +2,9 @@
 Weekend Overtime Management FastAPI Backend
 """
 
+import time
+
 __version__ = "1.0.0"
+
+# Taken before any submodule loads; main.py reports the "import" start-up phase from it.
+IMPORT_STARTED = time.perf_counter()
@@ -0,0 +1,86 @@
+"""Maintenance commands, run from the backend directory:
+
+    python -m app.commands rebuild-rollups
+    python -m app.commands check-summary
+    python -m app.commands rebuild-summary
+"""
+
+import argparse
+import logging
+import sys
+from typing import Optional, Sequence
+
+from .database import Base, SessionLocal, engine
+from .migrations import run_migrations
+from .services.overtime import check_department_summary, rebuild_department_summary
+from .services.reports import rebuild_monthly_rollups
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_rollups() -> int:
+    """Recompute the monthly rollups from overtime_history."""
+    db = SessionLocal()
+    try:
+        staff_rows, department_rows = rebuild_monthly_rollups(db)
+    finally:
+        db.close()
+    print(
+        f"Rebuilt monthly rollups: {staff_rows} staff rows, "
+        f"{department_rows} department rows"
+    )
+    return 0
+
+
+def check_summary() -> int:
+    """Recount department_day_summary and report drift; exit 1 if any."""
+    db = SessionLocal()
+    try:
+        drift = check_department_summary(db)
+    finally:
+        db.close()
+    for entry in drift:
+        print(
+            f"department {entry['department_id']} {entry['day']}: "
+            f"expected {entry['expected']}, found {entry['actual']} "
+            "(total, internal, trip)"
+        )
+    if drift:
+        print(f"{len(drift)} drifted summary rows; run rebuild-summary to fix")
+        return 1
+    print("department_day_summary is consistent")
+    return 0
+
+
+def rebuild_summary() -> int:
+    """Recompute department_day_summary from staffs and overtime_weeks."""
+    db = SessionLocal()
+    try:
+        rows = rebuild_department_summary(db)
+    finally:
+        db.close()
+    print(f"Rebuilt department_day_summary: {rows} rows")
+    return 0
+
+
+COMMANDS = {
+    "rebuild-rollups": rebuild_rollups,
+    "check-summary": check_summary,
+    "rebuild-summary": rebuild_summary,
+}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.commands")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    # Same schema preparation as the API start-up.
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    return COMMANDS[args.command]()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
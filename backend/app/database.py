@@ -1,7 +1,12 @@
 import os
-from sqlalchemy import create_engine
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, List, Optional, TypeVar, Union
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 import sqlite3
 from datetime import datetime, timedelta
 
@@ -12,11 +17,103 @@ except Exception:
 
 # SQLite database configuration - support both common env var names
 SQLITE_DATABASE_URL = os.environ.get(
-    "SQLITE_DATABASE_URL", 
+    "SQLITE_DATABASE_URL",
     os.environ.get("DATABASE_URL", "sqlite:///./database/weekend-overtime.sqlite")
 )
 
-# Create engine with WAL mode for better concurrency
+
+def _async_url(url: str) -> str:
+    """Map a sync SQLite URL onto the aiosqlite driver."""
+    parsed = make_url(url)
+    if parsed.drivername in ("sqlite", "sqlite+pysqlite"):
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.environ.get(
+    "ASYNC_DATABASE_URL", _async_url(SQLITE_DATABASE_URL)
+)
+
+
+def _env_value(name: str, default: Optional[str]) -> Optional[str]:
+    """Read an env override; an empty value disables the pragma."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    value = value.strip()
+    return value or None
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    value = _env_value(name, None if default is None else str(default))
+    return None if value is None else int(value)
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    """Per-connection SQLite pragmas applied when a connection is opened.
+
+    ``None`` leaves the SQLite default in place for that pragma.
+    """
+
+    journal_mode: Optional[str] = "WAL"
+    synchronous: Optional[str] = "NORMAL"
+    mmap_size: Optional[int] = 256 * 1024 * 1024
+    # Negative values are KiB (here 64 MiB), positive values are pages.
+    cache_size: Optional[int] = -64000
+    temp_store: Optional[str] = "MEMORY"
+    busy_timeout: Optional[int] = 20000
+
+    @classmethod
+    def from_env(cls) -> "SQLiteProfile":
+        """Build the profile from ``SQLITE_*`` environment overrides."""
+        default = cls()
+        return cls(
+            journal_mode=_env_value("SQLITE_JOURNAL_MODE", default.journal_mode),
+            synchronous=_env_value("SQLITE_SYNCHRONOUS", default.synchronous),
+            mmap_size=_env_int("SQLITE_MMAP_SIZE", default.mmap_size),
+            cache_size=_env_int("SQLITE_CACHE_SIZE", default.cache_size),
+            temp_store=_env_value("SQLITE_TEMP_STORE", default.temp_store),
+            busy_timeout=_env_int("SQLITE_BUSY_TIMEOUT_MS", default.busy_timeout),
+        )
+
+    def pragmas(self) -> List[str]:
+        """Return the PRAGMA statements for this profile, in apply order."""
+        # busy_timeout goes first so switching journal_mode can wait on locks.
+        values = (
+            ("busy_timeout", self.busy_timeout),
+            ("journal_mode", self.journal_mode),
+            ("synchronous", self.synchronous),
+            ("mmap_size", self.mmap_size),
+            ("cache_size", self.cache_size),
+            ("temp_store", self.temp_store),
+        )
+        return [f"PRAGMA {name}={value}" for name, value in values if value is not None]
+
+
+def apply_sqlite_profile(dbapi_connection: Any, profile: SQLiteProfile) -> None:
+    """Apply ``profile`` to a raw DB-API SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for statement in profile.pragmas():
+            cursor.execute(statement)
+    finally:
+        cursor.close()
+
+
+def install_sqlite_profile(target_engine: Engine, profile: SQLiteProfile) -> None:
+    """Apply ``profile`` to every new connection opened by ``target_engine``."""
+    if target_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(target_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_sqlite_profile(dbapi_connection, profile)
+
+
+SQLITE_PROFILE = SQLiteProfile.from_env()
+
+# Create engine; WAL and the rest of the profile are applied per connection
 engine = create_engine(
     SQLITE_DATABASE_URL,
     connect_args={
@@ -26,21 +123,94 @@ engine = create_engine(
     },
     pool_pre_ping=True,
 )
+install_sqlite_profile(engine, SQLITE_PROFILE)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for request handlers: queries run on aiosqlite's worker thread,
+# so a slow statement no longer stalls the event loop.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    connect_args={
+        "timeout": 20,
+        "isolation_level": None,
+    },
+    pool_pre_ping=True,
+)
+install_sqlite_profile(async_engine.sync_engine, SQLITE_PROFILE)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 # Base class for models
 Base = declarative_base()
 
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
+def begin_write_transaction(db: Session) -> None:
+    """Open an explicit ``BEGIN IMMEDIATE`` on the session's connection.
+
+    The engine runs the driver with ``isolation_level=None``, so without this
+    every statement commits (and fsyncs) on its own. Taking the write lock up
+    front also avoids ``SQLITE_BUSY_SNAPSHOT`` when a read is later upgraded
+    to a write. The session's ``commit()``/``rollback()`` end the transaction.
+    """
+    pooled = db.connection().connection
+    if pooled.driver_connection.in_transaction:
+        return
+    cursor = pooled.dbapi_connection.cursor()
     try:
-        yield db
+        cursor.execute("BEGIN IMMEDIATE")
     finally:
-        db.close()
+        cursor.close()
+
+
+# Session.info flag set on the write queue's session: units share one
+# transaction, so they must not commit or roll back on their own.
+GROUP_COMMIT = "group_commit"
+
+
+def commit_session(db: Session) -> None:
+    """Commit ``db``, or only flush it when the write queue owns the commit."""
+    if db.info.get(GROUP_COMMIT):
+        db.flush()
+    else:
+        db.commit()
+
+
+def rollback_session(db: Session) -> None:
+    """Roll back ``db`` unless the write queue owns the transaction.
+
+    Inside the queue the failing unit's exception propagates and only its
+    savepoint is rolled back, leaving the rest of the batch intact.
+    """
+    if not db.info.get(GROUP_COMMIT):
+        db.rollback()
+
+
+# Dependency to get DB session
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+T = TypeVar("T")
+
+
+async def run_db(
+    db: Union[AsyncSession, Session], fn: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Run sync service code ``fn(session, *args, **kwargs)`` without blocking the loop.
+
+    Services stay written against the sync ``Session`` API. On an
+    ``AsyncSession`` they run through ``run_sync`` so every statement is
+    awaited on aiosqlite; a plain ``Session`` (scripts, test overrides) is
+    handed to the threadpool instead.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
 
 
 def get_china_day():
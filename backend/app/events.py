@@ -0,0 +1,152 @@
+"""In-process pub/sub for change events, streamed to browsers over SSE.
+
+Write paths call :func:`queue_event` on their session. Events wait in
+``Session.info`` and are published only after the transaction commits. A
+rollback drops them, and so does a failed write-queue unit (its savepoint
+is rolled back). Each subscriber owns a bounded ``asyncio.Queue``. A
+subscriber that falls behind loses its backlog and gets a single
+``resync`` event telling it to refetch a snapshot. One slow browser never
+grows memory or holds up the others.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+EVENT_QUEUE_SIZE = int(os.environ.get("EVENT_QUEUE_SIZE", "256"))
+
+# Session.info key holding events buffered until commit.
+PENDING_EVENTS = "pending_events"
+
+Event = Dict[str, Any]
+
+
+def queue_event(db: Session, event_type: str, **fields: Any) -> None:
+    """Buffer an event on ``db``; it is published once the transaction commits."""
+    # Make sure a transaction is open so a later rollback() clears the event.
+    db.connection()
+    pending: Dict[tuple, Event] = db.info.setdefault(PENDING_EVENTS, {})
+    item = {"type": event_type, **fields}
+    # Repeated touches of the same row in one transaction collapse into one.
+    pending.setdefault(tuple(item.items()), item)
+
+
+def pending_count(db: Session) -> int:
+    return len(db.info.get(PENDING_EVENTS, ()))
+
+
+def discard_events_after(db: Session, count: int) -> None:
+    """Drop events buffered after the first ``count`` (a rolled-back savepoint)."""
+    pending = db.info.get(PENDING_EVENTS)
+    if pending is not None and len(pending) > count:
+        db.info[PENDING_EVENTS] = dict(list(pending.items())[:count])
+
+
+class Subscription:
+    """One connected client: a bounded queue filled on the event loop."""
+
+    def __init__(self, maxsize: int):
+        self.queue: "asyncio.Queue[Event]" = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, item: Event) -> None:
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync"})
+
+    async def get(self) -> Event:
+        return await self.queue.get()
+
+    def drain(self, limit: int) -> List[Event]:
+        """Return up to ``limit`` already-queued events without waiting."""
+        items: List[Event] = []
+        while len(items) < limit and not self.queue.empty():
+            items.append(self.queue.get_nowait())
+        return items
+
+
+class EventBroker:
+    """Fan events out to subscribers on their event loops."""
+
+    def __init__(self, queue_size: int = EVENT_QUEUE_SIZE):
+        self._queue_size = max(1, queue_size)
+        self._subscribers: Dict[asyncio.AbstractEventLoop, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[Subscription]:
+        loop = asyncio.get_running_loop()
+        subscription = Subscription(self._queue_size)
+        with self._lock:
+            self._subscribers.setdefault(loop, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                subs = self._subscribers.get(loop)
+                if subs is not None:
+                    subs.discard(subscription)
+                    if not subs:
+                        del self._subscribers[loop]
+
+    def publish(self, events: List[Event]) -> None:
+        """Deliver ``events`` to every subscriber; safe from any thread."""
+        if not events:
+            return
+        self.published += len(events)
+        with self._lock:
+            loops = list(self._subscribers)
+        # One wakeup per loop, not per subscriber.
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(self._fan_out, loop, events)
+            except RuntimeError:
+                # Loop already closed; its subscribers are gone with it.
+                pass
+
+    def _fan_out(self, loop: asyncio.AbstractEventLoop, events: List[Event]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(loop, ()))
+        for subscription in subscribers:
+            for item in events:
+                subscription.offer(item)
+
+
+broker = EventBroker()
+
+
+# Savepoints fire these hooks too; only the outermost transaction counts.
+# Whoever rolls back a savepoint trims its events with discard_events_after.
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    pending: Optional[Dict[tuple, Event]] = session.info.pop(PENDING_EVENTS, None)
+    if pending:
+        broker.publish(list(pending.values()))
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending(session: Session, transaction: Any) -> None:
+    # Runs after after_commit, so anything left here was rolled back.
+    if transaction.nested or transaction.parent is not None:
+        return
+    session.info.pop(PENDING_EVENTS, None)
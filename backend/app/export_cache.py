@@ -0,0 +1,202 @@
+"""Content-addressed cache of rendered export PDFs.
+
+Keys are digests of everything that goes into a PDF (see
+``services.exports.export_digest``). The same key therefore always means
+the same bytes and needs no invalidation. Recently used PDFs stay in memory
+up to ``EXPORT_CACHE_MEMORY_MB``. Older ones spill to ``EXPORT_CACHE_DIR``
+and are evicted from there, least recently used first, once the directory
+holds more than ``EXPORT_CACHE_DISK_MB``. The directory survives restarts
+and is indexed on first use. Recency on disk is the file's mtime.
+"""
+
+from collections import OrderedDict
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CACHE_ENABLED = os.environ.get("EXPORT_CACHE_ENABLED", "1") not in (
+    "0",
+    "false",
+    "",
+)
+EXPORT_CACHE_MEMORY_MB = float(os.environ.get("EXPORT_CACHE_MEMORY_MB", "16"))
+# Empty to keep the cache in memory only.
+EXPORT_CACHE_DIR = os.environ.get("EXPORT_CACHE_DIR", os.path.join("cache", "exports"))
+EXPORT_CACHE_DISK_MB = float(os.environ.get("EXPORT_CACHE_DISK_MB", "256"))
+
+_KEY = re.compile(r"^[0-9a-f]{16,128}$")
+_SUFFIX = ".pdf"
+
+
+class ExportCache:
+    """LRU of PDF bytes by content key, in memory first and then on disk."""
+
+    def __init__(
+        self,
+        memory_bytes: int,
+        directory: Optional[str] = None,
+        disk_bytes: int = 0,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.memory_bytes = max(0, memory_bytes)
+        self.directory = directory or None
+        self.disk_bytes = max(0, disk_bytes) if self.directory else 0
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_size = 0
+        self._disk: Optional["OrderedDict[str, int]"] = None
+        self._disk_size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.spills = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        """The PDF stored under ``key``, promoted to memory, or ``None``."""
+        if not self.enabled or not _KEY.match(key):
+            return None
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return data
+            data = self._read_disk(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, data)
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if not self.enabled or not _KEY.match(key):
+            return
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return
+            self._remember(key, data)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            disk = self._disk or {}
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_size,
+                "disk_entries": len(disk),
+                "disk_bytes": self._disk_size,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "spills": self.spills,
+                "evictions": self.evictions,
+            }
+
+    def clear(self) -> None:
+        """Drop every entry, in memory and on disk."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+            for key in list(self._disk_index()):
+                self._remove_file(key)
+            self._disk = OrderedDict()
+            self._disk_size = 0
+
+    def _remember(self, key: str, data: bytes) -> None:
+        self._memory[key] = data
+        self._memory_size += len(data)
+        while self._memory_size > self.memory_bytes and self._memory:
+            old_key, old_data = self._memory.popitem(last=False)
+            self._memory_size -= len(old_data)
+            self._spill(old_key, old_data)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def _disk_index(self) -> "OrderedDict[str, int]":
+        """Files already in the directory by key, oldest first (loaded once)."""
+        if self._disk is not None:
+            return self._disk
+        found = []
+        if self.disk_bytes and os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                key = entry.name[: -len(_SUFFIX)]
+                if entry.name.endswith(_SUFFIX) and _KEY.match(key):
+                    stat = entry.stat()
+                    found.append((stat.st_mtime, key, stat.st_size))
+        found.sort()
+        self._disk = OrderedDict((key, size) for _, key, size in found)
+        self._disk_size = sum(self._disk.values())
+        self._trim_disk()
+        return self._disk
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        disk = self._disk_index()
+        if key not in disk:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as handle:
+                data = handle.read()
+            os.utime(path)
+        except OSError:
+            # Removed behind our back (another worker's eviction, cleanup).
+            self._disk_size -= disk.pop(key)
+            return None
+        disk.move_to_end(key)
+        return data
+
+    def _spill(self, key: str, data: bytes) -> None:
+        """Move an entry leaving memory to disk, or drop it when there is no room."""
+        disk = self._disk_index()
+        if key in disk:
+            disk.move_to_end(key)
+            return
+        if len(data) > self.disk_bytes:
+            self.evictions += 1
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temporary = f"{path}.{threading.get_ident()}.tmp"
+            with open(temporary, "wb") as handle:
+                handle.write(data)
+            os.replace(temporary, path)
+        except OSError:
+            logger.exception("Failed to spill export %s to %s", key, self.directory)
+            self.evictions += 1
+            return
+        disk[key] = len(data)
+        self._disk_size += len(data)
+        self.spills += 1
+        self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        while self._disk and self._disk_size > self.disk_bytes:
+            old_key, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            self._remove_file(old_key)
+            self.evictions += 1
+
+    def _remove_file(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.exception("Failed to evict cached export %s", key)
+
+
+export_cache = ExportCache(
+    memory_bytes=int(EXPORT_CACHE_MEMORY_MB * 1024 * 1024),
+    directory=EXPORT_CACHE_DIR,
+    disk_bytes=int(EXPORT_CACHE_DISK_MB * 1024 * 1024),
+    enabled=EXPORT_CACHE_ENABLED,
+)
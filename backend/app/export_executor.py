@@ -0,0 +1,166 @@
+"""Bounded worker pool for PDF export rendering.
+
+Rendering an export is CPU-bound reportlab work. It runs on a small pool of
+its own so it neither blocks the event loop nor takes over the shared
+threadpool that sync routes and ``run_db`` use. The pool admits at most
+``workers + queue_depth`` exports at a time. Further submissions raise
+:class:`ExportBusy` at once, and the route answers 503 with a
+``Retry-After`` estimated from recent render times. The executor also keeps
+counters and queue-wait / render timings for ``GET /api/exports/metrics``.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+EXPORT_WORKERS = int(os.environ.get("EXPORT_WORKERS", "2"))
+EXPORT_QUEUE_DEPTH = int(os.environ.get("EXPORT_QUEUE_DEPTH", "8"))
+
+
+class ExportBusy(Exception):
+    """The executor already holds as many exports as it admits."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Export queue is full; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class Timing:
+    """Count, mean and maximum of a duration in milliseconds."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def add(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.avg_ms, 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class ExportExecutor:
+    """Run export renders on ``workers`` threads.
+
+    Up to ``queue_depth`` more wait for a thread; anything beyond is rejected.
+    """
+
+    def __init__(
+        self, workers: int = EXPORT_WORKERS, queue_depth: int = EXPORT_QUEUE_DEPTH
+    ):
+        self.workers = max(1, workers)
+        self.queue_depth = max(0, queue_depth)
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.queue_wait = Timing()
+        self.render = Timing()
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_depth
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """Queue ``fn(*args, **kwargs)``, or raise :class:`ExportBusy` when full.
+
+        The pool threads start on first use.
+        """
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected += 1
+                raise ExportBusy(self._retry_after())
+            self._in_flight += 1
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="export"
+                )
+            pool = self._pool
+        try:
+            return pool.submit(self._run, time.perf_counter(), fn, args, kwargs)
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Submit a render and await its result from the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_depth": self.queue_depth,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - self.workers),
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "queue_wait": self.queue_wait.as_dict(),
+                "render": self.render.as_dict(),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Finish queued renders and stop the pool; a later submit starts a new one."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    def _run(self, queued: float, fn: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        started = time.perf_counter()
+        succeeded = False
+        try:
+            result = fn(*args, **kwargs)
+            succeeded = True
+            return result
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._in_flight -= 1
+                self.queue_wait.add((started - queued) * 1000)
+                self.render.add((finished - started) * 1000)
+                if succeeded:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+            logger.debug(
+                "Export waited %.1f ms, rendered in %.1f ms",
+                (started - queued) * 1000,
+                (finished - started) * 1000,
+            )
+
+    def _retry_after(self) -> int:
+        """Seconds until a slot is likely free.
+
+        Estimated as the queue ahead of the caller at the mean render time.
+        """
+        rounds = (self._in_flight - self.workers + 1) / self.workers
+        return max(1, math.ceil(rounds * self.render.avg_ms / 1000))
+
+
+export_executor = ExportExecutor()
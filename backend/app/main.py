@@ -1,35 +1,97 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import logging
 import os
+import time
+from sqlalchemy import text
 
-from .routers import departments, staffs, overtime, info, exports
+from . import IMPORT_STARTED
+from .routers import departments, staffs, overtime, info, exports, events, reports
 from .database import engine, Base, SessionLocal
-from .services import overtime as overtime_service
+from .export_executor import export_executor
+from .migrations import run_migrations
+from .services.changes import compact_change_journal
+from .services.exports import warm_up as warm_up_exports
+from .startup import STARTUP_PHASES, phase, record_phase
+from .write_queue import WRITE_QUEUE_ENABLED, write_queue
 
 logger = logging.getLogger(__name__)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+CHANGE_JOURNAL_COMPACT_SECONDS = float(
+    os.environ.get("CHANGE_JOURNAL_COMPACT_SECONDS", "3600")
+)
+# Import reportlab and load the export template in the background after
+# start-up, so the first export does not pay for it.
+EXPORT_WARMUP = os.environ.get("EXPORT_WARMUP", "1") not in ("0", "false", "")
+STATIC_DIRECTORY = "static"
+
 
-db = None
-try:
+def _compact_with_own_session():
     db = SessionLocal()
-    overtime_service.backfill_overtime_weeks(db)
-except Exception:
-    logger.exception("Failed to backfill overtime weeks")
-finally:
-    if db:
+    try:
+        return compact_change_journal(db)
+    finally:
+        db.close()
+
+
+async def _compact_change_journal_periodically():
+    while True:
         try:
-            db.close()
+            if write_queue.running:
+                await write_queue.run(compact_change_journal)
+            else:
+                await asyncio.to_thread(_compact_with_own_session)
         except Exception:
-            pass
+            logger.exception("Failed to compact change journal")
+        await asyncio.sleep(CHANGE_JOURNAL_COMPACT_SECONDS)
+
+
+async def _warm_up_exports():
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(warm_up_exports)
+    except Exception:
+        logger.exception("Failed to warm up exports")
+        return
+    record_phase("export_warmup", started)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    with phase("schema"):
+        Base.metadata.create_all(bind=engine)
+    with phase("migrations"):
+        run_migrations(engine)
+    with phase("static"):
+        os.makedirs(STATIC_DIRECTORY, exist_ok=True)
+    if WRITE_QUEUE_ENABLED:
+        with phase("write_queue"):
+            write_queue.start()
+    record_phase("startup", started)
+
+    tasks = []
+    if CHANGE_JOURNAL_COMPACT_SECONDS > 0:
+        tasks.append(asyncio.create_task(_compact_change_journal_periodically()))
+    if EXPORT_WARMUP:
+        tasks.append(asyncio.create_task(_warm_up_exports()))
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        write_queue.stop()
+        export_executor.shutdown(wait=False)
+
 
 app = FastAPI(
     title="Weekend Overtime Management API",
     description="API for managing weekend overtime schedules",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -50,11 +112,13 @@ app.include_router(staffs.router, prefix="/api/staffs", tags=["staffs"])
 app.include_router(overtime.router, prefix="/api/overtime", tags=["overtime"])
 app.include_router(info.router, prefix="/api/info", tags=["info"])
 app.include_router(exports.router, prefix="/api/exports", tags=["exports"])
+app.include_router(events.router, prefix="/api/events", tags=["events"])
+app.include_router(reports.router, prefix="/api/reports", tags=["reports"])
 
-# Serve static files (for production)
-# Create static directory if it doesn't exist
-os.makedirs("static", exist_ok=True)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Serve static files (for production); the lifespan creates the directory.
+app.mount(
+    "/static", StaticFiles(directory=STATIC_DIRECTORY, check_dir=False), name="static"
+)
 
 
 @app.get("/")
@@ -62,6 +126,27 @@ async def root():
     return {"message": "Weekend Overtime Management API"}
 
 
+@app.get("/health")
+def health():
+    """Liveness, database reachability and start-up phase timings (ms)."""
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        database = "ok"
+    except Exception:
+        logger.exception("Health check could not reach the database")
+        database = "unavailable"
+    return {
+        "status": "ok" if database == "ok" else "degraded",
+        "database": database,
+        "version": app.version,
+        "startup": dict(STARTUP_PHASES),
+    }
+
+
+record_phase("import", IMPORT_STARTED)
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,306 @@
+"""Schema migrations for existing databases.
+
+``Base.metadata.create_all`` only creates missing tables; it never adds
+indexes or columns to tables that already exist. The steps here bring older
+database files up to the current models.
+
+Each step runs once per database: applied versions are recorded in
+``schema_migrations``, and a start-up that finds every version recorded
+returns after a single read. Steps are still written to be idempotent, as
+databases from before the version table run all of them once.
+"""
+
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+import logging
+from typing import Iterator, List, Set
+
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from .database import engine
+from .models.change_journal import change_journal_triggers
+from .models.data_version import data_version_triggers
+from .models.department_summary import (
+    department_summary_triggers,
+    rebuild_department_summary_sql,
+)
+from .models.monthly_rollup import rebuild_monthly_rollups_sql
+from .models.overtime import (
+    DAY_COLUMNS,
+    STATUS_CODES,
+    OvertimeWeek,
+    overtime_weeks_view_sql,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def _write_transaction(target_engine: Engine) -> Iterator[Connection]:
+    """Yield a connection holding ``BEGIN IMMEDIATE`` until the block ends."""
+    with target_engine.connect() as conn:
+        if not conn.connection.driver_connection.in_transaction:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def _unique_department_operations(conn: Connection) -> None:
+    """Drop duplicate (department_name, date) rows, then add the unique index."""
+    removed = conn.exec_driver_sql(
+        """
+        DELETE FROM department_operations
+        WHERE id NOT IN (
+            SELECT id FROM (
+                SELECT
+                    id,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY department_name, date
+                        ORDER BY last_updated DESC, id DESC
+                    ) AS rn
+                FROM department_operations
+            )
+            WHERE rn = 1
+        )
+        """
+    ).rowcount
+    if removed:
+        logger.info("Removed %s duplicate department operation rows", removed)
+    conn.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_department_operations_department_date "
+        "ON department_operations (department_name, date)"
+    )
+
+
+def _department_operation_ids(conn: Connection) -> None:
+    """Add department_operations.department_id and backfill it from names."""
+    columns = {
+        row[1]
+        for row in conn.exec_driver_sql("PRAGMA table_info(department_operations)")
+    }
+    if "department_id" not in columns:
+        conn.exec_driver_sql(
+            "ALTER TABLE department_operations "
+            "ADD COLUMN department_id INTEGER REFERENCES departments (id)"
+        )
+    filled = conn.exec_driver_sql(
+        """
+        UPDATE department_operations
+        SET department_id = (
+            SELECT d.id FROM departments d
+            WHERE d.name = department_operations.department_name
+        )
+        WHERE department_id IS NULL
+          AND department_name IN (SELECT name FROM departments)
+        """
+    ).rowcount
+    if filled:
+        logger.info("Backfilled department_id on %s department operation rows", filled)
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_department_operations_department_id_date "
+        "ON department_operations (department_id, date)"
+    )
+
+
+def _staff_department_index(conn: Connection) -> None:
+    """Index staffs by (department_id, name) for per-department lookups."""
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_staffs_department_id_name "
+        "ON staffs (department_id, name)"
+    )
+
+
+def _compact_overtime_weeks(conn: Connection) -> None:
+    """Rebuild overtime_weeks with small-int status codes instead of 'bg-N' text.
+
+    SQLite cannot change a column's type in place, so this follows the
+    create-copy-drop-rename recipe. Triggers and views that mention the
+    table are dropped first and recreated afterwards.
+    """
+    columns = {
+        row[1]: row[2]
+        for row in conn.exec_driver_sql("PRAGMA table_info(overtime_weeks)")
+    }
+    if not columns or "INT" in columns.get("mon", "").upper():
+        return
+
+    dependents = conn.exec_driver_sql(
+        "SELECT type, name FROM sqlite_master "
+        "WHERE type IN ('trigger', 'view') AND sql LIKE '%overtime_weeks%'"
+    ).fetchall()
+    for kind, name in dependents:
+        conn.exec_driver_sql(f'DROP {kind.upper()} IF EXISTS "{name}"')
+
+    table = OvertimeWeek.__table__
+    create = str(CreateTable(table).compile(dialect=conn.dialect))
+    conn.exec_driver_sql(
+        create.replace("TABLE overtime_weeks ", "TABLE overtime_weeks_compact ", 1)
+    )
+    decode = " ".join(
+        f"WHEN '{label}' THEN {code}" for label, code in STATUS_CODES.items()
+    )
+    days = ", ".join(DAY_COLUMNS)
+    cases = ", ".join(f"CASE {day} {decode} ELSE 0 END" for day in DAY_COLUMNS)
+    copied = conn.exec_driver_sql(
+        f"INSERT INTO overtime_weeks_compact (id, staff_id, {days}) "
+        f"SELECT id, staff_id, {cases} FROM overtime_weeks"
+    ).rowcount
+    conn.exec_driver_sql("DROP TABLE overtime_weeks")
+    conn.exec_driver_sql("ALTER TABLE overtime_weeks_compact RENAME TO overtime_weeks")
+    for index in table.indexes:
+        conn.exec_driver_sql(str(CreateIndex(index).compile(dialect=conn.dialect)))
+
+    for statement in (
+        data_version_triggers()
+        + change_journal_triggers()
+        + department_summary_triggers()
+    ):
+        conn.exec_driver_sql(statement)
+    conn.exec_driver_sql(overtime_weeks_view_sql())
+    logger.info("Rebuilt overtime_weeks with status codes (%s rows)", copied)
+
+
+def _backfill_overtime_weeks(conn: Connection) -> None:
+    """Give every staff member without one an overtime_weeks row.
+
+    Saturday and Sunday start from the legacy ``sat`` / ``sun`` tables:
+    a row there means overtime, or a business trip if ``is_evection``.
+    """
+    legacy = {
+        table: (
+            f"CASE WHEN {table}.id IS NULL THEN {STATUS_CODES['bg-1']} "
+            f"WHEN {table}.is_evection = 1 THEN {STATUS_CODES['bg-3']} "
+            f"ELSE {STATUS_CODES['bg-2']} END"
+        )
+        for table in ("sat", "sun")
+    }
+    days = ", ".join(legacy.get(day, str(STATUS_CODES["bg-1"])) for day in DAY_COLUMNS)
+    created = conn.exec_driver_sql(
+        f"INSERT INTO overtime_weeks (staff_id, {', '.join(DAY_COLUMNS)}) "
+        f"SELECT s.id, {days} FROM staffs s "
+        "LEFT JOIN overtime_weeks ow ON ow.staff_id = s.id "
+        "LEFT JOIN sat ON sat.staff_id = s.id "
+        "LEFT JOIN sun ON sun.staff_id = s.id "
+        "WHERE ow.id IS NULL"
+    ).rowcount
+    if created:
+        logger.info("Backfilled %s overtime_weeks rows", created)
+
+
+def _seed_overtime_history(conn: Connection) -> None:
+    """Copy the rolling week's statuses into an empty overtime_history.
+
+    Only the first start after the table appears has anything to copy:
+    from then on every write records its own history.
+    """
+    if conn.exec_driver_sql("SELECT EXISTS (SELECT 1 FROM overtime_history)").scalar():
+        return
+    monday = date.today() - timedelta(days=date.today().weekday())
+    cells = " UNION ALL ".join(
+        f"SELECT '{(monday + timedelta(days=index)).isoformat()}', ow.staff_id, "
+        f"s.department_id, ow.{day} FROM overtime_weeks ow "
+        f"JOIN staffs s ON s.id = ow.staff_id WHERE ow.{day} != {STATUS_CODES['bg-1']}"
+        for index, day in enumerate(DAY_COLUMNS)
+    )
+    copied = conn.exec_driver_sql(
+        "INSERT INTO overtime_history "
+        "(date, staff_id, department_id, status, updated_at) "
+        f"SELECT *, ? FROM ({cells})",
+        (datetime.now().isoformat(" "),),
+    ).rowcount
+    if copied:
+        logger.info("Seeded overtime_history with %s cells of the rolling week", copied)
+
+
+def _seed_monthly_rollups(conn: Connection) -> None:
+    """Rebuild the monthly rollups from overtime_history.
+
+    The history triggers may already have counted rows written by earlier
+    steps, so the rollups are recomputed rather than topped up. Triggers
+    keep them current afterwards; ``python -m app.commands rebuild-rollups``
+    recomputes them on demand.
+    """
+    for statement in rebuild_monthly_rollups_sql():
+        conn.exec_driver_sql(statement)
+
+
+def _seed_department_summary(conn: Connection) -> None:
+    """Rebuild department_day_summary from overtime_weeks.
+
+    The summary triggers already fire for the rows v5 backfills, so a
+    partial summary is expected here and is recomputed, not topped up.
+    Triggers keep it current afterwards; ``python -m app.commands
+    check-summary`` reports drift and ``rebuild-summary`` recomputes it.
+    """
+    for statement in rebuild_department_summary_sql():
+        conn.exec_driver_sql(statement)
+
+
+# (version, step). Append new steps with the next version; never renumber.
+MIGRATIONS = (
+    (1, _unique_department_operations),
+    (2, _department_operation_ids),
+    (3, _staff_department_index),
+    (4, _compact_overtime_weeks),
+    (5, _backfill_overtime_weeks),
+    (6, _seed_overtime_history),
+    (7, _seed_monthly_rollups),
+    (8, _seed_department_summary),
+)
+
+_VERSION_TABLE = (
+    "CREATE TABLE IF NOT EXISTS schema_migrations ("
+    "version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+    "applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+)
+
+
+def _applied_versions(conn: Connection) -> Set[int]:
+    exists = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master "
+        "WHERE type = 'table' AND name = 'schema_migrations'"
+    ).scalar()
+    if not exists:
+        return set()
+    return {
+        row[0] for row in conn.exec_driver_sql("SELECT version FROM schema_migrations")
+    }
+
+
+def pending_migrations(target_engine: Engine = engine) -> List[int]:
+    """Versions not yet applied to the database behind ``target_engine``."""
+    with target_engine.connect() as conn:
+        applied = _applied_versions(conn)
+    return [version for version, _ in MIGRATIONS if version not in applied]
+
+
+def run_migrations(target_engine: Engine = engine) -> List[int]:
+    """Apply pending migration steps in one write transaction.
+
+    Versions are re-read under ``BEGIN IMMEDIATE``, so of several workers
+    starting together one applies the steps and the others find them done.
+    Returns the versions this call applied.
+    """
+    if not pending_migrations(target_engine):
+        return []
+    applied = []
+    with _write_transaction(target_engine) as conn:
+        conn.exec_driver_sql(_VERSION_TABLE)
+        done = _applied_versions(conn)
+        for version, step in MIGRATIONS:
+            if version in done:
+                continue
+            step(conn)
+            conn.exec_driver_sql(
+                "INSERT INTO schema_migrations (version, name) VALUES (?, ?)",
+                (version, step.__name__.lstrip("_")),
+            )
+            applied.append(version)
+    if applied:
+        logger.info("Applied schema migrations %s", applied)
+    return applied
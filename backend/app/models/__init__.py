@@ -3,5 +3,24 @@ from .staff import Staff
 from .sub_department import SubDepartment
 from .overtime import Sat, Sun, OvertimeWeek
 from .department_operation import DepartmentOperation
+from .data_version import DataVersion
+from .change_journal import ChangeJournal
+from .overtime_history import OvertimeHistory
+from .monthly_rollup import DepartmentMonthlyRollup, StaffMonthlyRollup
+from .department_summary import DepartmentDaySummary
 
-__all__ = ["Department", "Staff", "SubDepartment", "Sat", "Sun", "OvertimeWeek", "DepartmentOperation"]
+__all__ = [
+    "Department",
+    "Staff",
+    "SubDepartment",
+    "Sat",
+    "Sun",
+    "OvertimeWeek",
+    "DepartmentOperation",
+    "DataVersion",
+    "ChangeJournal",
+    "OvertimeHistory",
+    "StaffMonthlyRollup",
+    "DepartmentMonthlyRollup",
+    "DepartmentDaySummary",
+]
@@ -0,0 +1,126 @@
+from sqlalchemy import Boolean, Column, Date, DateTime, Integer, String, event, text
+from ..database import Base
+from .overtime import DAY_COLUMNS
+
+
+class ChangeJournal(Base):
+    """Append-only log of changed overtime and operation rows, filled by triggers.
+
+    ``id`` is the sync cursor: AUTOINCREMENT never reuses a value, even after
+    compaction deletes old entries.
+    """
+
+    __tablename__ = "change_journal"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True)
+    # "overtime" (keyed by staff_id) or "operation" (department_name, date)
+    entity = Column(String, nullable=False)
+    staff_id = Column(Integer, nullable=True)
+    department_name = Column(String, nullable=True)
+    date = Column(Date, nullable=True)
+    department_id = Column(Integer, nullable=True, index=True)
+    deleted = Column(Boolean, nullable=False, default=False)
+    changed_at = Column(
+        DateTime, nullable=False, server_default=text("CURRENT_TIMESTAMP")
+    )
+
+    def __repr__(self):
+        return (
+            f"<ChangeJournal(id={self.id}, entity='{self.entity}', "
+            f"deleted={self.deleted})>"
+        )
+
+
+def _overtime_entry(row: str, deleted: int, when: str = "1") -> str:
+    return (
+        "INSERT INTO change_journal (entity, staff_id, department_id, deleted) "
+        f"SELECT 'overtime', {row}.staff_id, "
+        f"(SELECT department_id FROM staffs WHERE id = {row}.staff_id), {deleted} "
+        f"WHERE {when};"
+    )
+
+
+def _operation_entry(row: str, deleted: int, when: str = "1") -> str:
+    return (
+        "INSERT INTO change_journal "
+        "(entity, department_name, date, department_id, deleted) "
+        f"SELECT 'operation', {row}.department_name, {row}.date, "
+        f"(SELECT id FROM departments WHERE name = {row}.department_name), {deleted} "
+        f"WHERE {when};"
+    )
+
+
+_OVERTIME_CHANGED = " OR ".join(f"OLD.{day} IS NOT NEW.{day}" for day in DAY_COLUMNS)
+
+# (name, trigger head, body) for every write that changes what a sync client sees.
+_JOURNAL_TRIGGERS = (
+    (
+        "trg_overtime_weeks_insert_journal",
+        "AFTER INSERT ON overtime_weeks",
+        _overtime_entry("NEW", 0),
+    ),
+    (
+        "trg_overtime_weeks_update_journal",
+        f"AFTER UPDATE ON overtime_weeks WHEN {_OVERTIME_CHANGED} "
+        "OR OLD.staff_id IS NOT NEW.staff_id",
+        # Re-keying a row deletes the old key.
+        _overtime_entry("OLD", 1, "OLD.staff_id IS NOT NEW.staff_id")
+        + " "
+        + _overtime_entry("NEW", 0),
+    ),
+    (
+        "trg_overtime_weeks_delete_journal",
+        "AFTER DELETE ON overtime_weeks",
+        _overtime_entry("OLD", 1),
+    ),
+    # A staff move changes which department the overtime row belongs to;
+    # journal it for both sides so per-department clients see it leave.
+    (
+        "trg_staffs_move_journal",
+        "AFTER UPDATE OF department_id ON staffs "
+        "WHEN OLD.department_id IS NOT NEW.department_id "
+        "AND EXISTS (SELECT 1 FROM overtime_weeks WHERE staff_id = NEW.id)",
+        "INSERT INTO change_journal (entity, staff_id, department_id, deleted) "
+        "VALUES ('overtime', NEW.id, OLD.department_id, 0), "
+        "('overtime', NEW.id, NEW.department_id, 0);",
+    ),
+    (
+        "trg_department_operations_insert_journal",
+        "AFTER INSERT ON department_operations",
+        _operation_entry("NEW", 0),
+    ),
+    (
+        "trg_department_operations_update_journal",
+        "AFTER UPDATE ON department_operations",
+        _operation_entry(
+            "OLD",
+            1,
+            "OLD.department_name IS NOT NEW.department_name "
+            "OR OLD.date IS NOT NEW.date",
+        )
+        + " "
+        + _operation_entry("NEW", 0),
+    ),
+    (
+        "trg_department_operations_delete_journal",
+        "AFTER DELETE ON department_operations",
+        _operation_entry("OLD", 1),
+    ),
+)
+
+
+def change_journal_triggers():
+    """CREATE TRIGGER statements that append to ``change_journal``."""
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {name} {head} BEGIN {body} END"
+        for name, head, body in _JOURNAL_TRIGGERS
+    ]
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_change_journal_triggers(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in change_journal_triggers():
+        connection.execute(text(statement))
@@ -0,0 +1,137 @@
+from sqlalchemy import Column, Integer, String, event, text
+from ..database import Base
+
+
+# Random per-database value set once at creation; tags built from versions
+# include it so a recreated database never reuses an old tag.
+EPOCH_SCOPE = "epoch"
+
+
+class DataVersion(Base):
+    """Monotonic change counter per scope ("dept:<id>"), bumped by triggers."""
+
+    __tablename__ = "data_versions"
+
+    scope = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DataVersion(scope='{self.scope}', version={self.version})>"
+
+
+def _bump(source: str) -> str:
+    """Statement bumping the department versions selected by ``source``."""
+    return (
+        "INSERT INTO data_versions (scope, version) "
+        f"SELECT 'dept:' || department_id, 1 FROM ({source}) "
+        "WHERE department_id IS NOT NULL "
+        "ON CONFLICT (scope) DO UPDATE SET version = version + 1;"
+    )
+
+
+def _staff_department(row: str) -> str:
+    return f"SELECT department_id FROM staffs WHERE id = {row}.staff_id"
+
+
+def _named_department(row: str) -> str:
+    return (
+        "SELECT id AS department_id FROM departments "
+        f"WHERE name = {row}.department_name"
+    )
+
+
+def _column(row: str, column: str) -> str:
+    return f"SELECT {row}.{column} AS department_id"
+
+
+# (table, {event: [department sources]}) for every table the read models use.
+# A move between departments bumps both the old and the new department.
+_TRIGGER_SOURCES = (
+    (
+        "departments",
+        {
+            "INSERT": [_column("NEW", "id")],
+            "UPDATE": [_column("NEW", "id")],
+            "DELETE": [_column("OLD", "id")],
+        },
+    ),
+    (
+        "sub_departments",
+        {
+            "INSERT": [_column("NEW", "department_id")],
+            "UPDATE": [
+                _column("OLD", "department_id"),
+                _column("NEW", "department_id"),
+            ],
+            "DELETE": [_column("OLD", "department_id")],
+        },
+    ),
+    (
+        "staffs",
+        {
+            "INSERT": [_column("NEW", "department_id")],
+            "UPDATE": [
+                _column("OLD", "department_id"),
+                _column("NEW", "department_id"),
+            ],
+            "DELETE": [_column("OLD", "department_id")],
+        },
+    ),
+    (
+        "overtime_weeks",
+        {
+            "INSERT": [_staff_department("NEW")],
+            "UPDATE": [_staff_department("NEW")],
+            "DELETE": [_staff_department("OLD")],
+        },
+    ),
+    (
+        "overtime_history",
+        {
+            "INSERT": [_column("NEW", "department_id")],
+            "UPDATE": [
+                _column("OLD", "department_id"),
+                _column("NEW", "department_id"),
+            ],
+            "DELETE": [_column("OLD", "department_id")],
+        },
+    ),
+    # Resolved by name: older files only gain department_id in a migration.
+    (
+        "department_operations",
+        {
+            "INSERT": [_named_department("NEW")],
+            "UPDATE": [_named_department("OLD"), _named_department("NEW")],
+            "DELETE": [_named_department("OLD")],
+        },
+    ),
+)
+
+
+def data_version_triggers():
+    """CREATE TRIGGER statements that keep ``data_versions`` current."""
+    statements = []
+    for table, events in _TRIGGER_SOURCES:
+        for action, sources in events.items():
+            body = " ".join(_bump(source) for source in sources)
+            statements.append(
+                "CREATE TRIGGER IF NOT EXISTS "
+                f"trg_{table}_{action.lower()}_data_version "
+                f"AFTER {action} ON {table} BEGIN {body} END"
+            )
+    return statements
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_data_version_triggers(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in data_version_triggers():
+        connection.execute(text(statement))
+    connection.execute(
+        text(
+            "INSERT OR IGNORE INTO data_versions (scope, version) "
+            "VALUES (:scope, abs(random() % 1000000000))"
+        ),
+        {"scope": EPOCH_SCOPE},
+    )
@@ -1,12 +1,24 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index
 from ..database import Base
 from datetime import datetime
 
 class DepartmentOperation(Base):
     __tablename__ = "department_operations"
+    __table_args__ = (
+        # One row per department and day; also the ON CONFLICT target for upserts
+        Index(
+            "ux_department_operations_department_date",
+            "department_name",
+            "date",
+            unique=True,
+        ),
+        Index("ix_department_operations_department_id_date", "department_id", "date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     department_name = Column(String, index=True, nullable=False)
+    # Resolved from department_name on write; NULL if no such department exists
+    department_id = Column(Integer, ForeignKey("departments.id"), nullable=True)
     date = Column(Date, index=True, nullable=False)
     last_updated = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     
@@ -0,0 +1,154 @@
+from sqlalchemy import Column, ForeignKey, Integer, String, event, text
+from ..database import Base
+from .overtime import DAY_COLUMNS, STATUS_CODES
+
+
+class DepartmentDaySummary(Base):
+    """Staff count and internal / trip counts per department and week day.
+
+    Kept in step with ``staffs`` and ``overtime_weeks`` by triggers, so
+    statistics read one row instead of aggregating the department's staff.
+    """
+
+    __tablename__ = "department_day_summary"
+
+    department_id = Column(Integer, ForeignKey("departments.id"), primary_key=True)
+    day = Column(String, primary_key=True)  # one of DAY_COLUMNS
+    total_staff = Column(Integer, nullable=False, default=0)
+    internal = Column(Integer, nullable=False, default=0)
+    trip = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<DepartmentDaySummary(department_id={self.department_id}, "
+            f"day='{self.day}')>"
+        )
+
+
+_INTERNAL = STATUS_CODES["bg-2"]
+_TRIP = STATUS_CODES["bg-3"]
+
+
+def _cells(department: str, staff: int, status: str) -> str:
+    """One (department_id, day, staff, status) row per week day.
+
+    ``status`` is formatted with the day column, e.g. ``"NEW.{day}"``.
+    """
+    return " UNION ALL ".join(
+        f"SELECT {department} AS department_id, '{day}' AS day, "
+        f"{staff} AS staff, {status.format(day=day)} AS status"
+        for day in DAY_COLUMNS
+    )
+
+
+def _add(source: str, sign: str) -> str:
+    """Add (sign "+") or remove ("-") the cells selected by ``source``."""
+    return (
+        "INSERT INTO department_day_summary "
+        "(department_id, day, total_staff, internal, trip) "
+        f"SELECT department_id, day, {sign}staff, "
+        f"{sign}COALESCE(status = {_INTERNAL}, 0), {sign}COALESCE(status = {_TRIP}, 0) "
+        f"FROM ({source}) WHERE department_id IS NOT NULL "
+        "ON CONFLICT (department_id, day) DO UPDATE SET "
+        "total_staff = total_staff + excluded.total_staff, "
+        "internal = internal + excluded.internal, "
+        "trip = trip + excluded.trip;"
+    )
+
+
+def _week(row: str) -> str:
+    """Cells of an overtime_weeks row, under its staff's current department."""
+    return _cells(
+        f"(SELECT department_id FROM staffs WHERE id = {row}.staff_id)",
+        0,
+        f"{row}.{{day}}",
+    )
+
+
+def _staff(row: str, department: str) -> str:
+    """A staff member and their week row (if any), under ``department``."""
+    return _cells(
+        department, 1, f"(SELECT {{day}} FROM overtime_weeks WHERE staff_id = {row}.id)"
+    )
+
+
+_WEEK_CHANGED = " OR ".join(f"OLD.{day} IS NOT NEW.{day}" for day in DAY_COLUMNS)
+
+# (name, trigger head, [(source, sign)]) for every write that moves a count.
+_SUMMARY_TRIGGERS = (
+    (
+        "trg_overtime_weeks_insert_summary",
+        "AFTER INSERT ON overtime_weeks",
+        [(_week("NEW"), "+")],
+    ),
+    (
+        "trg_overtime_weeks_update_summary",
+        f"AFTER UPDATE ON overtime_weeks WHEN {_WEEK_CHANGED} "
+        "OR OLD.staff_id IS NOT NEW.staff_id",
+        [(_week("OLD"), "-"), (_week("NEW"), "+")],
+    ),
+    (
+        "trg_overtime_weeks_delete_summary",
+        "AFTER DELETE ON overtime_weeks",
+        [(_week("OLD"), "-")],
+    ),
+    (
+        "trg_staffs_insert_summary",
+        "AFTER INSERT ON staffs",
+        [(_staff("NEW", "NEW.department_id"), "+")],
+    ),
+    # A move takes the staff member and their week with them.
+    (
+        "trg_staffs_move_summary",
+        "AFTER UPDATE OF department_id ON staffs "
+        "WHEN OLD.department_id IS NOT NEW.department_id",
+        [
+            (_staff("NEW", "OLD.department_id"), "-"),
+            (_staff("NEW", "NEW.department_id"), "+"),
+        ],
+    ),
+    (
+        "trg_staffs_delete_summary",
+        "AFTER DELETE ON staffs",
+        [(_staff("OLD", "OLD.department_id"), "-")],
+    ),
+)
+
+
+def department_summary_triggers():
+    """CREATE TRIGGER statements keeping department_day_summary current."""
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {name} {head} BEGIN "
+        + " ".join(_add(source, sign) for source, sign in steps)
+        + " END"
+        for name, head, steps in _SUMMARY_TRIGGERS
+    ]
+
+
+def department_summary_sql() -> str:
+    """SELECT computing every summary row from scratch."""
+    return " UNION ALL ".join(
+        f"SELECT s.department_id, '{day}' AS day, COUNT(*) AS total_staff, "
+        f"COUNT(CASE WHEN ow.{day} = {_INTERNAL} THEN 1 END) AS internal, "
+        f"COUNT(CASE WHEN ow.{day} = {_TRIP} THEN 1 END) AS trip "
+        "FROM staffs s LEFT JOIN overtime_weeks ow ON ow.staff_id = s.id "
+        "WHERE s.department_id IS NOT NULL GROUP BY s.department_id"
+        for day in DAY_COLUMNS
+    )
+
+
+def rebuild_department_summary_sql():
+    """Statements recomputing department_day_summary from staffs and overtime_weeks."""
+    return [
+        "DELETE FROM department_day_summary",
+        "INSERT INTO department_day_summary "
+        "(department_id, day, total_staff, internal, trip) " + department_summary_sql(),
+    ]
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_department_summary_triggers(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in department_summary_triggers():
+        connection.execute(text(statement))
@@ -0,0 +1,110 @@
+from sqlalchemy import Column, ForeignKey, Integer, String, event, text
+from ..database import Base
+from .overtime import STATUS_CODES
+
+
+class StaffMonthlyRollup(Base):
+    """Days of internal overtime and business trip per staff and month."""
+
+    __tablename__ = "overtime_monthly_staff"
+
+    month = Column(String, primary_key=True)  # "YYYY-MM"
+    staff_id = Column(Integer, ForeignKey("staffs.id"), primary_key=True)
+    internal_days = Column(Integer, nullable=False, default=0)
+    trip_days = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<StaffMonthlyRollup(staff_id={self.staff_id}, month='{self.month}')>"
+
+
+class DepartmentMonthlyRollup(Base):
+    """Staff-days of internal overtime and business trip per department and month.
+
+    Counted under the department recorded in ``overtime_history``, so a staff
+    move does not rewrite earlier months.
+    """
+
+    __tablename__ = "overtime_monthly_department"
+
+    month = Column(String, primary_key=True)  # "YYYY-MM"
+    department_id = Column(Integer, ForeignKey("departments.id"), primary_key=True)
+    internal_days = Column(Integer, nullable=False, default=0)
+    trip_days = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<DepartmentMonthlyRollup(department_id={self.department_id}, "
+            f"month='{self.month}')>"
+        )
+
+
+_INTERNAL = STATUS_CODES["bg-2"]
+_TRIP = STATUS_CODES["bg-3"]
+
+# (table, key column in overtime_history) for each rollup.
+_ROLLUPS = (
+    ("overtime_monthly_staff", "staff_id"),
+    ("overtime_monthly_department", "department_id"),
+)
+
+
+def _add(table: str, key: str, row: str, sign: str) -> str:
+    """Add (sign "+") or remove ("-") one history row's day from ``table``."""
+    return (
+        f"INSERT INTO {table} (month, {key}, internal_days, trip_days) "
+        f"SELECT substr({row}.date, 1, 7), {row}.{key}, "
+        f"{sign}({row}.status = {_INTERNAL}), {sign}({row}.status = {_TRIP}) "
+        f"WHERE {row}.{key} IS NOT NULL AND {row}.status IN ({_INTERNAL}, {_TRIP}) "
+        f"ON CONFLICT (month, {key}) DO UPDATE SET "
+        "internal_days = internal_days + excluded.internal_days, "
+        "trip_days = trip_days + excluded.trip_days;"
+    )
+
+
+def monthly_rollup_triggers():
+    """CREATE TRIGGER statements keeping the rollups in step with overtime_history."""
+    bodies = {
+        "insert": ("AFTER INSERT ON overtime_history", [("NEW", "+")]),
+        "update": (
+            "AFTER UPDATE ON overtime_history WHEN OLD.status IS NOT NEW.status "
+            "OR OLD.department_id IS NOT NEW.department_id "
+            "OR OLD.staff_id IS NOT NEW.staff_id OR OLD.date IS NOT NEW.date",
+            [("OLD", "-"), ("NEW", "+")],
+        ),
+        "delete": ("AFTER DELETE ON overtime_history", [("OLD", "-")]),
+    }
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS trg_overtime_history_{action}_monthly "
+        f"{head} BEGIN "
+        + " ".join(
+            _add(table, key, row, sign)
+            for row, sign in steps
+            for table, key in _ROLLUPS
+        )
+        + " END"
+        for action, (head, steps) in bodies.items()
+    ]
+
+
+def rebuild_monthly_rollups_sql():
+    """Statements recomputing both rollups from overtime_history."""
+    statements = []
+    for table, key in _ROLLUPS:
+        statements.append(f"DELETE FROM {table}")
+        statements.append(
+            f"INSERT INTO {table} (month, {key}, internal_days, trip_days) "
+            f"SELECT substr(date, 1, 7), {key}, "
+            f"SUM(status = {_INTERNAL}), SUM(status = {_TRIP}) "
+            "FROM overtime_history "
+            f"WHERE {key} IS NOT NULL AND status IN ({_INTERNAL}, {_TRIP}) "
+            f"GROUP BY substr(date, 1, 7), {key}"
+        )
+    return statements
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_monthly_rollup_triggers(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in monthly_rollup_triggers():
+        connection.execute(text(statement))
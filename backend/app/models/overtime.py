@@ -1,20 +1,75 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    Column,
+    ForeignKey,
+    Integer,
+    SmallInteger,
+    String,
+    event,
+    text,
+)
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
 from ..database import Base
 
+DAY_COLUMNS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+# Stored codes for the status labels the API speaks. SQLite writes the
+# integers 0 and 1 into the record header alone, so most cells take no
+# payload bytes at all.
+STATUS_CODES = {"bg-1": 0, "bg-2": 1, "bg-3": 2}
+STATUS_LABELS = {code: label for label, code in STATUS_CODES.items()}
+
+
+class OvertimeStatus(TypeDecorator):
+    """A day's status: ``'bg-1'``/``'bg-2'``/``'bg-3'`` in Python, 0/1/2 stored."""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, int):
+            return value
+        try:
+            return STATUS_CODES[value]
+        except KeyError:
+            raise ValueError(f"Invalid overtime status: {value!r}")
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return STATUS_LABELS.get(value, value)
+
+
+def status_label_sql(column: str) -> str:
+    """SQL turning a stored status code, or NULL for no row, into its label."""
+    return f"CASE {column} WHEN 1 THEN 'bg-2' WHEN 2 THEN 'bg-3' ELSE 'bg-1' END"
+
+
+def week_labels_sql(alias: str) -> str:
+    """Select list with every day of ``alias`` as a labelled status column."""
+    return ", ".join(
+        f"{status_label_sql(f'{alias}.{day}')} AS {day}" for day in DAY_COLUMNS
+    )
+
 
 class OvertimeWeek(Base):
     __tablename__ = "overtime_weeks"
+    __table_args__ = tuple(
+        CheckConstraint(f"{day} IN (0, 1, 2)", name=f"ck_overtime_weeks_{day}")
+        for day in DAY_COLUMNS
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     staff_id = Column(Integer, ForeignKey("staffs.id"), nullable=False, unique=True)
-    mon = Column(String, default="bg-1", nullable=False)
-    tue = Column(String, default="bg-1", nullable=False)
-    wed = Column(String, default="bg-1", nullable=False)
-    thu = Column(String, default="bg-1", nullable=False)
-    fri = Column(String, default="bg-1", nullable=False)
-    sat = Column(String, default="bg-1", nullable=False)
-    sun = Column(String, default="bg-1", nullable=False)
+    mon = Column(OvertimeStatus, default="bg-1", nullable=False)
+    tue = Column(OvertimeStatus, default="bg-1", nullable=False)
+    wed = Column(OvertimeStatus, default="bg-1", nullable=False)
+    thu = Column(OvertimeStatus, default="bg-1", nullable=False)
+    fri = Column(OvertimeStatus, default="bg-1", nullable=False)
+    sat = Column(OvertimeStatus, default="bg-1", nullable=False)
+    sun = Column(OvertimeStatus, default="bg-1", nullable=False)
 
     staff = relationship("Staff", back_populates="overtime_week")
 
@@ -68,3 +123,21 @@ class Sun(Base):
 
     def __repr__(self):
         return f"<Sun(staff_id={self.staff_id}, is_evection={self.is_evection})>"
+
+
+# Read-only view with the labels, for reporting tools and ad-hoc SQL.
+OVERTIME_WEEKS_VIEW = "overtime_weeks_labels"
+
+
+def overtime_weeks_view_sql() -> str:
+    return (
+        f"CREATE VIEW IF NOT EXISTS {OVERTIME_WEEKS_VIEW} AS "
+        f"SELECT ow.id, ow.staff_id, {week_labels_sql('ow')} FROM overtime_weeks ow"
+    )
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_overtime_weeks_view(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    connection.execute(text(overtime_weeks_view_sql()))
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer
+from ..database import Base
+from .overtime import OvertimeStatus
+from datetime import datetime
+
+
+class OvertimeHistory(Base):
+    """A staff member's status on one calendar date.
+
+    ``overtime_weeks`` only holds the rolling week and is overwritten as the
+    week moves on; this table keeps every date that was ever set. Rows are
+    grouped by date first (the primary key and the date index both lead
+    with it), so a day or week is one contiguous range.
+    """
+
+    __tablename__ = "overtime_history"
+    __table_args__ = (
+        Index("ix_overtime_history_date_department_id", "date", "department_id"),
+    )
+
+    date = Column(Date, primary_key=True)
+    staff_id = Column(Integer, ForeignKey("staffs.id"), primary_key=True)
+    # The staff's department when the status was set
+    department_id = Column(Integer, ForeignKey("departments.id"), nullable=True)
+    status = Column(OvertimeStatus, default="bg-1", nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def __repr__(self):
+        return (
+            f"<OvertimeHistory(staff_id={self.staff_id}, date='{self.date}', "
+            f"status={self.status})>"
+        )
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..database import Base
 
 
 class Staff(Base):
     __tablename__ = "staffs"
+    __table_args__ = (
+        # Staff of one department in name order (staff lists, info aggregation)
+        Index("ix_staffs_department_id_name", "department_id", "name"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False)
@@ -0,0 +1,229 @@
+"""Versioned in-process cache for read-model snapshots.
+
+Triggers keep a per-department counter in ``data_versions`` (see
+``models/data_version.py``), so every committed change, from any writer,
+bumps the departments it touches. Cached entries are tagged with the
+versions of the scopes they depend on and are served only while those
+versions are unchanged.
+
+Reading the versions is cheap: each database gets a probe connection that
+never writes, so its ``PRAGMA data_version`` changes exactly when another
+connection (in this or any other worker process) commits. The versions
+table is re-read only then. The probe still blocks (a lock, a query and,
+the first time, a connect), so async callers run it in the threadpool.
+"""
+
+from collections import OrderedDict
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import weakref
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from .models.data_version import EPOCH_SCOPE
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+READ_CACHE_ENABLED = os.environ.get("READ_CACHE_ENABLED", "1") not in ("0", "false", "")
+READ_CACHE_MAX_ENTRIES = int(os.environ.get("READ_CACHE_MAX_ENTRIES", "512"))
+
+# Depends on every department; its version is the sum of all counters,
+# which grows whenever any one of them does.
+GLOBAL_SCOPE = "global"
+
+
+def department_scope(department_id: int) -> str:
+    return f"dept:{department_id}"
+
+
+class _VersionProbe:
+    """Read-only connection tracking ``data_versions`` for one database file."""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(
+            path, timeout=20, check_same_thread=False, isolation_level=None
+        )
+        self._lock = threading.Lock()
+        self._data_version: Optional[int] = None
+        self._versions: Dict[str, int] = {}
+        self._total = 0
+
+    def versions(self) -> Tuple[Dict[str, int], int]:
+        """Return ``(versions by scope, global version)``."""
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self._data_version:
+                # A commit that lands between the two statements is picked up
+                # on the next call, since data_version will differ again.
+                try:
+                    rows = self._conn.execute(
+                        "SELECT scope, version FROM data_versions"
+                    ).fetchall()
+                except sqlite3.OperationalError:
+                    rows = []
+                self._versions = dict(rows)
+                self._total = sum(
+                    version
+                    for scope, version in self._versions.items()
+                    if scope.startswith("dept:")
+                )
+                self._data_version = data_version
+            return self._versions, self._total
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class _Store:
+    """Cache entries and version probe for one engine."""
+
+    def __init__(self, path: str, max_entries: int):
+        self.probe = _VersionProbe(path)
+        self.entries: "OrderedDict[Hashable, Tuple[Tuple[Any, ...], Any]]" = (
+            OrderedDict()
+        )
+        self.lock = threading.Lock()
+        self.max_entries = max_entries
+
+
+class ReadCache:
+    """Cache read models per engine, keyed by the versions they depend on."""
+
+    def __init__(self, max_entries: int = READ_CACHE_MAX_ENTRIES, enabled: bool = True):
+        self.enabled = enabled
+        self._max_entries = max(1, max_entries)
+        self._stores: "weakref.WeakKeyDictionary[Engine, _Store]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _store(self, db: Union[AsyncSession, Session]) -> Optional[_Store]:
+        if not self.enabled:
+            return None
+        bind = getattr(db.bind, "sync_engine", db.bind)
+        if isinstance(bind, Connection):
+            bind = bind.engine
+        if not isinstance(bind, Engine) or bind.dialect.name != "sqlite":
+            return None
+        path = bind.url.database
+        if not path or path == ":memory:" or path.startswith("file:"):
+            return None
+        with self._lock:
+            store = self._stores.get(bind)
+            if store is None:
+                store = _Store(path, self._max_entries)
+                self._stores[bind] = store
+                weakref.finalize(bind, store.probe.close)
+            return store
+
+    def _snapshot(
+        self, db: Union[AsyncSession, Session]
+    ) -> Optional[Tuple[_Store, Dict[str, int], int]]:
+        """The store for ``db`` with its current versions.
+
+        Blocking; see the module docstring.
+        """
+        store = self._store(db)
+        if store is None:
+            return None
+        versions, total = store.probe.versions()
+        return store, versions, total
+
+    async def _current(
+        self, db: Union[AsyncSession, Session]
+    ) -> Optional[Tuple[_Store, Dict[str, int], int]]:
+        if not self.enabled:
+            return None
+        return await run_in_threadpool(self._snapshot, db)
+
+    async def etag(
+        self,
+        db: Union[AsyncSession, Session],
+        key: Hashable,
+        scopes: Sequence[str],
+        extra: Tuple[Any, ...] = (),
+    ) -> Optional[str]:
+        """Strong ETag for the read model ``key`` at the current versions.
+
+        Returns ``None`` when versions are unavailable (caching disabled or a
+        non-file database); callers then skip conditional handling.
+        """
+        snapshot = await self._current(db)
+        if snapshot is None:
+            return None
+        _, versions, total = snapshot
+        tag = (
+            versions.get(EPOCH_SCOPE, 0),
+            key,
+            self._tag(versions, total, scopes),
+            tuple(extra),
+        )
+        return '"%s"' % hashlib.blake2b(repr(tag).encode(), digest_size=12).hexdigest()
+
+    @staticmethod
+    def _tag(
+        versions: Dict[str, int], total: int, scopes: Sequence[str]
+    ) -> Tuple[int, ...]:
+        return tuple(
+            total if scope == GLOBAL_SCOPE else versions.get(scope, 0)
+            for scope in scopes
+        )
+
+    async def get(
+        self,
+        db: Union[AsyncSession, Session],
+        key: Hashable,
+        scopes: Sequence[str],
+        loader: Callable[[], Awaitable[T]],
+        extra: Tuple[Any, ...] = (),
+    ) -> T:
+        """Return the cached value for ``key`` or ``await loader()`` and cache it.
+
+        The versions are read before loading, so a write racing the load can
+        only make the stored entry look older than its data, never newer.
+        ``extra`` adds other inputs (such as today's date) to the tag.
+        """
+        snapshot = await self._current(db)
+        if snapshot is None:
+            return await loader()
+        store, versions, total = snapshot
+        tag = self._tag(versions, total, scopes) + tuple(extra)
+        with store.lock:
+            cached = store.entries.get(key)
+            if cached is not None and cached[0] == tag:
+                store.entries.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+        self.misses += 1
+        value = await loader()
+        with store.lock:
+            store.entries[key] = (tag, value)
+            store.entries.move_to_end(key)
+            while len(store.entries) > store.max_entries:
+                store.entries.popitem(last=False)
+        return value
+
+
+read_cache = ReadCache(enabled=READ_CACHE_ENABLED)
@@ -1,3 +1,3 @@
-from . import departments, staffs, overtime, info, exports
+from . import departments, staffs, overtime, info, exports, events, reports
 
-__all__ = ["departments", "staffs", "overtime", "info", "exports"]
+__all__ = ["departments", "staffs", "overtime", "info", "exports", "events", "reports"]
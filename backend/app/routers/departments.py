@@ -1,11 +1,14 @@
 from fastapi import APIRouter, HTTPException, Response, Depends, Cookie
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
 
-from ..database import get_db
+from ..database import begin_write_transaction, commit_session, get_db, run_db
+from ..events import queue_event
+from ..write_queue import run_write
 from ..models import Department, DepartmentOperation
 from ..services.department import upsert_department_operation, delete_department_operation, ensure_department_operation
 from ..services.overtime import get_date_by_token
@@ -26,47 +29,53 @@ class DepartmentSelectRequest(BaseModel):
 class ConfirmStatusResponse(BaseModel):
     is_confirmed: bool
 
+
 @router.get("/", response_model=List[DepartmentResponse])
 @router.get("", response_model=List[DepartmentResponse])
-async def get_departments(db: Session = Depends(get_db)):
+async def get_departments(db: AsyncSession = Depends(get_db)):
     """Get all departments"""
-    departments = db.query(Department).all()
+    departments = await run_db(db, lambda session: session.query(Department).all())
     return departments
 
+
+def _get_department(db: Session, dept_id: int) -> Optional[Department]:
+    return db.query(Department).filter(Department.id == dept_id).first()
+
+
 @router.get("/current", response_model=DepartmentResponse)
 async def get_current_department(
-    department: Optional[str] = Cookie(None),
-    db: Session = Depends(get_db)
+    department: Optional[str] = Cookie(None), db: AsyncSession = Depends(get_db)
 ):
     """Get current department from cookie"""
     if not department:
         raise HTTPException(status_code=400, detail="Department cookie not found")
-    
+
     try:
         dept_id = int(department)
         if dept_id <= 0:
             raise ValueError()
     except (TypeError, ValueError):
         raise HTTPException(status_code=400, detail="Invalid department cookie")
-    
-    dept = db.query(Department).filter(Department.id == dept_id).first()
+
+    dept = await run_db(db, _get_department, dept_id)
     if not dept:
         raise HTTPException(status_code=404, detail="Department not found")
-    
+
     return dept
 
+
 @router.post("/select")
 async def select_department(
     request: DepartmentSelectRequest,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
 ):
     """Set department cookie (1-year expiry)"""
     # Validate department exists
-    department = db.query(Department).filter(Department.id == request.department_id).first()
+    department = await run_db(db, _get_department, request.department_id)
     if not department:
         raise HTTPException(status_code=404, detail="Department not found")
-    
+
     # Set cookie with 1-year expiry
     response.set_cookie(
         key="department",
@@ -75,21 +84,15 @@ async def select_department(
         httponly=True,
         samesite="lax"
     )
-    
+
     return {"success": True, "message": "Department selected"}
 
-@router.post("/confirm")
-async def confirm_department_data(
-    department: Optional[str] = Cookie(None),
-    db: Session = Depends(get_db)
-):
-    """Confirm department data for today and upcoming weekend"""
-    if not department:
-        raise HTTPException(status_code=400, detail="Department cookie not found")
-    
-    dept = db.query(Department).filter(Department.id == int(department)).first()
+
+def _confirm(db: Session, dept_id: int) -> None:
+    dept = _get_department(db, dept_id)
     if not dept:
         raise HTTPException(status_code=404, detail="Department not found")
+    begin_write_transaction(db)
     # 1. 记录当天的操作（更新 last_updated，锁定今天的按钮）
     upsert_department_operation(db, dept.name, date.today())
 
@@ -98,59 +101,84 @@ async def confirm_department_data(
     for token in ["sat", "sun"]:
         target_date = get_date_by_token(token)
         ensure_department_operation(db, dept.name, target_date)
+    queue_event(db, "confirm", department_id=dept.id, department=dept.name)
+    commit_session(db)
 
-    return {"success": True, "message": "Data confirmed"}
 
-@router.post("/unconfirm")
-async def unconfirm_department_data(
-    department: Optional[str] = Cookie(None),
-    db: Session = Depends(get_db)
+@router.post("/confirm")
+async def confirm_department_data(
+    department: Optional[str] = Cookie(None), db: AsyncSession = Depends(get_db)
 ):
-    """Unconfirm department data for today and upcoming weekend"""
+    """Confirm department data for today and upcoming weekend"""
     if not department:
         raise HTTPException(status_code=400, detail="Department cookie not found")
-    
-    dept = db.query(Department).filter(Department.id == int(department)).first()
+
+    await run_write(db, _confirm, int(department))
+    return {"success": True, "message": "Data confirmed"}
+
+
+def _unconfirm(db: Session, dept_id: int) -> None:
+    dept = _get_department(db, dept_id)
     if not dept:
         raise HTTPException(status_code=404, detail="Department not found")
-    
+    begin_write_transaction(db)
+
     # 1. 删除当天的操作记录
     delete_department_operation(db, dept.name, date.today())
-    
+
     # 2. 同时删除本周六和周日的操作记录
     for token in ["sat", "sun"]:
         target_date = get_date_by_token(token)
         delete_department_operation(db, dept.name, target_date)
-    
+    queue_event(db, "unconfirm", department_id=dept.id, department=dept.name)
+    commit_session(db)
+
+
+@router.post("/unconfirm")
+async def unconfirm_department_data(
+    department: Optional[str] = Cookie(None), db: AsyncSession = Depends(get_db)
+):
+    """Unconfirm department data for today and upcoming weekend"""
+    if not department:
+        raise HTTPException(status_code=400, detail="Department cookie not found")
+
+    await run_write(db, _unconfirm, int(department))
     return {"success": True, "message": "Confirmation revoked"}
 
+
+def _is_confirmed(db: Session, dept_id: int) -> bool:
+    dept = _get_department(db, dept_id)
+    if not dept:
+        return False
+
+    # Check for operation record today
+    op = (
+        db.query(DepartmentOperation)
+        .filter(
+            DepartmentOperation.department_id == dept.id,
+            DepartmentOperation.date == date.today(),
+        )
+        .first()
+    )
+
+    # 核心逻辑修改：只有当记录存在，且最后更新时间也是今天时，才算作“已确认”
+    # 这样即便昨天操作时提前生成了今天的记录，今天进来由于 last_updated 是昨天，按钮也会重置。
+    if op and op.last_updated:
+        return op.last_updated.date() == date.today()
+    return False
+
+
 @router.get("/confirm-status", response_model=ConfirmStatusResponse)
 async def get_confirm_status(
-    department: Optional[str] = Cookie(None),
-    db: Session = Depends(get_db)
+    department: Optional[str] = Cookie(None), db: AsyncSession = Depends(get_db)
 ):
     """Check if department has confirmed data for today"""
     if not department:
         return {"is_confirmed": False}
-    
+
     try:
         dept_id = int(department)
-        dept = db.query(Department).filter(Department.id == dept_id).first()
-        if not dept:
-            return {"is_confirmed": False}
-        
-        # Check for operation record today
-        op = db.query(DepartmentOperation).filter(
-            DepartmentOperation.department_name == dept.name,
-            DepartmentOperation.date == date.today()
-        ).first()
-        
-        # 核心逻辑修改：只有当记录存在，且最后更新时间也是今天时，才算作“已确认”
-        # 这样即便昨天操作时提前生成了今天的记录，今天进来由于 last_updated 是昨天，按钮也会重置。
-        is_confirmed = False
-        if op and op.last_updated:
-            is_confirmed = op.last_updated.date() == date.today()
-        
-        return {"is_confirmed": is_confirmed}
     except (TypeError, ValueError):
         return {"is_confirmed": False}
+
+    return {"is_confirmed": await run_db(db, _is_confirmed, dept_id)}
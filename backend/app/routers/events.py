@@ -0,0 +1,52 @@
+import asyncio
+import json
+import os
+from typing import Any, Dict
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from ..events import broker
+
+router = APIRouter()
+
+# An idle connection wakes only for this comment line, so it costs nothing
+# between events. Proxies also need it to keep the connection open.
+SSE_KEEPALIVE_SECONDS = float(os.environ.get("SSE_KEEPALIVE_SECONDS", "15"))
+SSE_MAX_BATCH = 64
+
+
+def _format_event(item: Dict[str, Any]) -> str:
+    data = json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+    return f"event: {item['type']}\ndata: {data}\n\n"
+
+
+async def _stream():
+    async with broker.subscribe() as subscription:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                first = await asyncio.wait_for(
+                    subscription.get(), SSE_KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            # Send whatever else is already queued in the same write.
+            items = [first] + subscription.drain(SSE_MAX_BATCH - 1)
+            yield "".join(_format_event(item) for item in items)
+
+
+@router.get("")
+async def stream_events():
+    """Server-Sent Events stream of committed changes.
+
+    Event types: ``overtime`` / ``overtime_bulk`` (status changes),
+    ``operation`` (department operation rows), ``confirm`` / ``unconfirm``,
+    ``staff`` and ``resync`` (the client fell behind and should refetch).
+    """
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -3,12 +3,21 @@
 from datetime import datetime
 from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import Response
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from ..database import get_db
-from ..services.exports import OvertimeTableExportService
+from ..database import get_db, run_db
+from ..export_cache import export_cache
+from ..export_executor import ExportBusy, export_executor
+from ..services.exports import (
+    OVERFLOW_MODES,
+    OVERFLOW_TRUNCATE,
+    OvertimeTableExportService,
+    export_digest,
+)
+from ..utils.http_cache import CACHE_CONTROL, etag_matches
 
 router = APIRouter()
 
@@ -29,14 +38,59 @@ def _parse_export_date(raw_date: str | None) -> datetime.date:
         )
 
 
+def _render_and_cache(export_date, rows, overflow: str, key: str) -> bytes:
+    pdf_bytes = OvertimeTableExportService().render_pdf(export_date, rows, overflow)
+    export_cache.put(key, pdf_bytes)
+    return pdf_bytes
+
+
 @router.get("/overtime-table")
 async def export_overtime_table(
+    request: Request,
     date: str | None = Query(default=None),
-    db: Session = Depends(get_db),
+    overflow: str = Query(default=OVERFLOW_TRUNCATE),
+    db: AsyncSession = Depends(get_db),
 ) -> Response:
+    """PDF for ``date``; ``overflow=continue`` puts overflowing names on extra pages.
+
+    The PDF is addressed by a digest of its rows, which is also its ETag.
+    Repeated downloads of unchanged data get a 304, or the cached bytes
+    without rendering.
+    """
     export_date = _parse_export_date(date)
-    service = OvertimeTableExportService(db)
-    pdf_bytes = service.build_pdf(export_date)
+    if overflow not in OVERFLOW_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid overflow mode. Expected one of: "
+            + ", ".join(OVERFLOW_MODES),
+        )
+    rows = await run_db(
+        db,
+        lambda session: OvertimeTableExportService(session).build_department_rows(
+            export_date
+        ),
+    )
+    key = export_digest(export_date, rows, overflow)
+    etag = f'"{key}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
+
+    # A disk hit reads a file, so the lookup runs off the event loop too.
+    pdf_bytes = await run_in_threadpool(export_cache.get, key)
+    if pdf_bytes is None:
+        # Rendering is CPU-bound reportlab work; it runs on the bounded export pool.
+        try:
+            pdf_bytes = await export_executor.run(
+                _render_and_cache, export_date, rows, overflow, key
+            )
+        except ExportBusy as busy:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many exports in progress, please retry later",
+                headers={"Retry-After": str(busy.retry_after)},
+            )
     filename = f"{export_date.isoformat()}_上班人员统计表.pdf"
     encoded_filename = quote(filename)
 
@@ -45,8 +99,19 @@ async def export_overtime_table(
         media_type="application/pdf",
         headers={
             "Content-Disposition": (
-                f"attachment; filename=\"overtime-table-{export_date.isoformat()}.pdf\"; "
+                f'attachment; filename="overtime-table-{export_date.isoformat()}.pdf"; '
                 f"filename*=UTF-8''{encoded_filename}"
-            )
+            ),
+            "ETag": etag,
+            "Cache-Control": CACHE_CONTROL,
         },
     )
+
+
+@router.get("/metrics")
+async def export_metrics() -> dict:
+    """Export pool occupancy, counters and queue-wait / render timings (ms).
+
+    ``cache`` holds the PDF cache counters.
+    """
+    return {**export_executor.metrics(), "cache": export_cache.metrics()}
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from typing import Optional, List
+from typing import Any, Optional, List
 
-from ..database import get_db
-from ..services import OvertimeService
+from ..database import get_db, run_db
+from ..models.overtime import week_labels_sql
+from ..read_cache import GLOBAL_SCOPE, department_scope, read_cache
+from ..utils.http_cache import conditional_get
+from ..write_queue import run_write
+from ..services import ChangeJournalService, OvertimeService
+from ..services.changes import CHANGES_PAGE_LIMIT
 
 router = APIRouter()
 
@@ -19,6 +25,10 @@ class OvertimeToggleRequest(BaseModel):
     day: str  # "mon" through "sun"
 
 
+class OvertimeBatchToggleRequest(BaseModel):
+    changes: List[OvertimeToggleRequest]
+
+
 class OvertimeStatusResponse(BaseModel):
     staff_id: int
     mon: str
@@ -35,7 +45,7 @@ class OvertimeStatusResponse(BaseModel):
 
 @router.post("/toggle")
 async def toggle_overtime_status(
-    request: OvertimeToggleRequest, db: Session = Depends(get_db)
+    request: OvertimeToggleRequest, db: AsyncSession = Depends(get_db)
 ):
     """Toggle staff overtime status (bg-1: none, bg-2: internal, bg-3: business trip)"""
 
@@ -54,8 +64,12 @@ async def toggle_overtime_status(
         raise HTTPException(status_code=400, detail="Invalid status")
 
     try:
-        service = OvertimeService(db)
-        success = service.toggle_staff_status(staff_id, request.status, request.day)
+        success = await run_write(
+            db,
+            lambda session: OvertimeService(session).toggle_staff_status(
+                staff_id, request.status, request.day
+            ),
+        )
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update status")
         return {"success": True, "message": "Status updated successfully"}
@@ -65,31 +79,108 @@ async def toggle_overtime_status(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/status", response_model=List[OvertimeStatusResponse])
-async def get_overtime_status(
-    dept_id: Optional[int] = None, db: Session = Depends(get_db)
+@router.post("/batch-toggle")
+async def batch_toggle_overtime_status(
+    request: OvertimeBatchToggleRequest, db: AsyncSession = Depends(get_db)
 ):
-    """Get current overtime status for staff in department"""
-    if not dept_id:
-        raise HTTPException(status_code=400, detail="Department ID required")
+    """Apply many staff/day status changes in one transaction"""
+    try:
+        changes = [
+            (change.staff_id, change.status, change.day) for change in request.changes
+        ]
+        updated = await run_write(
+            db, lambda session: OvertimeService(session).batch_toggle(changes)
+        )
+        return {
+            "success": True,
+            "message": "Status updated successfully",
+            "updated": updated,
+        }
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
+
+def _load_overtime_status(db: Session, dept_id: int) -> List[Any]:
     staffs = db.execute(
-        text("""
+        text(
+            f"""
         SELECT
             s.id as staff_id,
-            COALESCE(ow.mon, 'bg-1') as mon,
-            COALESCE(ow.tue, 'bg-1') as tue,
-            COALESCE(ow.wed, 'bg-1') as wed,
-            COALESCE(ow.thu, 'bg-1') as thu,
-            COALESCE(ow.fri, 'bg-1') as fri,
-            COALESCE(ow.sat, 'bg-1') as sat,
-            COALESCE(ow.sun, 'bg-1') as sun
+            {week_labels_sql("ow")}
         FROM staffs s
         LEFT JOIN overtime_weeks ow ON ow.staff_id = s.id
         WHERE s.department_id = :dept_id
         ORDER BY s.name
-        """),
+        """
+        ),
         {"dept_id": dept_id},
     ).fetchall()
 
     return [staff._mapping for staff in staffs]
+
+
+@router.get("/status", response_model=List[OvertimeStatusResponse])
+async def get_overtime_status(
+    request: Request,
+    response: Response,
+    dept_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Get current overtime status for staff in department"""
+    if not dept_id:
+        raise HTTPException(status_code=400, detail="Department ID required")
+
+    key = ("overtime_status", dept_id)
+    scopes = (department_scope(dept_id),)
+    not_modified = conditional_get(
+        request, response, await read_cache.etag(db, key, scopes)
+    )
+    if not_modified is not None:
+        return not_modified
+    return await read_cache.get(
+        db, key, scopes, lambda: run_db(db, _load_overtime_status, dept_id)
+    )
+
+
+@router.get("/statistics/matrix")
+async def get_statistics_matrix(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+):
+    """Per-day overtime counts for every department"""
+    key = ("statistics_matrix",)
+    scopes = (GLOBAL_SCOPE,)
+    not_modified = conditional_get(
+        request, response, await read_cache.etag(db, key, scopes)
+    )
+    if not_modified is not None:
+        return not_modified
+    return await read_cache.get(
+        db,
+        key,
+        scopes,
+        lambda: run_db(
+            db, lambda session: OvertimeService(session).get_statistics_matrix()
+        ),
+    )
+
+
+@router.get("/changes")
+async def get_overtime_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(CHANGES_PAGE_LIMIT, ge=1, le=CHANGES_PAGE_LIMIT),
+    dept_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Overtime and department operation rows changed after cursor ``since``"""
+    return await run_db(
+        db,
+        lambda session: ChangeJournalService(session).get_changes(
+            since, limit, dept_id
+        ),
+    )
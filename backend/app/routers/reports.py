@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from ..database import get_db, run_db
+from ..services import ReportService
+
+router = APIRouter()
+
+
+@router.get("/monthly")
+async def get_monthly_report(
+    month: Optional[str] = None,
+    year: Optional[int] = None,
+    dept_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Per-department and per-staff overtime day counts for a month or a year"""
+    try:
+        return await run_db(
+            db,
+            lambda session: ReportService(session).get_monthly(month, year, dept_id),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
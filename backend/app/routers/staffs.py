@@ -1,11 +1,23 @@
-from fastapi import APIRouter, HTTPException, Depends, Cookie
+from fastapi import APIRouter, HTTPException, Depends, Cookie, Request, Response
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from typing import List, Optional, Any
 
-from ..database import get_db
+from ..database import (
+    begin_write_transaction,
+    commit_session,
+    get_db,
+    rollback_session,
+    run_db,
+)
+from ..events import queue_event
+from ..read_cache import department_scope, read_cache
+from ..utils.http_cache import conditional_get
+from ..write_queue import run_write
 from ..models import Staff, SubDepartment, OvertimeWeek, Department
+from ..models.overtime import week_labels_sql
 from ..services.department import upsert_department_operation, ensure_department_operation
 from ..services.overtime import get_date_by_token
 from datetime import date
@@ -69,67 +81,99 @@ def get_department_from_cookie(department: Optional[str] = Cookie(None)) -> int:
         raise HTTPException(status_code=400, detail="Invalid department cookie")
 
 
-@router.get("/", response_model=List[StaffResponse])
-@router.get("", response_model=List[StaffResponse])
-async def get_staffs(
-    dept_id: int = Depends(get_department_from_cookie), db: Session = Depends(get_db)
-):
-    """Get staff by department with sub-department and overtime info"""
+def _load_staffs(db: Session, dept_id: int) -> List[Any]:
     staffs = db.execute(
-        text("""
+        text(
+            f"""
         SELECT
             s.id,
             s.name,
             s.department_id,
             s.sub_department_id,
             sd.name as sub_department_name,
-            COALESCE(ow.mon, 'bg-1') as mon,
-            COALESCE(ow.tue, 'bg-1') as tue,
-            COALESCE(ow.wed, 'bg-1') as wed,
-            COALESCE(ow.thu, 'bg-1') as thu,
-            COALESCE(ow.fri, 'bg-1') as fri,
-            COALESCE(ow.sat, 'bg-1') as sat,
-            COALESCE(ow.sun, 'bg-1') as sun
+            {week_labels_sql("ow")}
         FROM staffs s
         LEFT JOIN sub_departments sd ON s.sub_department_id = sd.id
         LEFT JOIN overtime_weeks ow ON ow.staff_id = s.id
         WHERE s.department_id = :dept_id
         ORDER BY s.name
-        """),
+        """
+        ),
         {"dept_id": dept_id},
     ).fetchall()
 
     return [staff._mapping for staff in staffs]
 
 
+@router.get("/", response_model=List[StaffResponse])
+@router.get("", response_model=List[StaffResponse])
+async def get_staffs(
+    request: Request,
+    response: Response,
+    dept_id: int = Depends(get_department_from_cookie),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get staff by department with sub-department and overtime info"""
+    key = ("staffs", dept_id)
+    scopes = (department_scope(dept_id),)
+    not_modified = conditional_get(
+        request, response, await read_cache.etag(db, key, scopes)
+    )
+    if not_modified is not None:
+        return not_modified
+    return await read_cache.get(
+        db, key, scopes, lambda: run_db(db, _load_staffs, dept_id)
+    )
+
+
 @router.get("/sub-departments", response_model=List[SubDepartmentResponse])
 async def get_sub_departments(
-    dept_id: int = Depends(get_department_from_cookie), db: Session = Depends(get_db)
+    dept_id: int = Depends(get_department_from_cookie),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get sub-departments for current department"""
-    sub_depts = (
-        db.query(SubDepartment).filter(SubDepartment.department_id == dept_id).all()
+    sub_depts = await run_db(
+        db,
+        lambda session: session.query(SubDepartment)
+        .filter(SubDepartment.department_id == dept_id)
+        .all(),
     )
     return sub_depts
 
 
-@router.post("/add")
-async def add_staff(
-    request: StaffAddRequest,
-    dept_id: int = Depends(get_department_from_cookie),
-    db: Session = Depends(get_db),
-):
-    """Add staff to current department"""
+def _touch_department_operations(db: Session, dept_id: int) -> None:
+    # Update operation record for the whole week to ensure department is active
+    # in all reports
+    dept = db.query(Department).filter(Department.id == dept_id).first()
+    if dept:
+        # 今天使用 upsert（锁定今天的按钮）
+        upsert_department_operation(db, dept.name, date.today())
+        # 周末使用 ensure（激活报表但不锁定第二天的按钮）
+        for token in ["sat", "sun"]:
+            target_date = get_date_by_token(token)
+            ensure_department_operation(db, dept.name, target_date)
+
+
+def _add_staff(db: Session, request: StaffAddRequest, dept_id: int) -> None:
     try:
+        begin_write_transaction(db)
+
         # Check if staff already exists
         existing_staff = db.query(Staff).filter(Staff.name == request.name).first()
 
         if existing_staff:
             # Update existing staff's department and sub-department
+            if existing_staff.department_id != dept_id:
+                queue_event(
+                    db,
+                    "staff",
+                    action="remove",
+                    department_id=existing_staff.department_id,
+                    name=request.name,
+                )
             setattr(existing_staff, "department_id", dept_id)
             setattr(existing_staff, "sub_department_id", request.sub_department_id)
             ensure_overtime_week(db, existing_staff.id)
-            db.commit()
         else:
             # Create new staff
             new_staff = Staff(
@@ -140,33 +184,31 @@ async def add_staff(
             db.add(new_staff)
             db.flush()
             ensure_overtime_week(db, new_staff.id)
-            db.commit()
-
-        # Update operation record for the whole week to ensure department is active in all reports
-        dept = db.query(Department).filter(Department.id == dept_id).first()
-        if dept:
-            # 今天使用 upsert（锁定今天的按钮）
-            upsert_department_operation(db, dept.name, date.today())
-            # 周末使用 ensure（激活报表但不锁定第二天的按钮）
-            for token in ["sat", "sun"]:
-                target_date = get_date_by_token(token)
-                ensure_department_operation(db, dept.name, target_date)
 
-        return {"success": True, "message": "Staff added successfully"}
+        queue_event(db, "staff", action="add", department_id=dept_id, name=request.name)
+        _touch_department_operations(db, dept_id)
+        commit_session(db)
 
     except Exception as e:
-        db.rollback()
+        rollback_session(db)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/remove")
-async def remove_staff(
-    request: StaffRemoveRequest,
+@router.post("/add")
+async def add_staff(
+    request: StaffAddRequest,
     dept_id: int = Depends(get_department_from_cookie),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Remove staff from current department"""
+    """Add staff to current department"""
+    await run_write(db, _add_staff, request, dept_id)
+    return {"success": True, "message": "Staff added successfully"}
+
+
+def _remove_staff(db: Session, request: StaffRemoveRequest, dept_id: int) -> None:
     try:
+        begin_write_transaction(db)
+
         staff = (
             db.query(Staff)
             .filter(Staff.name == request.name, Staff.department_id == dept_id)
@@ -179,20 +221,25 @@ async def remove_staff(
             )
 
         db.delete(staff)
-        db.commit()
-
-        # Update operation record for the whole week to ensure department is active in all reports
-        dept = db.query(Department).filter(Department.id == dept_id).first()
-        if dept:
-            # 今天使用 upsert（锁定今天的按钮）
-            upsert_department_operation(db, dept.name, date.today())
-            # 周末使用 ensure（激活报表但不锁定第二天的按钮）
-            for token in ["sat", "sun"]:
-                target_date = get_date_by_token(token)
-                ensure_department_operation(db, dept.name, target_date)
+        db.flush()
+        queue_event(
+            db, "staff", action="remove", department_id=dept_id, name=request.name
+        )
 
-        return {"success": True, "message": "Staff removed successfully"}
+        _touch_department_operations(db, dept_id)
+        commit_session(db)
 
     except Exception as e:
-        db.rollback()
+        rollback_session(db)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/remove")
+async def remove_staff(
+    request: StaffRemoveRequest,
+    dept_id: int = Depends(get_department_from_cookie),
+    db: AsyncSession = Depends(get_db),
+):
+    """Remove staff from current department"""
+    await run_write(db, _remove_staff, request, dept_id)
+    return {"success": True, "message": "Staff removed successfully"}
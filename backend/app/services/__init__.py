@@ -5,6 +5,9 @@ from .department import DepartmentService
 from .staff import StaffService
 from .overtime import OvertimeService
 from .exports import OvertimeTableExportService
+from .info import InfoService
+from .changes import ChangeJournalService
+from .reports import ReportService
 
 __all__ = [
     "BaseService",
@@ -12,4 +15,7 @@ __all__ = [
     "StaffService",
     "OvertimeService",
     "OvertimeTableExportService",
+    "InfoService",
+    "ChangeJournalService",
+    "ReportService",
 ]
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 
+from ..database import commit_session, rollback_session
 from ..utils import log_operation, log_error
 
 logger = logging.getLogger(__name__)
@@ -18,12 +19,12 @@ class BaseService:
     def _commit_or_rollback(self, operation: str, context: Optional[Dict[str, Any]] = None) -> bool:
         """Handle database commit with error handling and logging."""
         try:
-            self.db.commit()
+            commit_session(self.db)
             if context:
                 log_operation(operation, context)
             return True
         except SQLAlchemyError as e:
-            self.db.rollback()
+            rollback_session(self.db)
             log_error(f"{operation}_db_error", e, context or {})
             logger.error(f"Database error in {operation}: {str(e)}")
             return False
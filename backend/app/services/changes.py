@@ -0,0 +1,167 @@
+"""Incremental sync over the change journal (see ``models/change_journal.py``)."""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .base import BaseService
+from .overtime import DAY_TOKENS
+from ..database import begin_write_transaction, commit_session, rollback_session
+from ..models.overtime import STATUS_LABELS
+
+logger = logging.getLogger(__name__)
+
+CHANGES_PAGE_LIMIT = 1000
+CHANGE_JOURNAL_RETAIN_DAYS = int(os.environ.get("CHANGE_JOURNAL_RETAIN_DAYS", "30"))
+CHANGE_JOURNAL_MAX_ROWS = int(os.environ.get("CHANGE_JOURNAL_MAX_ROWS", "200000"))
+
+_DEPARTMENT_FILTER = " AND department_id = :dept_id"
+
+_OVERTIME_SQL = """
+SELECT j.staff_id, s.department_id, ow.staff_id IS NULL AS deleted,
+    {days}
+FROM (
+    SELECT staff_id, MAX(id) AS id FROM change_journal
+    WHERE entity = 'overtime' AND id > :since AND id <= :cursor{filter}
+    GROUP BY staff_id
+) j
+LEFT JOIN overtime_weeks ow ON ow.staff_id = j.staff_id
+LEFT JOIN staffs s ON s.id = j.staff_id
+ORDER BY j.id
+"""
+
+_OPERATIONS_SQL = """
+SELECT j.department_name, j.date, d.id AS department_id, op.id IS NULL AS deleted,
+    op.last_updated
+FROM (
+    SELECT department_name, date, MAX(id) AS id FROM change_journal
+    WHERE entity = 'operation' AND id > :since AND id <= :cursor{filter}
+    GROUP BY department_name, date
+) j
+LEFT JOIN department_operations op
+    ON op.department_name = j.department_name AND op.date = j.date
+LEFT JOIN departments d ON d.name = j.department_name
+ORDER BY j.id
+"""
+
+
+def _query(template: str, department_id: Optional[int]):
+    return text(
+        template.format(
+            days=", ".join(f"ow.{token}" for token in DAY_TOKENS),
+            filter=_DEPARTMENT_FILTER if department_id is not None else "",
+        )
+    )
+
+
+def compact_change_journal(
+    db: Session,
+    retain_days: int = CHANGE_JOURNAL_RETAIN_DAYS,
+    max_rows: int = CHANGE_JOURNAL_MAX_ROWS,
+) -> int:
+    """Delete journal entries older than ``retain_days`` or beyond ``max_rows``.
+
+    The newest entry is always kept, so ``MIN(id) - 1`` stays the oldest
+    cursor that can still be served; clients behind it are told to reset.
+    """
+    try:
+        begin_write_transaction(db)
+        removed = db.execute(
+            text(
+                """
+            DELETE FROM change_journal
+            WHERE id < (SELECT MAX(id) FROM change_journal)
+              AND (changed_at < datetime('now', :age)
+                   OR id <= (SELECT MAX(id) FROM change_journal) - :max_rows)
+            """
+            ),
+            {"age": f"-{max(0, retain_days)} days", "max_rows": max(1, max_rows)},
+        ).rowcount
+        commit_session(db)
+    except Exception:
+        rollback_session(db)
+        raise
+    if removed:
+        logger.info("Compacted %s change journal entries", removed)
+    return removed
+
+
+class ChangeJournalService(BaseService):
+    """Service answering "what changed since cursor N"."""
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+
+    def _latest(self) -> int:
+        return self.db.execute(
+            text("SELECT COALESCE(MAX(id), 0) FROM change_journal")
+        ).scalar()
+
+    def _floor(self) -> int:
+        """Oldest cursor still covered by the journal."""
+        return self.db.execute(
+            text("SELECT COALESCE(MIN(id) - 1, 0) FROM change_journal")
+        ).scalar()
+
+    def get_changes(
+        self,
+        since: int,
+        limit: int = CHANGES_PAGE_LIMIT,
+        department_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Rows of overtime_weeks and department_operations changed after ``since``.
+
+        Each changed row appears once, with its current values, or with
+        ``deleted`` set if it no longer exists. Pass the returned ``cursor``
+        as the next ``since``. When ``reset`` is true the journal no longer
+        covers ``since``: reload a full snapshot, then continue from ``cursor``.
+        """
+        latest = self._latest()
+        params: Dict[str, Any] = {"since": since, "cursor": latest}
+        if department_id is not None:
+            params["dept_id"] = department_id
+
+        # Page by journal entries: the limit-th matching entry ends the window.
+        window_end = self.db.execute(
+            text(
+                "SELECT id FROM change_journal WHERE id > :since AND id <= :cursor"
+                + (_DEPARTMENT_FILTER if department_id is not None else "")
+                + " ORDER BY id LIMIT 1 OFFSET :offset"
+            ),
+            {**params, "offset": max(1, limit) - 1},
+        ).scalar()
+        if window_end is not None:
+            params["cursor"] = window_end
+
+        overtime: List[Dict[str, Any]] = []
+        for row in self.db.execute(_query(_OVERTIME_SQL, department_id), params):
+            item = dict(row._mapping)
+            item["deleted"] = bool(item["deleted"])
+            for token in DAY_TOKENS:
+                item[token] = STATUS_LABELS.get(item[token])
+            overtime.append(item)
+        operations: List[Dict[str, Any]] = []
+        for row in self.db.execute(_query(_OPERATIONS_SQL, department_id), params):
+            item = dict(row._mapping)
+            item["deleted"] = bool(item["deleted"])
+            operations.append(item)
+
+        # Checked after reading, so a compaction that raced the reads is caught.
+        if since > latest or since < self._floor():
+            return {
+                "cursor": latest,
+                "reset": True,
+                "has_more": False,
+                "overtime": [],
+                "operations": [],
+            }
+        return {
+            "cursor": params["cursor"],
+            "reset": False,
+            "has_more": params["cursor"] < latest,
+            "overtime": overtime,
+            "operations": operations,
+        }
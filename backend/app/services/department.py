@@ -1,6 +1,8 @@
 """Department service for business logic."""
 
 from typing import List, Optional
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 import logging
@@ -11,36 +13,52 @@ from ..utils.logging import logger
 
 from datetime import date, datetime
 from ..models import Department, DepartmentOperation
+from ..events import queue_event
+
+
+def _department_id_subquery(department_name: str):
+    return (
+        select(Department.id)
+        .where(Department.name == department_name)
+        .scalar_subquery()
+    )
+
 
 def upsert_department_operation(db: Session, department_name: str, op_date: date):
     """
     更新或插入部门在特定日期的操作记录。
     会更新 last_updated 时间戳。
+    单条 INSERT ... ON CONFLICT DO UPDATE，加入调用方的事务，由调用方提交。
     """
     try:
-        # 尝试查找已存在的记录
-        db_op = db.query(DepartmentOperation).filter(
-            DepartmentOperation.department_name == department_name,
-            DepartmentOperation.date == op_date
-        ).first()
-        
-        if db_op:
-            # 更新最后操作时间
-            db_op.last_updated = datetime.now()
-        else:
-            # 创建新记录
-            db_op = DepartmentOperation(
-                department_name=department_name,
-                date=op_date,
-                last_updated=datetime.now()
+        now = datetime.now()
+        statement = sqlite_insert(DepartmentOperation).values(
+            department_name=department_name,
+            department_id=_department_id_subquery(department_name),
+            date=op_date,
+            last_updated=now,
+        )
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[
+                    DepartmentOperation.department_name,
+                    DepartmentOperation.date,
+                ],
+                set_={
+                    "department_id": statement.excluded.department_id,
+                    "last_updated": now,
+                },
             )
-            db.add(db_op)
-        
-        db.commit()
-        db.refresh(db_op)
-        return db_op
+        )
+        queue_event(
+            db,
+            "operation",
+            department=department_name,
+            date=op_date.isoformat(),
+            action="touch",
+        )
+        return True
     except Exception as e:
-        db.rollback()
         logger.error(f"Failed to upsert department operation for {department_name} on {op_date}: {e}")
         raise e
 
@@ -48,40 +66,58 @@ def ensure_department_operation(db: Session, department_name: str, op_date: date
     """
     确保部门在特定日期的操作记录存在。
     如果记录已存在，则不进行任何操作（不更新 last_updated）。
+    单条 INSERT ... ON CONFLICT DO NOTHING，由调用方提交。
     """
     try:
-        db_op = db.query(DepartmentOperation).filter(
-            DepartmentOperation.department_name == department_name,
-            DepartmentOperation.date == op_date
-        ).first()
-        
-        if not db_op:
-            db_op = DepartmentOperation(
+        result = db.execute(
+            sqlite_insert(DepartmentOperation)
+            .values(
                 department_name=department_name,
+                department_id=_department_id_subquery(department_name),
                 date=op_date,
-                last_updated=datetime.now()
+                last_updated=datetime.now(),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[
+                    DepartmentOperation.department_name,
+                    DepartmentOperation.date,
+                ]
+            )
+        )
+        if result.rowcount:
+            queue_event(
+                db,
+                "operation",
+                department=department_name,
+                date=op_date.isoformat(),
+                action="ensure",
             )
-            db.add(db_op)
-            db.commit()
         return True
     except Exception as e:
-        db.rollback()
         logger.error(f"Failed to ensure department operation for {department_name} on {op_date}: {e}")
         raise e
 
 def delete_department_operation(db: Session, department_name: str, op_date: date):
     """
-    删除部门在特定日期的操作记录。
+    删除部门在特定日期的操作记录。由调用方提交。
     """
     try:
-        db.query(DepartmentOperation).filter(
-            DepartmentOperation.department_name == department_name,
-            DepartmentOperation.date == op_date
-        ).delete()
-        db.commit()
+        result = db.execute(
+            delete(DepartmentOperation).where(
+                DepartmentOperation.department_name == department_name,
+                DepartmentOperation.date == op_date,
+            )
+        )
+        if result.rowcount:
+            queue_event(
+                db,
+                "operation",
+                department=department_name,
+                date=op_date.isoformat(),
+                action="delete",
+            )
         return True
     except Exception as e:
-        db.rollback()
         logger.error(f"Failed to delete department operation for {department_name} on {op_date}: {e}")
         raise e
 
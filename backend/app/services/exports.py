@@ -2,28 +2,52 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import date
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+import hashlib
 from io import BytesIO
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+import threading
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
-from reportlab.lib import colors
-from reportlab.lib.utils import ImageReader
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.cidfonts import UnicodeCIDFont
-from reportlab.pdfgen import canvas
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
-from ..models import OvertimeWeek, Staff, Department, DepartmentOperation
+from ..models import OvertimeHistory, OvertimeWeek, Staff, DepartmentOperation
+
+if TYPE_CHECKING:
+    from reportlab.pdfgen import canvas
+
+# reportlab (and Pillow behind it) is imported inside the rendering methods:
+# it is slow to import and only exports need it, so the API starts without it.
 
 logger = logging.getLogger(__name__)
 
 STATUS_INTERNAL = "bg-2"
 STATUS_TRIP = "bg-3"
 DEFAULT_FONT_NAME = "STSong-Light"
-NAME_FONT_SIZES = (14, 13, 12, 11, 10)
+NAME_FONT_SIZE_MAX = 14
+NAME_FONT_SIZE_MIN = 10
+NAME_FONT_SIZE_STEP = 0.5
+# Candidate name sizes, largest first: 14, 13.5, ..., 10.
+NAME_FONT_SIZES: Tuple[float, ...] = tuple(
+    NAME_FONT_SIZE_MAX - step * NAME_FONT_SIZE_STEP
+    for step in range(
+        int((NAME_FONT_SIZE_MAX - NAME_FONT_SIZE_MIN) / NAME_FONT_SIZE_STEP) + 1
+    )
+)
+# What happens to names that do not fit their cell even at the smallest size.
+OVERFLOW_TRUNCATE = "truncate"  # cut off with "..."
+OVERFLOW_CONTINUE = "continue"  # carried over to a continuation page
+OVERFLOW_MODES = (OVERFLOW_TRUNCATE, OVERFLOW_CONTINUE)
+CONTINUED_MARKER = "（续）"
+CONTINUATION_MARGIN = 40
+CONTINUATION_HEADING_FONT_SIZE = 14
+CONTINUATION_SECTION_GAP = 10
+# Part of every export digest; bump it when a code change alters rendered PDFs
+# so cached copies (which outlive restarts on disk) are not served again.
+EXPORT_RENDER_VERSION = 2
 REMARK_FONT_SIZE = 12
 TITLE_FONT_SIZE = 20
 TITLE_TEXT_CENTER_X = 350
@@ -95,66 +119,244 @@ TEMPLATE_ROWS: Tuple[TemplateRow, ...] = (
     TemplateRow("机加技术部", 7, 933, 1013),
 )
 
+# Form XObject holding the background, defined once per canvas.
+BACKGROUND_FORM_NAME = "background"
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 TEMPLATE_IMAGE_PATH = PROJECT_ROOT / "format.jpg"
 
 
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """The template background, decoded once with every cell already cleared.
+
+    A render draws ``image`` as-is instead of reading the template file and
+    painting white boxes over its cells again.
+    """
+
+    width: int
+    height: int
+    # (row_top, row_bottom) of the rows whose name and remark cells are cleared
+    cleared_rows: FrozenSet[Tuple[int, int]]
+    # The cleared PIL image.
+    image: Any = field(compare=False, repr=False)
+
+
+def _template_clear_boxes() -> List[Tuple[int, int, int, int]]:
+    """Image-space (left, top, right, bottom) boxes painted white under the text."""
+    boxes = [TITLE_CLEAR_BOX, FOOTER_VALUE_CLEAR_BOX]
+    for row in TEMPLATE_ROWS:
+        boxes.extend(_row_clear_boxes(row.row_top, row.row_bottom))
+    return boxes
+
+
+def _row_clear_boxes(row_top: int, row_bottom: int) -> List[Tuple[int, int, int, int]]:
+    return [
+        (NAME_COLUMN_LEFT + 1, row_top + 1, NAME_COLUMN_RIGHT - 1, row_bottom - 1),
+        (REMARK_COLUMN_LEFT + 1, row_top + 1, PAGE_BORDER_RIGHT - 1, row_bottom - 1),
+    ]
+
+
+def compile_template(path: Path = TEMPLATE_IMAGE_PATH) -> CompiledTemplate:
+    """Decode the template once and paint the clear boxes into it."""
+    if not path.exists():
+        raise FileNotFoundError(f"Template image not found: {path}")
+    from PIL import Image, ImageDraw
+
+    with Image.open(path) as source:
+        image = source.convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for left, top, right, bottom in _template_clear_boxes():
+        if right > left and bottom > top:
+            # PIL boxes include their last pixel; the PDF boxes end before it.
+            draw.rectangle((left, top, right - 1, bottom - 1), fill="white")
+
+    return CompiledTemplate(
+        width=image.width,
+        height=image.height,
+        cleared_rows=frozenset((row.row_top, row.row_bottom) for row in TEMPLATE_ROWS),
+        image=image,
+    )
+
+
+_compiled_template: Optional[CompiledTemplate] = None
+_compile_lock = threading.Lock()
+
+
+def get_compiled_template() -> CompiledTemplate:
+    """The process-wide compiled template, built on first use."""
+    global _compiled_template
+    if _compiled_template is None:
+        with _compile_lock:
+            if _compiled_template is None:
+                _compiled_template = compile_template()
+    return _compiled_template
+
+
+class GlyphWidths:
+    """Glyph widths of one font in font units (1/1000 em), measured once per character.
+
+    reportlab sums per-character widths for the CID font used here, so the
+    width of any string at any size is ``size * 0.001 * sum`` of these, the
+    same arithmetic ``pdfmetrics.stringWidth`` does. The font must already
+    be registered.
+    """
+
+    def __init__(self, font_name: str):
+        self.font_name = font_name
+        self._units: Dict[str, float] = {}
+
+    def units(self, char: str) -> float:
+        width = self._units.get(char)
+        if width is None:
+            from reportlab.pdfbase import pdfmetrics
+
+            width = pdfmetrics.stringWidth(char, self.font_name, 1000)
+            self._units[char] = width
+        return width
+
+    def prefix(self, text: str) -> Tuple[float, ...]:
+        """Cumulative widths: ``prefix[i]`` is ``text[:i]``'s width in font units."""
+        sums = [0.0]
+        total = 0.0
+        for char in text:
+            total += self.units(char)
+            sums.append(total)
+        return tuple(sums)
+
+    def width(self, text: str, font_size: float) -> float:
+        return font_size * 0.001 * sum(self.units(char) for char in text)
+
+
+_glyph_widths: Dict[str, GlyphWidths] = {}
+
+
+def glyph_widths(font_name: str = DEFAULT_FONT_NAME) -> GlyphWidths:
+    """The process-wide width table for ``font_name``."""
+    widths = _glyph_widths.get(font_name)
+    if widths is None:
+        widths = _glyph_widths.setdefault(font_name, GlyphWidths(font_name))
+    return widths
+
+
+@dataclass(frozen=True)
+class MeasuredRun:
+    """A name run as drawn (with its separator) and its cumulative glyph widths."""
+
+    text: str
+    underlined: bool
+    prefix: Tuple[float, ...]
+
+
+# (text, underlined, width in points) of one drawn piece of a name.
+NameSegment = Tuple[str, bool, float]
+
+
+@dataclass
+class NameLayout:
+    """A row's names laid out in its cell at ``font_size``.
+
+    ``overflow`` holds the segments that did not fit, in order.
+    """
+
+    font_size: float
+    lines: List[List[NameSegment]]
+    overflow: List[NameSegment]
+
+
+def export_digest(
+    export_date: date,
+    rows: Sequence[DepartmentExportRow],
+    overflow: str = OVERFLOW_TRUNCATE,
+) -> str:
+    """Content address of the PDF ``render_pdf`` produces for these inputs.
+
+    Covers the date (printed in the title), the rows, the overflow mode, the
+    template file and ``EXPORT_RENDER_VERSION``.
+    """
+    try:
+        template = TEMPLATE_IMAGE_PATH.stat()
+        template_stamp = (template.st_size, template.st_mtime_ns)
+    except OSError:
+        template_stamp = None
+    payload = (
+        EXPORT_RENDER_VERSION,
+        template_stamp,
+        export_date.isoformat(),
+        overflow,
+        tuple(rows),
+    )
+    return hashlib.blake2b(repr(payload).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def warm_up() -> None:
+    """Load reportlab, the font and the compiled template ahead of the first export."""
+    OvertimeTableExportService()._register_font()
+    get_compiled_template()
+
+
 class OvertimeTableExportService:
     """Build overtime export model and render template-based PDF output."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session] = None):
+        # Only building rows needs a session; rendering works without one.
         self.db = db
 
     def build_department_rows(self, export_date: date) -> List[DepartmentExportRow]:
         """Assemble per-row export data for the requested date."""
-        weekday_token = DAY_TOKEN_BY_WEEKDAY[export_date.weekday()]
-        status_column = getattr(OvertimeWeek, weekday_token)
-        
-        # 1. 获取当天有操作记录的部门
-        active_department_names = {
-            row.department_name
-            for row in self.db.query(DepartmentOperation.department_name)
-            .filter(DepartmentOperation.date == export_date)
-            .all()
-        }
-        
-        # 获取所有部门 ID 到名称的映射
-        dept_id_to_name = {
-            d.id: d.name 
-            for d in self.db.query(Department.id, Department.name).all()
+        grouped: Dict[int, Dict[str, List[str]]] = {
+            row.department_id: {STATUS_INTERNAL: [], STATUS_TRIP: []}
+            for row in TEMPLATE_ROWS
+            if row.department_id is not None
         }
 
-        raw_rows = (
-            self.db.query(
-                Staff.id.label("staff_id"),
+        today = date.today()
+        monday = today - timedelta(days=today.weekday())
+        if monday <= export_date <= monday + timedelta(days=6):
+            # The rolling week lives in overtime_weeks
+            weekday_token = DAY_TOKEN_BY_WEEKDAY[export_date.weekday()]
+            status_column = getattr(OvertimeWeek, weekday_token)
+            department_column = Staff.department_id
+            query = self.db.query(
                 Staff.name.label("staff_name"),
-                Staff.department_id.label("department_id"),
+                department_column.label("department_id"),
                 status_column.label("status"),
+            ).join(OvertimeWeek, OvertimeWeek.staff_id == Staff.id)
+        else:
+            # Other dates: one indexed range of overtime_history, grouped by
+            # the department each status was recorded under
+            status_column = OvertimeHistory.status
+            department_column = OvertimeHistory.department_id
+            query = (
+                self.db.query(
+                    Staff.name.label("staff_name"),
+                    department_column.label("department_id"),
+                    status_column.label("status"),
+                )
+                .select_from(OvertimeHistory)
+                .join(Staff, Staff.id == OvertimeHistory.staff_id)
+                .filter(OvertimeHistory.date == export_date)
+            )
+
+        # 只采集当天有操作记录的部门：在 SQL 中按 department_id 关联过滤
+        raw_rows = (
+            query.join(
+                DepartmentOperation,
+                and_(
+                    DepartmentOperation.department_id == department_column,
+                    DepartmentOperation.date == export_date,
+                ),
             )
-            .outerjoin(OvertimeWeek, OvertimeWeek.staff_id == Staff.id)
-            .order_by(Staff.department_id.asc(), Staff.name.asc(), Staff.id.asc())
+            .filter(
+                department_column.in_(list(grouped)),
+                status_column.in_((STATUS_INTERNAL, STATUS_TRIP)),
+            )
+            .order_by(department_column.asc(), Staff.name.asc(), Staff.id.asc())
             .all()
         )
 
-        grouped: Dict[int, Dict[str, List[str]]] = {
-            row.department_id: {STATUS_INTERNAL: [], STATUS_TRIP: []}
-            for row in TEMPLATE_ROWS
-            if row.department_id is not None
-        }
-
         for raw in raw_rows:
-            department_id = raw.department_id
-            if department_id not in grouped:
-                continue
-            
-            # 过滤逻辑：如果该部门今天没有操作记录，则不采集其加班人员
-            dept_name = dept_id_to_name.get(department_id)
-            if dept_name not in active_department_names:
-                continue
-
-            status = raw.status or "bg-1"
-            if status in (STATUS_INTERNAL, STATUS_TRIP):
-                grouped[department_id][status].append(raw.staff_name)
+            grouped[raw.department_id][raw.status].append(raw.staff_name)
 
         rows: List[DepartmentExportRow] = []
         for template_row in TEMPLATE_ROWS:
@@ -175,7 +377,7 @@ class OvertimeTableExportService:
             name_runs = [NameRun(name, underlined=False) for name in names_by_status[STATUS_INTERNAL]] + [
                 NameRun(name, underlined=True) for name in names_by_status[STATUS_TRIP]
             ]
-            
+
             # 只有当活跃部门名单不为空时，才更新 remark_count
             rows.append(
                 DepartmentExportRow(
@@ -190,68 +392,99 @@ class OvertimeTableExportService:
 
         return rows
 
-    def render_pdf(self, export_date: date, rows: Sequence[DepartmentExportRow]) -> bytes:
-        """Render a PDF document from the template image and export rows."""
-        page_width, page_height = self._load_template_size()
+    def render_pdf(
+        self,
+        export_date: date,
+        rows: Sequence[DepartmentExportRow],
+        overflow: str = OVERFLOW_TRUNCATE,
+    ) -> bytes:
+        """Render a PDF document from the compiled template and export rows.
+
+        ``overflow`` is one of ``OVERFLOW_MODES``: names that do not fit their
+        cell are either cut off or continued on extra pages.
+        """
+        if overflow not in OVERFLOW_MODES:
+            raise ValueError(
+                f"Unknown overflow mode '{overflow}', "
+                f"expected one of: {', '.join(OVERFLOW_MODES)}"
+            )
+        from reportlab.pdfgen import canvas
+
+        template = get_compiled_template()
+        page_width, page_height = template.width, template.height
         buffer = BytesIO()
         pdf = canvas.Canvas(buffer, pagesize=(page_width, page_height))
         self._register_font()
 
-        image = ImageReader(str(TEMPLATE_IMAGE_PATH))
-        pdf.drawImage(image, 0, 0, width=page_width, height=page_height)
-
-        self._clear_rect(pdf, page_height, *TITLE_CLEAR_BOX)
-        self._clear_rect(pdf, page_height, *FOOTER_VALUE_CLEAR_BOX)
+        self._draw_background(pdf, template)
 
+        # Rows outside TEMPLATE_ROWS are not baked into the background.
         for row in rows:
-            self._clear_rect(
-                pdf,
-                page_height,
-                NAME_COLUMN_LEFT + 1,
-                row.row_top + 1,
-                NAME_COLUMN_RIGHT - 1,
-                row.row_bottom - 1,
-            )
-            self._clear_rect(
-                pdf,
-                page_height,
-                REMARK_COLUMN_LEFT + 1,
-                row.row_top + 1,
-                PAGE_BORDER_RIGHT - 1,
-                row.row_bottom - 1,
-            )
+            if (row.row_top, row.row_bottom) in template.cleared_rows:
+                continue
+            for box in _row_clear_boxes(row.row_top, row.row_bottom):
+                self._clear_rect(pdf, page_height, *box)
 
         self._draw_title(pdf, page_height, export_date)
 
+        continued: List[Tuple[DepartmentExportRow, NameLayout]] = []
         for row in rows:
             if row.department_id is None:
                 continue
-            self._draw_department_names(pdf, page_height, export_date, row)
+            layout = self._draw_department_names(
+                pdf, page_height, export_date, row, overflow
+            )
+            if layout is not None and layout.overflow:
+                continued.append((row, layout))
             self._draw_remark_count(pdf, page_height, row)
 
         pdf.showPage()
+        if continued:
+            self._draw_continuation_pages(
+                pdf, page_width, page_height, export_date, continued
+            )
         pdf.save()
         return buffer.getvalue()
 
-    def build_pdf(self, export_date: date) -> bytes:
+    def build_pdf(self, export_date: date, overflow: str = OVERFLOW_TRUNCATE) -> bytes:
         """Build and render export PDF for the requested date."""
         rows = self.build_department_rows(export_date)
-        return self.render_pdf(export_date, rows)
+        return self.render_pdf(export_date, rows, overflow)
+
+    def _draw_background(self, pdf: canvas.Canvas, template: CompiledTemplate) -> None:
+        """Place the compiled template as a full-page form XObject.
 
-    def _load_template_size(self) -> Tuple[int, int]:
-        if not TEMPLATE_IMAGE_PATH.exists():
-            raise FileNotFoundError(f"Template image not found: {TEMPLATE_IMAGE_PATH}")
-        image = ImageReader(str(TEMPLATE_IMAGE_PATH))
-        width, height = image.getSize()
-        return int(width), int(height)
+        The form, and the image inside it, is written once per canvas; every
+        page that shows the background refers to it with ``doForm``.
+        """
+        if not pdf.hasForm(BACKGROUND_FORM_NAME):
+            from reportlab.lib.utils import ImageReader
+
+            pdf.beginForm(BACKGROUND_FORM_NAME)
+            pdf.drawImage(
+                ImageReader(template.image), 0, 0, template.width, template.height
+            )
+            pdf.endForm()
+        pdf.doForm(BACKGROUND_FORM_NAME)
 
     def _register_font(self) -> None:
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+
         if DEFAULT_FONT_NAME in pdfmetrics.getRegisteredFontNames():
             return
         pdfmetrics.registerFont(UnicodeCIDFont(DEFAULT_FONT_NAME))
 
-    def _draw_title(self, pdf: canvas.Canvas, page_height: int, export_date: date) -> None:
-        title = f"{self._to_cn_date(export_date)}  上班人员统计表"
+    def _draw_title(
+        self,
+        pdf: canvas.Canvas,
+        page_height: int,
+        export_date: date,
+        suffix: str = "",
+    ) -> None:
+        from reportlab.lib import colors
+
+        title = f"{self._to_cn_date(export_date)}  上班人员统计表{suffix}"
         pdf.setFillColor(colors.black)
         pdf.setFont(DEFAULT_FONT_NAME, TITLE_FONT_SIZE)
         pdf.drawCentredString(
@@ -266,9 +499,14 @@ class OvertimeTableExportService:
         page_height: int,
         export_date: date,
         row: DepartmentExportRow,
-    ) -> None:
+        overflow: str = OVERFLOW_TRUNCATE,
+    ) -> Optional[NameLayout]:
+        """Draw the row's names in its cell.
+
+        The layout's ``overflow`` is left for the continuation pages.
+        """
         if not row.name_runs:
-            return
+            return None
 
         box_left = NAME_COLUMN_LEFT + ROW_PADDING_X
         box_right = NAME_COLUMN_RIGHT - ROW_PADDING_X
@@ -277,57 +515,110 @@ class OvertimeTableExportService:
         box_width = max(1.0, float(box_right - box_left))
         box_height = max(1.0, float(box_bottom - box_top))
 
-        selected_font_size = NAME_FONT_SIZES[-1]
-        selected_lines: List[List[Tuple[str, bool, float]]] = []
-        overflowed = False
-
-        for font_size in NAME_FONT_SIZES:
-            lines, overflow = self._layout_name_runs(
-                row.name_runs,
-                font_size,
-                box_width,
-                box_height,
-                truncate=False,
-            )
-            if not overflow:
-                selected_font_size = font_size
-                selected_lines = lines
-                overflowed = False
-                break
-            selected_font_size = font_size
-            selected_lines = lines
-            overflowed = True
-
-        if overflowed:
-            selected_lines, _ = self._layout_name_runs(
-                row.name_runs,
-                selected_font_size,
-                box_width,
-                box_height,
-                truncate=True,
-            )
-            logger.warning(
-                "Export names overflow for department '%s' (%s) on %s",
-                row.template_name,
-                row.department_id,
-                export_date.isoformat(),
-            )
+        layout = self._fit_names(
+            self._measure_runs(row.name_runs), box_width, box_height
+        )
+        if layout.overflow:
+            if overflow == OVERFLOW_CONTINUE:
+                self._mark_continued(layout, box_width)
+            else:
+                layout.lines = self._truncate_lines(
+                    layout.lines, layout.font_size, box_width
+                )
+                layout.overflow = []
+                logger.warning(
+                    "Export names overflow for department '%s' (%s) on %s",
+                    row.template_name,
+                    row.department_id,
+                    export_date.isoformat(),
+                )
+
+        self._draw_name_lines(
+            pdf,
+            layout.lines,
+            layout.font_size,
+            box_left,
+            self._to_pdf_y(page_height, box_top + layout.font_size),
+        )
+        return layout
+
+    def _draw_name_lines(
+        self,
+        pdf: canvas.Canvas,
+        lines: Sequence[Sequence[NameSegment]],
+        font_size: float,
+        left: float,
+        baseline_y: float,
+    ) -> None:
+        from reportlab.lib import colors
 
-        line_height = selected_font_size + 3
-        baseline_y = self._to_pdf_y(page_height, box_top + selected_font_size)
         pdf.setFillColor(colors.black)
         pdf.setStrokeColor(colors.black)
-        pdf.setFont(DEFAULT_FONT_NAME, selected_font_size)
+        pdf.setFont(DEFAULT_FONT_NAME, font_size)
 
-        for line in selected_lines:
-            cursor_x = float(box_left)
+        for line in lines:
+            cursor_x = float(left)
             for text, underlined, text_width in line:
                 pdf.drawString(cursor_x, baseline_y, text)
                 if underlined and text.strip():
                     underline_y = baseline_y - 1.5
                     pdf.line(cursor_x, underline_y, cursor_x + text_width, underline_y)
                 cursor_x += text_width
-            baseline_y -= line_height
+            baseline_y -= self._name_line_height(font_size)
+
+    def _draw_continuation_pages(
+        self,
+        pdf: canvas.Canvas,
+        page_width: int,
+        page_height: int,
+        export_date: date,
+        continued: Sequence[Tuple[DepartmentExportRow, NameLayout]],
+    ) -> None:
+        """Draw the names that did not fit their cells on plain follow-on pages.
+
+        Each department gets a "（续）" heading and its remaining names at the
+        size its cell used, wrapped to the page width.
+        """
+        from reportlab.lib import colors
+
+        box_left = CONTINUATION_MARGIN
+        box_width = float(page_width - 2 * CONTINUATION_MARGIN)
+        box_bottom = page_height - CONTINUATION_MARGIN
+        heading_height = CONTINUATION_HEADING_FONT_SIZE + 6
+
+        def new_page() -> float:
+            self._draw_title(pdf, page_height, export_date, CONTINUED_MARKER)
+            return float(PAGE_TOP + CONTINUATION_SECTION_GAP)
+
+        cursor_y = new_page()
+        for row, layout in continued:
+            line_height = self._name_line_height(layout.font_size)
+            if cursor_y + heading_height + line_height > box_bottom:
+                pdf.showPage()
+                cursor_y = new_page()
+            pdf.setFillColor(colors.black)
+            pdf.setFont(DEFAULT_FONT_NAME, CONTINUATION_HEADING_FONT_SIZE)
+            pdf.drawString(
+                box_left,
+                self._to_pdf_y(page_height, cursor_y + CONTINUATION_HEADING_FONT_SIZE),
+                f"{row.template_name}{CONTINUED_MARKER}",
+            )
+            cursor_y += heading_height
+
+            for line in self._wrap_segments(layout.overflow, box_width):
+                if cursor_y + line_height > box_bottom:
+                    pdf.showPage()
+                    cursor_y = new_page()
+                self._draw_name_lines(
+                    pdf,
+                    [line],
+                    layout.font_size,
+                    box_left,
+                    self._to_pdf_y(page_height, cursor_y + layout.font_size),
+                )
+                cursor_y += line_height
+            cursor_y += CONTINUATION_SECTION_GAP
+        pdf.showPage()
 
     def _draw_remark_count(
         self,
@@ -337,6 +628,8 @@ class OvertimeTableExportService:
     ) -> None:
         if row.remark_count is None:
             return
+        from reportlab.lib import colors
+
         center_x = (REMARK_COLUMN_LEFT + PAGE_BORDER_RIGHT) / 2
         center_y = (row.row_top + row.row_bottom) / 2
         pdf.setFillColor(colors.black)
@@ -347,20 +640,68 @@ class OvertimeTableExportService:
             str(row.remark_count),
         )
 
-    def _layout_name_runs(
+    def _measure_runs(self, name_runs: Sequence[NameRun]) -> List[MeasuredRun]:
+        widths = glyph_widths(DEFAULT_FONT_NAME)
+        measured: List[MeasuredRun] = []
+        for index, run in enumerate(name_runs):
+            text = run.text
+            if index < len(name_runs) - 1:
+                text = f"{text}、"
+            measured.append(MeasuredRun(text, run.underlined, widths.prefix(text)))
+        return measured
+
+    def _fit_names(
         self,
-        name_runs: Sequence[NameRun],
-        font_size: int,
+        measured: Sequence[MeasuredRun],
         box_width: float,
         box_height: float,
-        truncate: bool,
-    ) -> Tuple[List[List[Tuple[str, bool, float]]], bool]:
-        line_height = font_size + 3
-        max_lines = max(1, int(box_height // line_height))
-        segments = self._split_runs(name_runs, font_size, box_width)
-
-        lines: List[List[Tuple[str, bool, float]]] = []
-        current_line: List[Tuple[str, bool, float]] = []
+    ) -> NameLayout:
+        """Lay the names out at the largest ``NAME_FONT_SIZES`` entry that fits the box.
+
+        A larger size never needs fewer lines, so the largest fitting size is
+        found by binary search; most rows fit at the first size and take a
+        single layout. If even the smallest size overflows, that layout is
+        returned with the rest in ``overflow``.
+        """
+
+        def layout_at(index: int) -> NameLayout:
+            font_size = NAME_FONT_SIZES[index]
+            max_lines = max(1, int(box_height // self._name_line_height(font_size)))
+            lines = self._wrap_segments(
+                self._split_runs(measured, font_size, box_width), box_width
+            )
+            rest = [segment for line in lines[max_lines:] for segment in line]
+            return NameLayout(font_size, lines[:max_lines], rest)
+
+        best = layout_at(0)
+        if not best.overflow:
+            return best
+        best = layout_at(len(NAME_FONT_SIZES) - 1)
+        if best.overflow:
+            return best
+
+        # NAME_FONT_SIZES[low - 1] overflows and NAME_FONT_SIZES[high + 1] fits.
+        low, high = 1, len(NAME_FONT_SIZES) - 2
+        while low <= high:
+            middle = (low + high) // 2
+            layout = layout_at(middle)
+            if layout.overflow:
+                low = middle + 1
+            else:
+                best = layout
+                high = middle - 1
+        return best
+
+    def _name_line_height(self, font_size: float) -> float:
+        return font_size + 3
+
+    def _wrap_segments(
+        self,
+        segments: Sequence[NameSegment],
+        box_width: float,
+    ) -> List[List[NameSegment]]:
+        lines: List[List[NameSegment]] = []
+        current_line: List[NameSegment] = []
         current_width = 0.0
 
         for text, underlined, width in segments:
@@ -373,20 +714,21 @@ class OvertimeTableExportService:
 
         if current_line:
             lines.append(current_line)
+        return lines
 
-        overflow = len(lines) > max_lines
-        if not overflow:
-            return lines, False
-
-        if not truncate:
-            return lines[:max_lines], True
-
-        truncated = lines[:max_lines]
-        if not truncated:
-            return [], True
-
-        ellipsis_width = pdfmetrics.stringWidth("...", DEFAULT_FONT_NAME, font_size)
-        last_line = truncated[-1]
+    def _truncate_lines(
+        self,
+        lines: List[List[NameSegment]],
+        font_size: float,
+        box_width: float,
+    ) -> List[List[NameSegment]]:
+        """End the last line with "...", trimming characters until it fits."""
+        if not lines:
+            return []
+
+        widths = glyph_widths(DEFAULT_FONT_NAME)
+        ellipsis_width = widths.width("...", font_size)
+        last_line = list(lines[-1])
         line_width = sum(width for _, _, width in last_line)
 
         while last_line and line_width + ellipsis_width > box_width:
@@ -396,71 +738,74 @@ class OvertimeTableExportService:
                 line_width -= width
                 continue
             trimmed_text = text[:-1]
-            trimmed_width = pdfmetrics.stringWidth(
-                trimmed_text,
-                DEFAULT_FONT_NAME,
-                font_size,
-            )
+            trimmed_width = widths.width(trimmed_text, font_size)
             last_line[-1] = (trimmed_text, underlined, trimmed_width)
             line_width = line_width - width + trimmed_width
 
         last_line.append(("...", False, ellipsis_width))
-        return truncated, True
+        return lines[:-1] + [last_line]
+
+    def _mark_continued(self, layout: NameLayout, box_width: float) -> None:
+        """End the last line with the continuation marker.
+
+        Whole segments make room for it and move to the front of ``overflow``,
+        so no character is lost between the cell and the continuation page.
+        """
+        marker_width = glyph_widths(DEFAULT_FONT_NAME).width(
+            CONTINUED_MARKER, layout.font_size
+        )
+        last_line = layout.lines[-1]
+        line_width = sum(width for _, _, width in last_line)
+        moved: List[NameSegment] = []
+        while last_line and line_width + marker_width > box_width:
+            segment = last_line.pop()
+            line_width -= segment[2]
+            moved.append(segment)
+        layout.overflow[:0] = reversed(moved)
+        last_line.append((CONTINUED_MARKER, False, marker_width))
 
     def _split_runs(
         self,
-        name_runs: Sequence[NameRun],
-        font_size: int,
+        measured: Sequence[MeasuredRun],
+        font_size: float,
         box_width: float,
-    ) -> List[Tuple[str, bool, float]]:
-        split_segments: List[Tuple[str, bool, float]] = []
-        for index, run in enumerate(name_runs):
-            text = run.text
-            if index < len(name_runs) - 1:
-                text = f"{text}、"
-
-            split_segments.extend(
-                self._split_text_segment(text, run.underlined, font_size, box_width)
-            )
+    ) -> List[NameSegment]:
+        split_segments: List[NameSegment] = []
+        for run in measured:
+            split_segments.extend(self._split_text_segment(run, font_size, box_width))
         return split_segments
 
     def _split_text_segment(
         self,
-        text: str,
-        underlined: bool,
-        font_size: int,
+        run: MeasuredRun,
+        font_size: float,
         box_width: float,
-    ) -> List[Tuple[str, bool, float]]:
-        width = pdfmetrics.stringWidth(text, DEFAULT_FONT_NAME, font_size)
-        if width <= box_width:
-            return [(text, underlined, width)]
-
-        segments: List[Tuple[str, bool, float]] = []
-        cursor = ""
-        for char in text:
-            candidate = f"{cursor}{char}"
-            candidate_width = pdfmetrics.stringWidth(
-                candidate,
-                DEFAULT_FONT_NAME,
-                font_size,
-            )
-            if candidate_width <= box_width:
-                cursor = candidate
+    ) -> List[NameSegment]:
+        """Break ``run`` into the longest pieces that fit ``box_width``, in one pass.
+
+        A single character wider than the box still gets a piece of its own.
+        """
+        scale = font_size * 0.001
+        prefix = run.prefix
+        segments: List[NameSegment] = []
+        start = 0
+        for end in range(1, len(run.text) + 1):
+            if scale * (prefix[end] - prefix[start]) <= box_width:
                 continue
-
-            if cursor:
-                cursor_width = pdfmetrics.stringWidth(
-                    cursor,
-                    DEFAULT_FONT_NAME,
-                    font_size,
+            if end - 1 > start:
+                segments.append(
+                    (
+                        run.text[start : end - 1],
+                        run.underlined,
+                        scale * (prefix[end - 1] - prefix[start]),
+                    )
                 )
-                segments.append((cursor, underlined, cursor_width))
-            cursor = char
-
-        if cursor:
-            cursor_width = pdfmetrics.stringWidth(cursor, DEFAULT_FONT_NAME, font_size)
-            segments.append((cursor, underlined, cursor_width))
+                start = end - 1
 
+        if start < len(run.text):
+            segments.append(
+                (run.text[start:], run.underlined, scale * (prefix[-1] - prefix[start]))
+            )
         return segments
 
     def _clear_rect(
@@ -476,6 +821,8 @@ class OvertimeTableExportService:
         height = max(0, bottom - top)
         if width == 0 or height == 0:
             return
+        from reportlab.lib import colors
+
         pdf.setFillColor(colors.white)
         pdf.rect(
             left,
@@ -0,0 +1,115 @@
+"""Info page statistics aggregated inside SQLite."""
+
+import json
+import sqlite3
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .base import BaseService
+from .overtime import DAY_TOKENS
+from ..database import get_china_day
+from ..models.overtime import STATUS_CODES
+
+STATUS_KEYS = {STATUS_CODES["bg-2"]: "normal", STATUS_CODES["bg-3"]: "evection"}
+
+# One branch per rolling-week day: departments with an operation on that date,
+# their staff (ix_staffs_department_id_name) and that day's status column.
+_CELLS_SQL = " UNION ALL ".join(
+    f"""
+    SELECT {index} AS idx, ow.{token} AS status,
+        s.department_id AS department_id, s.name AS staff_name, s.id AS staff_id
+    FROM department_operations op
+    JOIN staffs s ON s.department_id = op.department_id
+    JOIN overtime_weeks ow ON ow.staff_id = s.id
+    WHERE op.date = :{token} AND ow.{token} IN ({', '.join(map(str, STATUS_KEYS))})"""
+    for index, token in enumerate(DAY_TOKENS)
+)
+
+# Any other week: one date range over overtime_history, with the department
+# recorded when each status was set.
+_HISTORY_CELLS_SQL = f"""
+    SELECT CAST(julianday(h.date) - julianday(:mon) AS INTEGER) AS idx,
+        h.status AS status, h.department_id AS department_id,
+        s.name AS staff_name, s.id AS staff_id
+    FROM overtime_history h
+    JOIN department_operations op
+        ON op.department_id = h.department_id AND op.date = h.date
+    JOIN staffs s ON s.id = h.staff_id
+    WHERE h.date BETWEEN :mon AND :sun
+        AND h.status IN ({', '.join(map(str, STATUS_KEYS))})"""
+
+# ORDER BY inside aggregates needs SQLite 3.44+. Older builds feed the
+# aggregate from a pre-sorted subquery instead.
+if sqlite3.sqlite_version_info >= (3, 44, 0):
+    _NAMES_SQL = "json_group_array(staff_name ORDER BY staff_name, staff_id)"
+    _CELLS_ORDER = ""
+else:
+    _NAMES_SQL = "json_group_array(staff_name)"
+    _CELLS_ORDER = " ORDER BY idx, status, department_id, staff_name, staff_id"
+
+
+def _statistics_sql(cells: str):
+    return text(
+        f"""
+WITH grouped AS (
+    SELECT idx, status, department_id, {_NAMES_SQL} AS names
+    FROM (SELECT * FROM ({cells}){_CELLS_ORDER})
+    GROUP BY idx, status, department_id
+)
+SELECT g.idx, g.status, d.name AS dept_name, g.names
+FROM grouped g
+JOIN departments d ON d.id = g.department_id
+ORDER BY g.idx, g.status, d.name
+"""
+    )
+
+
+STATISTICS_SQL = _statistics_sql(_CELLS_SQL)
+HISTORY_STATISTICS_SQL = _statistics_sql(_HISTORY_CELLS_SQL)
+
+
+class InfoService(BaseService):
+    """Service for the cross-department info page."""
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+
+    @staticmethod
+    def rolling_week_dates(today: Optional[date] = None) -> Dict[str, date]:
+        """Map each day token to its date in the rolling week containing ``today``."""
+        today = today or date.today()
+        monday = today - timedelta(days=today.weekday())
+        return {token: monday + timedelta(days=i) for i, token in enumerate(DAY_TOKENS)}
+
+    def get_statistics(
+        self, today: Optional[date] = None, week: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """Per-day maps of department -> staff names for overtime and trips.
+
+        Covers the rolling week containing ``today``, read from the live
+        ``overtime_weeks``, or the week containing ``week`` when that is
+        another week, read from ``overtime_history``. Only departments with
+        an operation record on a given day are counted. SQLite groups the
+        names per (day, status, department); Python only places the
+        prebuilt lists into the response.
+        """
+        current = self.rolling_week_dates(today)
+        dates = current
+        statement = STATISTICS_SQL
+        if week is not None and week not in current.values():
+            dates = self.rolling_week_dates(week)
+            statement = HISTORY_STATISTICS_SQL
+        days: Dict[str, Dict[str, Dict[str, List[str]]]] = {
+            token: {"normal": {}, "evection": {}} for token in DAY_TOKENS
+        }
+        rows = self.db.execute(
+            statement, {token: day.isoformat() for token, day in dates.items()}
+        )
+        for row in rows:
+            days[DAY_TOKENS[row.idx]][STATUS_KEYS[row.status]][row.dept_name] = (
+                json.loads(row.names)
+            )
+        return {"today": get_china_day(), "days": days}
@@ -1,19 +1,96 @@
 """Overtime service for business logic."""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Set, Tuple
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import exists, insert, literal, select, text, update
 from fastapi import HTTPException
 import logging
 
 from .base import BaseService
-from ..models import Staff, Sat, Sun, OvertimeWeek
+from ..database import begin_write_transaction, commit_session, rollback_session
+from ..events import queue_event
+from ..models import Department, Staff, OvertimeWeek, OvertimeHistory
+from ..models.department_summary import (
+    department_summary_sql,
+    rebuild_department_summary_sql,
+)
 from .department import DepartmentService, upsert_department_operation
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
 DAY_TOKENS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+MAX_BATCH_CHANGES = 1000
+
+# Per-day counts come from department_day_summary, which triggers keep
+# current (see models/department_summary.py).
+STATISTICS_MATRIX_SQL = text(
+    """
+SELECT d.id AS department_id, d.name AS department_name,
+    sm.day, sm.total_staff, sm.internal, sm.trip
+FROM departments d
+LEFT JOIN department_day_summary sm ON sm.department_id = d.id
+ORDER BY d.name, d.id
+"""
+)
+DEPARTMENT_STATISTICS_SQL = text(
+    """
+SELECT d.name AS department_name, sm.total_staff, sm.internal, sm.trip
+FROM departments d
+LEFT JOIN department_day_summary sm ON sm.department_id = d.id AND sm.day = :day
+WHERE d.id = :dept_id
+"""
+)
+
+
+def rebuild_department_summary(db: Session) -> int:
+    """Recompute department_day_summary from scratch; returns the rows written."""
+    try:
+        begin_write_transaction(db)
+        written = 0
+        for statement in rebuild_department_summary_sql():
+            written = db.execute(text(statement)).rowcount
+        commit_session(db)
+    except Exception:
+        rollback_session(db)
+        raise
+    logger.info("Rebuilt department_day_summary: %s rows", written)
+    return written
+
+
+def check_department_summary(db: Session) -> List[Dict[str, Any]]:
+    """Compare department_day_summary with a full recount.
+
+    Returns one entry per (department_id, day) that drifted, with the
+    ``expected`` and ``actual`` (total_staff, internal, trip). A missing row
+    and an all-zero row are the same.
+    """
+
+    def counts(sql: str) -> Dict[Tuple[int, str], Tuple[int, int, int]]:
+        return {
+            (row.department_id, row.day): (row.total_staff, row.internal, row.trip)
+            for row in db.execute(text(sql))
+        }
+
+    expected = counts(department_summary_sql())
+    actual = counts(
+        "SELECT department_id, day, total_staff, internal, trip "
+        "FROM department_day_summary"
+    )
+    zero = (0, 0, 0)
+    return [
+        {
+            "department_id": department_id,
+            "day": day,
+            "expected": expected.get((department_id, day), zero),
+            "actual": actual.get((department_id, day), zero),
+        }
+        for department_id, day in sorted(set(expected) | set(actual))
+        if expected.get((department_id, day), zero)
+        != actual.get((department_id, day), zero)
+    ]
+
 
 def get_date_by_token(day_token: str) -> date:
     """根据星期几的 token（如 'sat'）计算出本周对应的具体日期。"""
@@ -28,55 +105,57 @@ def get_date_by_token(day_token: str) -> date:
         return today
 
 
-def _legacy_status(record: Optional[Sat]) -> str:
-    if not record:
-        return "bg-1"
-    return "bg-3" if record.is_evection is True else "bg-2"
-
-
-def backfill_overtime_weeks(db: Session) -> int:
-    """Backfill unified overtime records from legacy sat/sun tables."""
-    created = 0
-    try:
-        staff_ids = [row.id for row in db.query(Staff.id).all()]
-        if not staff_ids:
-            return 0
-
-        existing_ids = {
-            row.staff_id
-            for row in db.query(OvertimeWeek.staff_id)
-            .filter(OvertimeWeek.staff_id.in_(staff_ids))
-            .all()
-        }
-
-        sat_records = {
-            record.staff_id: record
-            for record in db.query(Sat).filter(Sat.staff_id.in_(staff_ids)).all()
-        }
-        sun_records = {
-            record.staff_id: record
-            for record in db.query(Sun).filter(Sun.staff_id.in_(staff_ids)).all()
+def _history_upsert(statement):
+    return statement.on_conflict_do_update(
+        index_elements=[OvertimeHistory.date, OvertimeHistory.staff_id],
+        set_={
+            "department_id": statement.excluded.department_id,
+            "status": statement.excluded.status,
+            "updated_at": statement.excluded.updated_at,
+        },
+    )
+
+
+def record_overtime_history(
+    db: Session, entries: Iterable[Tuple[int, Optional[int], date, str]]
+) -> None:
+    """Upsert (staff_id, department_id, date, status) rows into overtime_history.
+
+    Joins the caller's transaction, like the department operation upserts.
+    """
+    now = datetime.now()
+    values = [
+        {
+            "staff_id": staff_id,
+            "department_id": department_id,
+            "date": day,
+            "status": status,
+            "updated_at": now,
         }
-
-        for staff_id in staff_ids:
-            if staff_id in existing_ids:
-                continue
-
-            week = OvertimeWeek(
-                staff_id=staff_id,
-                sat=_legacy_status(sat_records.get(staff_id)),
-                sun=_legacy_status(sun_records.get(staff_id)),
+        for staff_id, department_id, day, status in entries
+    ]
+    if values:
+        db.execute(_history_upsert(sqlite_insert(OvertimeHistory).values(values)))
+
+
+def record_department_history(
+    db: Session, department_id: int, day: date, status: str
+) -> None:
+    """Set ``status`` on ``day`` for every staff of a department in one statement."""
+    db.execute(
+        _history_upsert(
+            sqlite_insert(OvertimeHistory).from_select(
+                ["staff_id", "department_id", "date", "status", "updated_at"],
+                select(
+                    Staff.id,
+                    Staff.department_id,
+                    literal(day, OvertimeHistory.date.type),
+                    literal(status, OvertimeHistory.status.type),
+                    literal(datetime.now(), OvertimeHistory.updated_at.type),
+                ).where(Staff.department_id == department_id),
             )
-            db.add(week)
-            created += 1
-
-        if created:
-            db.commit()
-        return created
-    except Exception as exc:
-        db.rollback()
-        logger.exception("Failed to backfill overtime weeks")
-        raise
+        )
+    )
 
 
 class OvertimeService(BaseService):
@@ -126,6 +205,8 @@ class OvertimeService(BaseService):
                 day,
             )
 
+            begin_write_transaction(self.db)
+
             # Validate staff exists
             staff = self._get_by_id(Staff, staff_id, "Staff")
 
@@ -145,10 +226,22 @@ class OvertimeService(BaseService):
                 logger.debug("Created overtime week for staff %s", staff_id)
 
             setattr(record, day, target_status)
+            queue_event(
+                self.db,
+                "overtime",
+                staff_id=staff_id,
+                department_id=staff.department_id,
+                day=day,
+                status=target_status,
+            )
+
+            target_date = get_date_by_token(day)
+            record_overtime_history(
+                self.db, [(staff_id, staff.department_id, target_date, target_status)]
+            )
 
             # Update operation record - use the actual date for that day_token
             if staff.department:
-                target_date = get_date_by_token(day)
                 upsert_department_operation(self.db, staff.department.name, target_date)
 
             success = self._commit_or_rollback(
@@ -170,8 +263,10 @@ class OvertimeService(BaseService):
             return True
 
         except (ValueError, HTTPException):
+            rollback_session(self.db)
             raise
         except Exception as e:
+            rollback_session(self.db)
             self._log_error(
                 "toggle_staff_status",
                 e,
@@ -179,46 +274,176 @@ class OvertimeService(BaseService):
             )
             raise HTTPException(status_code=500, detail="Failed to toggle staff status")
 
-    def apply_to_all(self, department_id: int, status: str, day: str) -> bool:
-        """Apply status to all staff in department."""
+    def batch_toggle(self, changes: Sequence[Tuple[int, str, str]]) -> int:
+        """Set many (staff_id, status, day) changes in a single transaction.
+
+        All changes are validated before anything is written. Later entries for
+        the same staff/day win. One department operation upsert is written per
+        affected (department, date). Returns the number of applied changes.
+        """
         try:
-            self._validate_id(department_id, "Department ID")
-            self._validate_day(day)
-            self._validate_status(status)
+            if not changes:
+                raise ValueError("No changes provided")
+            if len(changes) > MAX_BATCH_CHANGES:
+                raise ValueError(
+                    f"Too many changes: at most {MAX_BATCH_CHANGES} per batch"
+                )
 
-            # Validate department exists
-            self.department_service.validate_department_exists(department_id)
+            targets: Dict[Tuple[int, str], str] = {}
+            for staff_id, target_status, day in changes:
+                self._validate_id(staff_id, "Staff ID")
+                self._validate_day(day)
+                self._validate_status(target_status)
+                targets[(staff_id, day)] = target_status
 
-            # Get all staff in department
-            staffs = (
-                self.db.query(Staff).filter(Staff.department_id == department_id).all()
-            )
+            staff_ids = sorted({staff_id for staff_id, _ in targets})
 
-            if not staffs:
-                logger.info(f"No staff found in department {department_id}")
-                return True
+            begin_write_transaction(self.db)
+
+            staff_rows = {
+                row.id: row
+                for row in self.db.query(
+                    Staff.id,
+                    Staff.department_id,
+                    Department.name.label("department_name"),
+                )
+                .outerjoin(Department, Department.id == Staff.department_id)
+                .filter(Staff.id.in_(staff_ids))
+                .all()
+            }
+            department_names = {
+                staff_id: row.department_name for staff_id, row in staff_rows.items()
+            }
+            missing = [
+                staff_id for staff_id in staff_ids if staff_id not in department_names
+            ]
+            if missing:
+                raise HTTPException(
+                    status_code=404, detail=f"Staff not found: {missing}"
+                )
 
-            staff_ids = [staff.id for staff in staffs]
-            existing_records = {
+            records = {
                 record.staff_id: record
                 for record in self.db.query(OvertimeWeek)
                 .filter(OvertimeWeek.staff_id.in_(staff_ids))
                 .all()
             }
 
-            updated_count = 0
-            for staff in staffs:
-                record = existing_records.get(staff.id)
+            operations: Set[Tuple[str, date]] = set()
+            history: List[Tuple[int, Optional[int], date, str]] = []
+            for (staff_id, day), target_status in targets.items():
+                record = records.get(staff_id)
                 if not record:
-                    record = OvertimeWeek(staff_id=staff.id)
+                    record = OvertimeWeek(staff_id=staff_id)
                     self.db.add(record)
-                setattr(record, day, status)
-                updated_count += 1
+                    records[staff_id] = record
+                setattr(record, day, target_status)
+                queue_event(
+                    self.db,
+                    "overtime",
+                    staff_id=staff_id,
+                    department_id=staff_rows[staff_id].department_id,
+                    day=day,
+                    status=target_status,
+                )
 
-            # Update operation record - use the actual date for that day_token
-            if staffs and staffs[0].department:
                 target_date = get_date_by_token(day)
-                upsert_department_operation(self.db, staffs[0].department.name, target_date)
+                history.append(
+                    (
+                        staff_id,
+                        staff_rows[staff_id].department_id,
+                        target_date,
+                        target_status,
+                    )
+                )
+                department_name = department_names[staff_id]
+                if department_name:
+                    operations.add((department_name, target_date))
+
+            record_overtime_history(self.db, history)
+            for department_name, target_date in sorted(operations):
+                upsert_department_operation(self.db, department_name, target_date)
+
+            success = self._commit_or_rollback(
+                "batch_toggle",
+                {"staff_count": len(staff_ids), "change_count": len(targets)},
+            )
+            if not success:
+                raise HTTPException(
+                    status_code=500, detail="Failed to update staff status"
+                )
+
+            logger.info(
+                "Batch updated %s changes for %s staff", len(targets), len(staff_ids)
+            )
+            return len(targets)
+
+        except (ValueError, HTTPException):
+            rollback_session(self.db)
+            raise
+        except Exception as e:
+            rollback_session(self.db)
+            self._log_error("batch_toggle", e, {"change_count": len(changes)})
+            raise HTTPException(status_code=500, detail="Failed to toggle staff status")
+
+    def apply_to_all(self, department_id: int, status: str, day: str) -> int:
+        """Apply status to all staff in department.
+
+        Runs as one set-based UPDATE plus one INSERT ... SELECT for staff that
+        have no week row yet. Returns the number of affected staff.
+        """
+        try:
+            self._validate_id(department_id, "Department ID")
+            self._validate_day(day)
+            self._validate_status(status)
+
+            # Validate department exists
+            department = self.department_service.validate_department_exists(
+                department_id
+            )
+
+            begin_write_transaction(self.db)
+
+            department_staff = select(Staff.id).where(
+                Staff.department_id == department_id
+            )
+            updated_count = self.db.execute(
+                update(OvertimeWeek)
+                .where(OvertimeWeek.staff_id.in_(department_staff))
+                .values({day: status}),
+                execution_options={"synchronize_session": False},
+            ).rowcount
+            inserted_count = self.db.execute(
+                insert(OvertimeWeek).from_select(
+                    ["staff_id", day],
+                    select(
+                        Staff.id, literal(status, OvertimeWeek.__table__.c[day].type)
+                    ).where(
+                        Staff.department_id == department_id,
+                        ~exists().where(OvertimeWeek.staff_id == Staff.id),
+                    ),
+                )
+            ).rowcount
+            affected_count = updated_count + inserted_count
+
+            if not affected_count:
+                rollback_session(self.db)
+                logger.info(f"No staff found in department {department_id}")
+                return 0
+
+            # One compact event for the whole department instead of one per staff
+            queue_event(
+                self.db,
+                "overtime_bulk",
+                department_id=department_id,
+                day=day,
+                status=status,
+            )
+
+            # Update operation record - use the actual date for that day_token
+            target_date = get_date_by_token(day)
+            record_department_history(self.db, department_id, target_date, status)
+            upsert_department_operation(self.db, department.name, target_date)
 
             success = self._commit_or_rollback(
                 "apply_to_all",
@@ -226,7 +451,7 @@ class OvertimeService(BaseService):
                     "department_id": department_id,
                     "day": day,
                     "status": status,
-                    "updated_count": updated_count,
+                    "updated_count": affected_count,
                 },
             )
 
@@ -236,13 +461,16 @@ class OvertimeService(BaseService):
                 )
 
             logger.info(
-                f"Applied status {status} to {updated_count} staff in department {department_id} for {day}"
+                f"Applied status {status} to {affected_count} staff "
+                f"in department {department_id} for {day}"
             )
-            return True
+            return affected_count
 
         except (ValueError, HTTPException):
+            rollback_session(self.db)
             raise
         except Exception as e:
+            rollback_session(self.db)
             self._log_error(
                 "apply_to_all",
                 e,
@@ -252,6 +480,31 @@ class OvertimeService(BaseService):
                 status_code=500, detail="Failed to apply status to all staff"
             )
 
+    def get_statistics_matrix(self) -> Dict[str, Any]:
+        """Total/internal/trip/none counts for every department and every day."""
+        departments: Dict[int, Dict[str, Any]] = {}
+        for row in self.db.execute(STATISTICS_MATRIX_SQL):
+            entry = departments.get(row.department_id)
+            if entry is None:
+                entry = departments[row.department_id] = {
+                    "department_id": row.department_id,
+                    "department_name": row.department_name,
+                    "total_staff": 0,
+                    "days": {
+                        token: {"internal": 0, "trip": 0, "none": 0}
+                        for token in DAY_TOKENS
+                    },
+                }
+            if row.day in entry["days"]:
+                entry["total_staff"] = row.total_staff
+                entry["days"][row.day] = {
+                    "internal": row.internal,
+                    "trip": row.trip,
+                    # Staff without a week row count as no overtime
+                    "none": row.total_staff - row.internal - row.trip,
+                }
+        return {"days": list(DAY_TOKENS), "departments": list(departments.values())}
+
     def get_department_statistics(self, department_id: int, day: str) -> Dict[str, Any]:
         """Get department overtime statistics."""
         try:
@@ -262,20 +515,7 @@ class OvertimeService(BaseService):
             self.department_service.validate_department_exists(department_id)
 
             stats = self.db.execute(
-                text(f"""
-                SELECT
-                    d.name as department_name,
-                    COUNT(s.id) as total_staff,
-                    COUNT(CASE WHEN ow.{day} = 'bg-2' THEN 1 END) as internal_overtime,
-                    COUNT(CASE WHEN ow.{day} = 'bg-3' THEN 1 END) as business_trip,
-                    COUNT(CASE WHEN ow.{day} IS NULL OR ow.{day} = 'bg-1' THEN 1 END) as no_overtime
-                FROM departments d
-                LEFT JOIN staffs s ON d.id = s.department_id
-                LEFT JOIN overtime_weeks ow ON s.id = ow.staff_id
-                WHERE d.id = :dept_id
-                GROUP BY d.id, d.name
-                """),
-                {"dept_id": department_id},
+                DEPARTMENT_STATISTICS_SQL, {"dept_id": department_id, "day": day}
             ).fetchone()
 
             if not stats:
@@ -287,12 +527,15 @@ class OvertimeService(BaseService):
                     "no_overtime": 0,
                 }
 
+            total = stats.total_staff or 0
+            internal = stats.internal or 0
+            trip = stats.trip or 0
             result = {
                 "department_name": stats.department_name,
-                "total_staff": stats.total_staff or 0,
-                "internal_overtime": stats.internal_overtime or 0,
-                "business_trip": stats.business_trip or 0,
-                "no_overtime": stats.no_overtime or 0,
+                "total_staff": total,
+                "internal_overtime": internal,
+                "business_trip": trip,
+                "no_overtime": total - internal - trip,
             }
 
             logger.info(f"Retrieved statistics for department {department_id} on {day}")
@@ -0,0 +1,113 @@
+"""Monthly and yearly overtime reports read from the rollup tables."""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .base import BaseService
+from ..database import begin_write_transaction, commit_session, rollback_session
+from ..models.monthly_rollup import rebuild_monthly_rollups_sql
+
+logger = logging.getLogger(__name__)
+
+_MONTH_PATTERN = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+_DEPARTMENT_SQL = """
+SELECT r.department_id, d.name AS department_name,
+    SUM(r.internal_days) AS internal_days, SUM(r.trip_days) AS trip_days
+FROM overtime_monthly_department r
+JOIN departments d ON d.id = r.department_id
+WHERE r.month BETWEEN :first AND :last{filter}
+GROUP BY r.department_id
+HAVING SUM(r.internal_days) + SUM(r.trip_days) > 0
+ORDER BY d.name
+"""
+
+_STAFF_SQL = """
+SELECT r.staff_id, s.name AS staff_name, s.department_id,
+    SUM(r.internal_days) AS internal_days, SUM(r.trip_days) AS trip_days
+FROM overtime_monthly_staff r
+JOIN staffs s ON s.id = r.staff_id
+WHERE r.month BETWEEN :first AND :last{filter}
+GROUP BY r.staff_id
+HAVING SUM(r.internal_days) + SUM(r.trip_days) > 0
+ORDER BY s.department_id, s.name
+"""
+
+
+def rebuild_monthly_rollups(db: Session) -> Tuple[int, int]:
+    """Recompute both rollups from overtime_history in one transaction.
+
+    Returns the (staff, department) row counts written.
+    """
+    try:
+        begin_write_transaction(db)
+        inserted = []
+        for statement in rebuild_monthly_rollups_sql():
+            count = db.execute(text(statement)).rowcount
+            if statement.startswith("INSERT"):
+                inserted.append(count)
+        commit_session(db)
+    except Exception:
+        rollback_session(db)
+        raise
+    staff_rows, department_rows = inserted
+    logger.info(
+        "Rebuilt monthly rollups: %s staff rows, %s department rows",
+        staff_rows,
+        department_rows,
+    )
+    return staff_rows, department_rows
+
+
+class ReportService(BaseService):
+    """Service for HR overtime reports."""
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+
+    def get_monthly(
+        self,
+        month: Optional[str] = None,
+        year: Optional[int] = None,
+        department_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Internal-overtime and business-trip day counts for a month or a year.
+
+        Pass exactly one of ``month`` ("YYYY-MM") or ``year``; a year sums its
+        twelve monthly rows. Department totals use the department recorded
+        with each day; staff rows are filtered by the staff's current one.
+        """
+        if (month is None) == (year is None):
+            raise ValueError("Provide either month (YYYY-MM) or year")
+        if month is not None:
+            if not _MONTH_PATTERN.match(month):
+                raise ValueError("Invalid month: expected YYYY-MM")
+            period, first, last = month, month, month
+        else:
+            if not 1 <= year <= 9999:
+                raise ValueError("Invalid year")
+            period, first, last = str(year), f"{year:04d}-01", f"{year:04d}-12"
+
+        params: Dict[str, Any] = {"first": first, "last": last}
+        department_filter = staff_filter = ""
+        if department_id is not None:
+            self._validate_id(department_id, "Department ID")
+            params["dept_id"] = department_id
+            department_filter = " AND r.department_id = :dept_id"
+            staff_filter = " AND s.department_id = :dept_id"
+
+        department_rows = self.db.execute(
+            text(_DEPARTMENT_SQL.format(filter=department_filter)), params
+        )
+        staff_rows = self.db.execute(
+            text(_STAFF_SQL.format(filter=staff_filter)), params
+        )
+        departments: List[Dict[str, Any]] = [
+            dict(row._mapping) for row in department_rows
+        ]
+        staff: List[Dict[str, Any]] = [dict(row._mapping) for row in staff_rows]
+        return {"period": period, "departments": departments, "staff": staff}
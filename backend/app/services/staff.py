@@ -8,6 +8,7 @@ import logging
 
 from .base import BaseService
 from ..models import Staff, SubDepartment, OvertimeWeek
+from ..models.overtime import week_labels_sql
 from .department import DepartmentService
 
 logger = logging.getLogger(__name__)
@@ -27,26 +28,22 @@ class StaffService(BaseService):
             self.department_service.validate_department_exists(department_id)
 
             staffs = self.db.execute(
-                text("""
+                text(
+                    f"""
                 SELECT
                     s.id,
                     s.name,
                     s.department_id,
                     s.sub_department_id,
                     sd.name as sub_department_name,
-                    COALESCE(ow.mon, 'bg-1') as mon,
-                    COALESCE(ow.tue, 'bg-1') as tue,
-                    COALESCE(ow.wed, 'bg-1') as wed,
-                    COALESCE(ow.thu, 'bg-1') as thu,
-                    COALESCE(ow.fri, 'bg-1') as fri,
-                    COALESCE(ow.sat, 'bg-1') as sat,
-                    COALESCE(ow.sun, 'bg-1') as sun
+                    {week_labels_sql("ow")}
                 FROM staffs s
                 LEFT JOIN sub_departments sd ON s.sub_department_id = sd.id
                 LEFT JOIN overtime_weeks ow ON ow.staff_id = s.id
                 WHERE s.department_id = :dept_id
                 ORDER BY s.name
-                """),
+                """
+                ),
                 {"dept_id": department_id},
             ).fetchall()
 
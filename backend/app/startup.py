@@ -0,0 +1,37 @@
+"""Start-up phase timings.
+
+The lifespan in ``main.py`` wraps each start-up step in :func:`phase`; the
+durations are logged and reported by ``GET /health`` so a slow cold start
+shows which step it spent its time in.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Phase name -> duration in milliseconds, in the order the phases ran.
+STARTUP_PHASES: Dict[str, float] = {}
+
+
+def record_phase(name: str, started: float) -> float:
+    """Record ``name`` as having run from ``started`` until now.
+
+    ``started`` is a ``time.perf_counter()`` reading.
+    """
+    elapsed = (time.perf_counter() - started) * 1000
+    STARTUP_PHASES[name] = round(elapsed, 2)
+    logger.info("Start-up phase %s took %.1f ms", name, elapsed)
+    return elapsed
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the enclosed block as start-up phase ``name``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, started)
@@ -0,0 +1,40 @@
+"""Conditional GET helpers (ETag / If-None-Match)."""
+
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Clients may keep the body but must revalidate it on every use.
+CACHE_CONTROL = "no-cache"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an ``If-None-Match`` header value matches ``etag`` (weak comparison)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def conditional_get(
+    request: Request, response: Response, etag: Optional[str]
+) -> Optional[Response]:
+    """Return a 304 response if the client already has ``etag``.
+
+    Otherwise stamp ``response`` with the validator headers and return
+    ``None`` so the route builds the body as usual.
+    """
+    if etag is None:
+        return None
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,188 @@
+"""Single-writer queue that group-commits SQLite mutations.
+
+SQLite allows one writer at a time, so concurrent mutations mostly queue up on
+the file lock and each pays its own commit. Here a dedicated thread owns the
+only write session. It drains every unit that arrives within a short window,
+runs each inside its own savepoint, and commits the whole batch once. Each
+caller's future resolves with its own result or exception.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple, TypeVar, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .database import (
+    GROUP_COMMIT,
+    SessionLocal,
+    begin_write_transaction,
+    engine,
+    run_db,
+)
+from .events import discard_events_after, pending_count
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteUnit = Tuple[Callable[..., Any], tuple, dict, Future]
+
+WRITE_QUEUE_ENABLED = os.environ.get("WRITE_QUEUE_ENABLED", "1") not in (
+    "0",
+    "false",
+    "",
+)
+WRITE_QUEUE_WINDOW_MS = float(os.environ.get("WRITE_QUEUE_WINDOW_MS", "2"))
+WRITE_QUEUE_MAX_BATCH = int(os.environ.get("WRITE_QUEUE_MAX_BATCH", "64"))
+
+
+class WriteQueue:
+    """Serialize mutation units onto one writer thread with group commit."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        window_ms: float = WRITE_QUEUE_WINDOW_MS,
+        max_batch: int = WRITE_QUEUE_MAX_BATCH,
+    ):
+        self._session_factory = session_factory
+        self._window = max(0.0, window_ms) / 1000.0
+        self._max_batch = max(1, max_batch)
+        self._queue: "queue.Queue[Optional[WriteUnit]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.units = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the writer thread (idempotent)."""
+        if self.running:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="sqlite-writer", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "Write queue started (window %.1f ms, max batch %s)",
+            self._window * 1000,
+            self._max_batch,
+        )
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Drain queued units, then stop the writer thread."""
+        if not self.running:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """Queue ``fn(session, *args, **kwargs)`` and return its future."""
+        if not self.running:
+            raise RuntimeError("Write queue is not running")
+        future: "Future[T]" = Future()
+        self._queue.put((fn, args, kwargs, future))
+        return future
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Queue a unit and await its result from the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def serves(self, db: Union[AsyncSession, Session]) -> bool:
+        """Whether ``db`` points at the database this queue writes to."""
+        if not self.running:
+            return False
+        url = getattr(db.bind, "url", None)
+        return url is not None and url.database == engine.url.database
+
+    def _run(self) -> None:
+        while True:
+            unit = self._queue.get()
+            if unit is None:
+                return
+            batch = [unit]
+            stop = False
+            deadline = time.monotonic() + self._window
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        unit = self._queue.get(timeout=remaining)
+                    else:
+                        unit = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if unit is None:
+                    stop = True
+                    break
+                batch.append(unit)
+            self._apply(batch)
+            if stop:
+                return
+
+    def _apply(self, batch: List[WriteUnit]) -> None:
+        outcomes: List[Tuple[Future, Any, Optional[BaseException]]] = []
+        session = self._session_factory()
+        session.info[GROUP_COMMIT] = True
+        try:
+            begin_write_transaction(session)
+            for fn, args, kwargs, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                savepoint = session.begin_nested()
+                events_before = pending_count(session)
+                try:
+                    result = fn(session, *args, **kwargs)
+                    session.flush()
+                    savepoint.commit()
+                    outcomes.append((future, result, None))
+                except Exception as exc:
+                    savepoint.rollback()
+                    discard_events_after(session, events_before)
+                    outcomes.append((future, None, exc))
+            session.commit()
+        except Exception as exc:
+            logger.exception("Write queue batch of %s units failed", len(batch))
+            try:
+                session.rollback()
+            except Exception:
+                pass
+            for fn, args, kwargs, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        finally:
+            session.close()
+
+        self.batches += 1
+        self.units += len(outcomes)
+        for future, result, exc in outcomes:
+            if exc is None:
+                future.set_result(result)
+            else:
+                future.set_exception(exc)
+
+
+write_queue = WriteQueue(SessionLocal)
+
+
+async def run_write(
+    db: Union[AsyncSession, Session], fn: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Run a mutation unit through the write queue when it serves ``db``.
+
+    Falls back to :func:`run_db` on the request's own session when the queue
+    is not running or the session points at another database (tests, scripts).
+    """
+    if write_queue.serves(db):
+        return await write_queue.run(fn, *args, **kwargs)
+    return await run_db(db, fn, *args, **kwargs)
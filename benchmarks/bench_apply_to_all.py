@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""apply_to_all: ORM object loop vs. set-based UPDATE + INSERT ... SELECT.
+
+Half of each department already has a week row, so both the update and the
+insert paths are exercised.
+
+    python benchmarks/bench_apply_to_all.py [--sizes 50 500 5000] [--repeat 5]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import Base, SQLiteProfile, install_sqlite_profile  # noqa: E402
+from app.models import Department, OvertimeWeek, Staff  # noqa: E402
+from app.services.overtime import OvertimeService  # noqa: E402
+
+
+def legacy_apply_to_all(db, department_id, status, day):
+    """The previous implementation: load ORM objects and setattr each one."""
+    staffs = db.query(Staff).filter(Staff.department_id == department_id).all()
+    staff_ids = [staff.id for staff in staffs]
+    existing_records = {
+        record.staff_id: record
+        for record in db.query(OvertimeWeek)
+        .filter(OvertimeWeek.staff_id.in_(staff_ids))
+        .all()
+    }
+    for staff in staffs:
+        record = existing_records.get(staff.id)
+        if not record:
+            record = OvertimeWeek(staff_id=staff.id)
+            db.add(record)
+        setattr(record, day, status)
+    db.commit()
+    return len(staffs)
+
+
+def _build(size):
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "isolation_level": None},
+    )
+    install_sqlite_profile(engine, SQLiteProfile())
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = session_factory()
+    db.add_all([Department(id=1, name="制造部"), Department(id=2, name="品质部")])
+    db.add_all(
+        [
+            Staff(id=i, name=f"员工{i}", department_id=1 + i % 2)
+            for i in range(1, 2 * size + 1)
+        ]
+    )
+    db.add_all([OvertimeWeek(staff_id=i) for i in range(1, size + 1)])
+    db.commit()
+    db.close()
+    return path, engine, session_factory
+
+
+def _time(session_factory, fn, repeat):
+    best = float("inf")
+    for index in range(repeat):
+        status = ("bg-2", "bg-3")[index % 2]
+        db = session_factory()
+        try:
+            started = time.perf_counter()
+            fn(db, status)
+            best = min(best, time.perf_counter() - started)
+        finally:
+            db.close()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(f"{'staff':>6s} {'orm loop':>12s} {'set-based':>12s} {'speedup':>8s}")
+    for size in args.sizes:
+        timings = []
+        for fn in (
+            lambda db, status: legacy_apply_to_all(db, 1, status, "sat"),
+            lambda db, status: OvertimeService(db).apply_to_all(1, status, "sat"),
+        ):
+            path, engine, session_factory = _build(size)
+            try:
+                timings.append(_time(session_factory, fn, args.repeat))
+            finally:
+                engine.dispose()
+                for suffix in ("", "-wal", "-shm"):
+                    if os.path.exists(path + suffix):
+                        os.unlink(path + suffix)
+        legacy, set_based = timings
+        print(
+            f"{size:6d} {legacy * 1000:10.1f}ms {set_based * 1000:10.1f}ms "
+            f"{legacy / set_based:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
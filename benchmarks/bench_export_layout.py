@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Export name layout: fit-size search vs trying every font size in turn.
+
+Lays out one large department (制造部 with ``--names`` staff, default 240)
+and a few smaller ones ``--repeat`` times with:
+
+* stepped: the previous layout. It tries 14, 13, 12, 11 and 10pt in turn,
+  and lays the names out once more to truncate them when every size
+  overflows,
+* search: ``OvertimeTableExportService._fit_names``. It binary-searches
+  ``NAME_FONT_SIZES`` (14pt down to 10pt in 0.5pt steps).
+
+Both use the same measured runs. The benchmark then times full
+``render_pdf`` calls with 制造部 overflowing, truncated and continued.
+
+    python benchmarks/bench_export_layout.py [--repeat 200] [--names 240]
+"""
+
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.services.exports import (  # noqa: E402
+    NAME_COLUMN_LEFT,
+    NAME_COLUMN_RIGHT,
+    OVERFLOW_CONTINUE,
+    OVERFLOW_TRUNCATE,
+    ROW_PADDING_X,
+    ROW_PADDING_Y,
+    TEMPLATE_ROWS,
+    DepartmentExportRow,
+    NameLayout,
+    NameRun,
+    OvertimeTableExportService,
+)
+
+LEGACY_FONT_SIZES = (14, 13, 12, 11, 10)
+
+
+class SteppedLayoutService(OvertimeTableExportService):
+    """The layout before the fit search: every size in turn, then a truncating pass."""
+
+    def _fit_names(self, measured, box_width, box_height):
+        for font_size in LEGACY_FONT_SIZES:
+            max_lines = max(1, int(box_height // self._name_line_height(font_size)))
+            lines = self._wrap_segments(
+                self._split_runs(measured, font_size, box_width), box_width
+            )
+            if len(lines) <= max_lines:
+                return NameLayout(font_size, lines, [])
+        # The old code laid the smallest size out again to truncate it.
+        lines = self._wrap_segments(
+            self._split_runs(measured, font_size, box_width), box_width
+        )
+        rest = [segment for line in lines[max_lines:] for segment in line]
+        return NameLayout(font_size, lines[:max_lines], rest)
+
+
+def _department(count, template_row):
+    return DepartmentExportRow(
+        template_name=template_row.template_name,
+        department_id=template_row.department_id,
+        row_top=template_row.row_top,
+        row_bottom=template_row.row_bottom,
+        name_runs=[NameRun(f"员工{i:03d}", i % 3 == 0) for i in range(count)],
+        remark_count=count // 4,
+    )
+
+
+def _rows(names):
+    """制造部 with ``names`` staff, the other departments with 5 to 60."""
+    rows = [_department(names, TEMPLATE_ROWS[0])]
+    for index, template_row in enumerate(TEMPLATE_ROWS[1:]):
+        rows.append(_department(5 + index * 6, template_row))
+    return rows
+
+
+def _layout_rate(service, rows, repeat):
+    box_width = float(NAME_COLUMN_RIGHT - NAME_COLUMN_LEFT - 2 * ROW_PADDING_X)
+    cases = [
+        (
+            service._measure_runs(row.name_runs),
+            float(row.row_bottom - row.row_top - 2 * ROW_PADDING_Y),
+        )
+        for row in rows
+    ]
+    started = time.perf_counter()
+    for _ in range(repeat):
+        sizes = [
+            service._fit_names(measured, box_width, height).font_size
+            for measured, height in cases
+        ]
+    return repeat / (time.perf_counter() - started), sizes
+
+
+def _render_rate(service, rows, overflow, repeat):
+    export_date = date(2026, 3, 7)
+    service.render_pdf(export_date, rows, overflow)  # font registration, imports
+    started = time.perf_counter()
+    for _ in range(repeat):
+        pdf = service.render_pdf(export_date, rows, overflow)
+    pages = int(re.search(rb"/Count (\d+)", pdf).group(1))
+    return repeat / (time.perf_counter() - started), pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--names", type=int, default=240)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rows = _rows(args.names)
+    OvertimeTableExportService()._register_font()
+
+    print(f"{'layout':>8s} {'layouts/s':>10s}  font sizes")
+    for name, service in (
+        ("stepped", SteppedLayoutService()),
+        ("search", OvertimeTableExportService()),
+    ):
+        rate, sizes = _layout_rate(service, rows, args.repeat)
+        print(f"{name:>8s} {rate:10.1f}  {' '.join(f'{size:g}' for size in sizes)}")
+
+    repeat = max(1, args.repeat // 10)
+    print(f"\n{'overflow':>8s} {'renders/s':>10s} {'pages':>6s}")
+    for overflow in (OVERFLOW_TRUNCATE, OVERFLOW_CONTINUE):
+        rate, pages = _render_rate(OvertimeTableExportService(), rows, overflow, repeat)
+        print(f"{overflow:>8s} {rate:10.1f} {pages:6d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Export PDF renders per second: compiled template vs painting over format.jpg.
+
+Renders the same day (``--names`` staff per department, every template row
+filled) ``--repeat`` times with:
+
+* legacy: the previous render path. It reads the template size and the
+  template image from the file, lets reportlab decode and re-encode it, then
+  paints the title, footer and every row's cells white,
+* compiled: ``OvertimeTableExportService.render_pdf``. It draws the
+  pre-cleared background from ``compile_template`` into a form XObject.
+
+The one-off ``compile_template`` time is reported separately.
+
+    python benchmarks/bench_export_render.py [--repeat 50] [--names 8]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import date
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.services import exports  # noqa: E402
+from app.services.exports import (  # noqa: E402
+    DepartmentExportRow,
+    NameRun,
+    OvertimeTableExportService,
+    TEMPLATE_IMAGE_PATH,
+    TEMPLATE_ROWS,
+)
+
+
+class LegacyRenderService(OvertimeTableExportService):
+    """The render path before the template was compiled."""
+
+    def render_pdf(self, export_date, rows):
+        from reportlab.lib.utils import ImageReader
+        from reportlab.pdfgen import canvas
+
+        page_width, page_height = ImageReader(str(TEMPLATE_IMAGE_PATH)).getSize()
+        buffer = BytesIO()
+        pdf = canvas.Canvas(buffer, pagesize=(page_width, page_height))
+        self._register_font()
+        image = ImageReader(str(TEMPLATE_IMAGE_PATH))
+        pdf.drawImage(image, 0, 0, width=page_width, height=page_height)
+        self._clear_rect(pdf, page_height, *exports.TITLE_CLEAR_BOX)
+        self._clear_rect(pdf, page_height, *exports.FOOTER_VALUE_CLEAR_BOX)
+        for row in rows:
+            for box in exports._row_clear_boxes(row.row_top, row.row_bottom):
+                self._clear_rect(pdf, page_height, *box)
+        self._draw_title(pdf, page_height, export_date)
+        for row in rows:
+            if row.department_id is None:
+                continue
+            self._draw_department_names(pdf, page_height, export_date, row)
+            self._draw_remark_count(pdf, page_height, row)
+        pdf.showPage()
+        pdf.save()
+        return buffer.getvalue()
+
+
+def _rows(names):
+    return [
+        DepartmentExportRow(
+            template_name=row.template_name,
+            department_id=row.department_id,
+            row_top=row.row_top,
+            row_bottom=row.row_bottom,
+            name_runs=[NameRun(f"员工{i:02d}", i % 3 == 0) for i in range(names)],
+            remark_count=names // 4,
+        )
+        for row in TEMPLATE_ROWS
+    ]
+
+
+def _rate(service, rows, repeat):
+    export_date = date(2026, 3, 7)
+    service.render_pdf(export_date, rows)  # font registration, imports
+    started = time.perf_counter()
+    for _ in range(repeat):
+        size = len(service.render_pdf(export_date, rows))
+    return repeat / (time.perf_counter() - started), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--names", type=int, default=8)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rows = _rows(args.names)
+    started = time.perf_counter()
+    exports.get_compiled_template()
+    compiled_ms = (time.perf_counter() - started) * 1000
+
+    print(f"compile_template: {compiled_ms:.0f} ms (once per process)")
+    print(f"{'path':>9s} {'renders/s':>10s} {'pdf size':>10s}")
+    for name, service in (
+        ("legacy", LegacyRenderService()),
+        ("compiled", OvertimeTableExportService()),
+    ):
+        rate, size = _rate(service, rows, args.repeat)
+        print(f"{name:>9s} {rate:10.1f} {size / 1024:8.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
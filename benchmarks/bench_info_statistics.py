@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""/api/info/statistics response time as department operation history grows.
+
+Every department gets one operation row per day going back ``--days`` days.
+"bounded" is the current handler, which only reads the seven rolling-week
+dates; "unbounded" is the old full-table load of operation rows it replaced.
+
+    python benchmarks/bench_info_statistics.py [--days 7 90 365] [--departments 40]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import Base, SQLiteProfile, install_sqlite_profile  # noqa: E402
+from app.models import (  # noqa: E402
+    Department,
+    DepartmentOperation,
+    OvertimeWeek,
+    Staff,
+)
+from app.services.overtime import DAY_TOKENS  # noqa: E402
+from app.routers.info import _build_statistics  # noqa: E402
+
+
+def legacy_load_operations(db):
+    """The previous query: every operation row ever recorded."""
+    rows = db.query(DepartmentOperation.department_id, DepartmentOperation.date).all()
+    return {(row.department_id, row.date) for row in rows}
+
+
+def _build(days, departments, staff_per_department):
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "isolation_level": None},
+    )
+    install_sqlite_profile(engine, SQLiteProfile())
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = session_factory()
+    db.add_all(
+        [Department(id=i, name=f"部门{i:03d}") for i in range(1, departments + 1)]
+    )
+    db.add_all(
+        [
+            Staff(name=f"员工{d}-{s}", department_id=d)
+            for d in range(1, departments + 1)
+            for s in range(staff_per_department)
+        ]
+    )
+    db.flush()
+    statuses = ("bg-1", "bg-2", "bg-3")
+    db.bulk_insert_mappings(
+        OvertimeWeek,
+        [
+            {
+                "staff_id": staff_id,
+                **{t: statuses[(staff_id + i) % 3] for i, t in enumerate(DAY_TOKENS)},
+            }
+            for staff_id in range(1, departments * staff_per_department + 1)
+        ],
+    )
+    # Cover the whole rolling week (up to six days ahead) plus the history.
+    start = date.today() + timedelta(days=6)
+    db.bulk_insert_mappings(
+        DepartmentOperation,
+        [
+            {
+                "department_name": f"部门{d:03d}",
+                "department_id": d,
+                "date": start - timedelta(days=offset),
+            }
+            for d in range(1, departments + 1)
+            for offset in range(days + 6)
+        ],
+    )
+    db.commit()
+    db.close()
+    return path, engine, session_factory
+
+
+def _best(session_factory, fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            started = time.perf_counter()
+            fn(db)
+            best = min(best, time.perf_counter() - started)
+        finally:
+            db.close()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, nargs="+", default=[7, 90, 365])
+    parser.add_argument("--departments", type=int, default=40)
+    parser.add_argument("--staff", type=int, default=20, help="staff per department")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(f"{'days':>5s} {'op rows':>8s} {'bounded':>10s} {'unbounded load':>15s}")
+    for days in args.days:
+        path, engine, session_factory = _build(days, args.departments, args.staff)
+        try:
+            bounded = _best(session_factory, _build_statistics, args.repeat)
+            unbounded = _best(session_factory, legacy_load_operations, args.repeat)
+        finally:
+            engine.dispose()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.unlink(path + suffix)
+        rows = args.departments * (days + 6)
+        print(f"{days:5d} {rows:8d} {bounded * 1000:8.1f}ms {unbounded * 1000:13.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
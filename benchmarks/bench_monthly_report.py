@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Monthly/yearly report: rollup read vs aggregating overtime_history.
+
+Seeds ``--staff`` staff with a status on every day of ``--years`` years of
+history (loaded with the rollup triggers active), then compares the best
+of ``--repeat`` runs of:
+
+* rollup: ReportService.get_monthly, which reads the precomputed rollups,
+* scan: the same per-department and per-staff counts computed with
+  GROUP BY over overtime_history.
+
+It also times a full ``rebuild_monthly_rollups``.
+
+    python benchmarks/bench_monthly_report.py [--staff 500] [--years 3]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import Base, SQLiteProfile, install_sqlite_profile  # noqa: E402
+from app.services.reports import ReportService, rebuild_monthly_rollups  # noqa: E402
+
+SCAN_SQL = (
+    text(
+        """
+    SELECT department_id, SUM(status = 1), SUM(status = 2) FROM overtime_history
+    WHERE date BETWEEN :first AND :last AND status IN (1, 2)
+    GROUP BY department_id
+    """
+    ),
+    text(
+        """
+    SELECT staff_id, SUM(status = 1), SUM(status = 2) FROM overtime_history
+    WHERE date BETWEEN :first AND :last AND status IN (1, 2)
+    GROUP BY staff_id
+    """
+    ),
+)
+
+
+def _seed(path, staff_count, departments, years):
+    rng = random.Random(1)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "isolation_level": None},
+    )
+    install_sqlite_profile(engine, SQLiteProfile())
+    Base.metadata.create_all(bind=engine)
+    start = date.today().replace(month=1, day=1) - timedelta(days=365 * (years - 1))
+    days = (date.today() - start).days + 1
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("BEGIN")
+        cursor.executemany(
+            "INSERT INTO departments (id, name) VALUES (?, ?)",
+            [(d, f"部门{d:03d}") for d in range(1, departments + 1)],
+        )
+        cursor.executemany(
+            "INSERT INTO staffs (id, name, department_id) VALUES (?, ?, ?)",
+            [
+                (i, f"员工{i:05d}", i % departments + 1)
+                for i in range(1, staff_count + 1)
+            ],
+        )
+        cursor.executemany(
+            "INSERT INTO overtime_history (date, staff_id, department_id, status) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                (
+                    (start + timedelta(days=d)).isoformat(),
+                    i,
+                    i % departments + 1,
+                    rng.choice((0, 0, 0, 1, 1, 2)),
+                )
+                for d in range(days)
+                for i in range(1, staff_count + 1)
+            ),
+        )
+        cursor.execute("COMMIT")
+    finally:
+        raw.close()
+    return engine, staff_count * days
+
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--staff", type=int, default=500)
+    parser.add_argument("--departments", type=int, default=20)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    try:
+        started = time.perf_counter()
+        engine, rows = _seed(path, args.staff, args.departments, args.years)
+        seeded = time.perf_counter() - started
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        db = session_factory()
+        try:
+            service = ReportService(db)
+            year = date.today().year
+            month = date.today().strftime("%Y-%m")
+            periods = (
+                ("month", {"month": month}, (f"{month}-01", f"{month}-31")),
+                ("year", {"year": year}, (f"{year}-01-01", f"{year}-12-31")),
+            )
+            print(f"{rows} history rows (seeded with triggers in {seeded:.1f}s)")
+            print(f"{'period':>7s} {'rollup':>10s} {'scan':>10s}")
+            for name, kwargs, (first, last) in periods:
+                rollup = _best(lambda: service.get_monthly(**kwargs), args.repeat)
+                scan = _best(
+                    lambda: [
+                        db.execute(sql, {"first": first, "last": last}).fetchall()
+                        for sql in SCAN_SQL
+                    ],
+                    args.repeat,
+                )
+                print(f"{name:>7s} {rollup * 1000:8.2f}ms {scan * 1000:8.2f}ms")
+            rebuild = _best(lambda: rebuild_monthly_rollups(db), 1)
+            print(f"rebuild from history: {rebuild * 1000:.0f} ms")
+        finally:
+            db.close()
+            engine.dispose()
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
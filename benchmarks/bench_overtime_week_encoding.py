@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""overtime_weeks size and full-scan time: 'bg-N' text columns vs status codes.
+
+Seeds ``--staff`` staff with random week statuses into a database that has
+the old text schema. The file is then copied and migrated to small-int codes
+with ``run_migrations`` (timed). Each variant is vacuumed, and the table's
+on-disk size (dbstat) is reported together with the best-of-``--repeat``
+time for three full scans:
+
+* count: count one day's internal overtime cells (the filter form used by
+  statistics),
+* labels: read every staff's week as labels, like the staff list,
+* orm: load every OvertimeWeek through the ORM.
+
+    python benchmarks/bench_overtime_week_encoding.py [--staff 50000] [--repeat 5]
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import Base, SQLiteProfile, install_sqlite_profile  # noqa: E402
+from app.migrations import run_migrations  # noqa: E402
+from app.models import OvertimeWeek  # noqa: E402
+from app.models.overtime import DAY_COLUMNS, week_labels_sql  # noqa: E402
+
+LEGACY_TABLE = (
+    "CREATE TABLE overtime_weeks (id INTEGER NOT NULL PRIMARY KEY, "
+    "staff_id INTEGER NOT NULL UNIQUE REFERENCES staffs (id), "
+    + ", ".join(f"{day} VARCHAR NOT NULL" for day in DAY_COLUMNS)
+    + ")"
+)
+LEGACY_LABELS = ", ".join(f"COALESCE(ow.{day}, 'bg-1') AS {day}" for day in DAY_COLUMNS)
+
+
+def _engine(path):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "isolation_level": None},
+    )
+    install_sqlite_profile(engine, SQLiteProfile())
+    return engine
+
+
+def _seed_legacy(path, staff_count, departments):
+    rng = random.Random(42)
+    engine = _engine(path)
+    with engine.connect() as conn:
+        conn.exec_driver_sql(LEGACY_TABLE)
+    Base.metadata.create_all(bind=engine)
+    # Mostly no overtime, as in the real data.
+    statuses = ("bg-1",) * 6 + ("bg-2",) * 3 + ("bg-3",)
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("BEGIN")
+        cursor.executemany(
+            "INSERT INTO departments (id, name) VALUES (?, ?)",
+            [(d, f"部门{d:03d}") for d in range(1, departments + 1)],
+        )
+        cursor.executemany(
+            "INSERT INTO staffs (id, name, department_id) VALUES (?, ?, ?)",
+            [
+                (i, f"员工{i:06d}", i % departments + 1)
+                for i in range(1, staff_count + 1)
+            ],
+        )
+        cursor.executemany(
+            f"INSERT INTO overtime_weeks (staff_id, {', '.join(DAY_COLUMNS)}) "
+            f"VALUES (?, {', '.join('?' for _ in DAY_COLUMNS)})",
+            [
+                (i, *(rng.choice(statuses) for _ in DAY_COLUMNS))
+                for i in range(1, staff_count + 1)
+            ],
+        )
+        cursor.execute("COMMIT")
+    finally:
+        raw.close()
+    engine.dispose()
+
+
+def _table_bytes(conn):
+    return conn.execute(
+        text("SELECT SUM(pgsize) FROM dbstat WHERE name = 'overtime_weeks'")
+    ).scalar()
+
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _measure(path, internal, labels_sql, repeat):
+    engine = _engine(path)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    try:
+        with engine.connect() as conn:
+            conn.exec_driver_sql("VACUUM")
+            size = _table_bytes(conn)
+            count_sql = text(
+                f"SELECT COUNT(*) FROM overtime_weeks WHERE sat = {internal}"
+            )
+            labels = text(
+                f"SELECT s.id, {labels_sql} FROM staffs s "
+                "LEFT JOIN overtime_weeks ow ON ow.staff_id = s.id"
+            )
+            count = _best(lambda: conn.execute(count_sql).scalar(), repeat)
+            read = _best(lambda: conn.execute(labels).fetchall(), repeat)
+
+        def load_orm():
+            db = session_factory()
+            try:
+                db.query(OvertimeWeek).all()
+            finally:
+                db.close()
+
+        orm = _best(load_orm, repeat)
+    finally:
+        engine.dispose()
+    return size, count, read, orm
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--staff", type=int, default=50000)
+    parser.add_argument("--departments", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    workdir = tempfile.mkdtemp()
+    legacy = os.path.join(workdir, "legacy.sqlite")
+    compact = os.path.join(workdir, "compact.sqlite")
+    try:
+        _seed_legacy(legacy, args.staff, args.departments)
+        shutil.copy(legacy, compact)
+        engine = _engine(compact)
+        started = time.perf_counter()
+        run_migrations(engine)
+        migrated = time.perf_counter() - started
+        engine.dispose()
+
+        print(f"{args.staff} staff; migration to codes took {migrated * 1000:.0f} ms")
+        print(
+            f"{'encoding':>8s} {'table':>10s} {'count':>9s} {'labels':>9s} {'orm':>9s}"
+        )
+        for name, path, internal, labels_sql in (
+            ("text", legacy, "'bg-2'", LEGACY_LABELS),
+            ("codes", compact, "1", week_labels_sql("ow")),
+        ):
+            size, count, read, orm = _measure(path, internal, labels_sql, args.repeat)
+            print(
+                f"{name:>8s} {size / 1024:8.0f}KB {count * 1000:7.1f}ms "
+                f"{read * 1000:7.1f}ms {orm * 1000:7.1f}ms"
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Concurrent /api/overtime/toggle throughput with and without the SQLite profile.
+
+Simulates the Friday-afternoon pattern: every department toggling its staff at
+once, each worker thread using its own session like a uvicorn request would.
+
+    python benchmarks/bench_sqlite_profile.py [--threads 11] [--toggles 200]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import Base, SQLiteProfile, install_sqlite_profile  # noqa: E402
+from app.models import Department, Staff, OvertimeWeek  # noqa: E402
+from app.services.overtime import DAY_TOKENS, OvertimeService  # noqa: E402
+
+STAFF_PER_DEPARTMENT = 60
+
+
+def _make_engine(path, profile):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={
+            "check_same_thread": False,
+            "timeout": 20,
+            "isolation_level": None,
+        },
+        pool_size=32,
+    )
+    if profile is not None:
+        install_sqlite_profile(engine, profile)
+    return engine
+
+
+def _seed(session_factory, departments):
+    db = session_factory()
+    try:
+        staff_ids = {}
+        for dept_index in range(departments):
+            dept = Department(name=f"部门{dept_index}")
+            db.add(dept)
+            db.flush()
+            ids = []
+            for staff_index in range(STAFF_PER_DEPARTMENT):
+                staff = Staff(
+                    name=f"员工{dept_index}-{staff_index}", department_id=dept.id
+                )
+                db.add(staff)
+                db.flush()
+                db.add(OvertimeWeek(staff_id=staff.id))
+                ids.append(staff.id)
+            staff_ids[dept.id] = ids
+        db.commit()
+        return staff_ids
+    finally:
+        db.close()
+
+
+def run(profile, threads, toggles):
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    engine = _make_engine(path, profile)
+    try:
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        staff_ids = _seed(session_factory, threads)
+        errors = []
+        barrier = threading.Barrier(threads)
+
+        def worker(ids):
+            barrier.wait()
+            for index in range(toggles):
+                db = session_factory()
+                try:
+                    OvertimeService(db).toggle_staff_status(
+                        ids[index % len(ids)],
+                        ("bg-1", "bg-2", "bg-3")[index % 3],
+                        DAY_TOKENS[index % len(DAY_TOKENS)],
+                    )
+                except Exception as exc:
+                    errors.append(exc)
+                finally:
+                    db.close()
+
+        workers = [
+            threading.Thread(target=worker, args=(ids,)) for ids in staff_ids.values()
+        ]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        return threads * toggles, elapsed, len(errors)
+    finally:
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--threads", type=int, default=11, help="concurrent departments"
+    )
+    parser.add_argument(
+        "--toggles", type=int, default=200, help="toggles per department"
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    for label, profile in (
+        ("baseline (rollback journal)", None),
+        ("profile", SQLiteProfile()),
+    ):
+        total, elapsed, errors = run(profile, args.threads, args.toggles)
+        print(
+            f"{label:28s} {total} toggles in {elapsed:6.2f}s "
+            f"-> {total / elapsed:8.1f} toggles/s, {errors} errors"
+        )
+
+
+if __name__ == "__main__":
+    main()
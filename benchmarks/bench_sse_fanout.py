@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""SSE fan-out: 500 connected browsers, idle CPU and per-event delivery latency.
+
+Starts the events router under uvicorn on a free local port and opens
+``--clients`` streaming connections with httpx. It then measures:
+
+* process CPU time while every stream is idle (should be ~0: an idle
+  connection only wakes for the keep-alive comment), and
+* how long each published event takes to reach every client, with the
+  CPU spent per event (server and clients share this process).
+
+    python benchmarks/bench_sse_fanout.py [--clients 500] [--events 50] [--idle 5]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from app.events import broker  # noqa: E402
+from app.routers import events  # noqa: E402
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(port):
+    app = FastAPI()
+    app.include_router(events.router, prefix="/api/events")
+    config = uvicorn.Config(
+        app, host="127.0.0.1", port=port, log_level="warning", backlog=4096
+    )
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+class Client:
+    def __init__(self):
+        self.received = 0
+        self.arrivals = {}
+        self.connected = asyncio.Event()
+
+    async def run(self, http, url):
+        async with http.stream("GET", url) as response:
+            async for chunk in response.aiter_text():
+                if chunk.startswith("retry:"):
+                    self.connected.set()
+                for line in chunk.splitlines():
+                    if line.startswith("data: "):
+                        self.received += 1
+                        self.arrivals[self.received] = time.perf_counter()
+
+
+async def run(clients, event_count, idle_seconds):
+    port = _free_port()
+    server, thread = _start_server(port)
+    url = f"http://127.0.0.1:{port}/api/events"
+    limits = httpx.Limits(max_connections=clients + 10, max_keepalive_connections=0)
+    async with httpx.AsyncClient(limits=limits, timeout=None) as http:
+        browsers = [Client() for _ in range(clients)]
+        tasks = [asyncio.ensure_future(c.run(http, url)) for c in browsers]
+        await asyncio.wait_for(
+            asyncio.gather(*(c.connected.wait() for c in browsers)), 60
+        )
+        while broker.subscriber_count < clients:
+            await asyncio.sleep(0.05)
+        print(f"{broker.subscriber_count} streams connected")
+
+        cpu = time.process_time()
+        await asyncio.sleep(idle_seconds)
+        idle_cpu = time.process_time() - cpu
+        print(
+            f"idle {idle_seconds:.0f}s with {clients} streams: "
+            f"{idle_cpu * 1000:.1f} ms CPU "
+            f"({idle_cpu / idle_seconds * 100:.2f}% of one core)"
+        )
+
+        latencies = []
+        cpu = time.process_time()
+        for index in range(1, event_count + 1):
+            sent = time.perf_counter()
+            # Published from another thread, like the writer thread does.
+            await asyncio.to_thread(
+                broker.publish,
+                [
+                    {
+                        "type": "overtime",
+                        "staff_id": index,
+                        "department_id": 1,
+                        "day": "sat",
+                        "status": "bg-2",
+                    }
+                ],
+            )
+            while any(c.received < index for c in browsers):
+                await asyncio.sleep(0.001)
+            latencies.append(max(c.arrivals[index] for c in browsers) - sent)
+        busy_cpu = time.process_time() - cpu
+
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(
+            f"{event_count} events to {clients} streams: "
+            f"p50 {statistics.median(latencies) * 1000:.1f} ms, "
+            f"p99 {p99 * 1000:.1f} ms to reach all, "
+            f"{busy_cpu / event_count * 1000:.1f} ms CPU per event"
+        )
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    server.should_exit = True
+    thread.join(10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument(
+        "--idle", type=float, default=5.0, help="idle window in seconds"
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    asyncio.run(run(args.clients, args.events, args.idle))
+
+
+if __name__ == "__main__":
+    main()
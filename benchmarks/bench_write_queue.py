@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Concurrent toggle throughput: one commit per click vs. the group-commit writer.
+
+Each client thread issues toggles back to back. "per-click" gives every toggle
+its own session and commit; "write queue" submits the same units to
+``WriteQueue`` and waits for the future, as the routes do.
+
+    python benchmarks/bench_write_queue.py [--clients 32] [--toggles 50] \\
+        [--synchronous FULL]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import Base, SQLiteProfile, install_sqlite_profile  # noqa: E402
+from app.models import Department, Staff  # noqa: E402
+from app.services.overtime import DAY_TOKENS, OvertimeService  # noqa: E402
+from app.write_queue import WriteQueue  # noqa: E402
+
+
+def _setup(synchronous, clients):
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "isolation_level": None},
+        pool_size=clients + 2,
+    )
+    install_sqlite_profile(engine, SQLiteProfile(synchronous=synchronous))
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = session_factory()
+    db.add(Department(id=1, name="制造部"))
+    db.add_all(
+        [Staff(id=i, name=f"员工{i}", department_id=1) for i in range(1, clients + 1)]
+    )
+    db.commit()
+    db.close()
+    return path, engine, session_factory
+
+
+def _toggle(session, staff_id, index):
+    return OvertimeService(session).toggle_staff_status(
+        staff_id, ("bg-2", "bg-3", "bg-1")[index % 3], DAY_TOKENS[index % 7]
+    )
+
+
+def _drive(clients, toggles, call):
+    barrier = threading.Barrier(clients)
+
+    def client(staff_id):
+        barrier.wait()
+        for index in range(toggles):
+            call(staff_id, index)
+
+    threads = [
+        threading.Thread(target=client, args=(i,)) for i in range(1, clients + 1)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def run(mode, clients, toggles, synchronous):
+    path, engine, session_factory = _setup(synchronous, clients)
+    commits = clients * toggles
+    try:
+        if mode == "per-click":
+
+            def call(staff_id, index):
+                db = session_factory()
+                try:
+                    _toggle(db, staff_id, index)
+                finally:
+                    db.close()
+
+            elapsed = _drive(clients, toggles, call)
+        else:
+            writer = WriteQueue(session_factory)
+            writer.start()
+            try:
+                elapsed = _drive(
+                    clients,
+                    toggles,
+                    lambda staff_id, index: writer.submit(
+                        _toggle, staff_id, index
+                    ).result(),
+                )
+            finally:
+                writer.stop()
+            commits = writer.batches
+        return elapsed, commits
+    finally:
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--toggles", type=int, default=50, help="toggles per client")
+    parser.add_argument(
+        "--synchronous", default="FULL", help="PRAGMA synchronous value"
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    total = args.clients * args.toggles
+    for mode in ("per-click", "write queue"):
+        elapsed, commits = run(mode, args.clients, args.toggles, args.synchronous)
+        print(
+            f"{mode:12s} {total} toggles in {elapsed:6.2f}s -> "
+            f"{total / elapsed:8.1f} toggles/s, "
+            f"{commits} commits"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -57,4 +57,22 @@ describe('Staff Store', () => {
     
     expect(store.isConfirmed).toBe(true)
   })
+
+  it('should send applyToAll as a single batch request', async () => {
+    const store = useStaffStore()
+    store.staffs = [{ id: 1, name: 'A' }, { id: 2, name: 'B' }]
+    store.selectedDay = 'sat'
+    vi.mocked(api.post).mockResolvedValue({ data: { success: true } })
+    vi.mocked(api.get).mockResolvedValue({ data: [] })
+
+    await store.applyToAll('bg-3')
+
+    expect(api.post).toHaveBeenCalledTimes(1)
+    expect(api.post).toHaveBeenCalledWith('/overtime/batch-toggle', {
+      changes: [
+        { staff_id: 1, status: 'bg-3', day: 'sat' },
+        { staff_id: 2, status: 'bg-3', day: 'sat' }
+      ]
+    })
+  })
 })
@@ -17,8 +17,12 @@ export const useStaffStore = defineStore('staff', () => {
   const selectedDay = ref<DayKey>(getTomorrowToken())
   const isConfirmed = ref(false)
 
-  const fetchStaffs = async (departmentId?: number): Promise<void> => {
-    loading.value = true
+  const fetchStaffs = async (
+    departmentId?: number,
+    options: { silent?: boolean } = {}
+  ): Promise<void> => {
+    // Silent refetches (change events) must not touch a user fetch's spinner
+    if (!options.silent) loading.value = true
     try {
       const response = await api.get<Staff[]>('/staffs', {
         params: { department_id: departmentId }
@@ -27,7 +31,7 @@ export const useStaffStore = defineStore('staff', () => {
     } catch (error) {
       console.error('Failed to fetch staffs:', error)
     } finally {
-      loading.value = false
+      if (!options.silent) loading.value = false
     }
   }
 
@@ -124,17 +128,19 @@ export const useStaffStore = defineStore('staff', () => {
 
   const applyToAll = async (targetStatus: StaffStatus): Promise<boolean> => {
     const dayKey = selectedDay.value
-    const promises = staffs.value.map(async (staff) => {
-      await api.post('/overtime/toggle', {
-        staff_id: staff.id,
-        status: targetStatus,
-        day: dayKey
-      })
-      staff[dayKey] = targetStatus
-    })
+    if (staffs.value.length === 0) return true
 
     try {
-      await Promise.all(promises)
+      await api.post('/overtime/batch-toggle', {
+        changes: staffs.value.map((staff) => ({
+          staff_id: staff.id,
+          status: targetStatus,
+          day: dayKey
+        }))
+      })
+      staffs.value.forEach((staff) => {
+        staff[dayKey] = targetStatus
+      })
       isConfirmed.value = true
       await fetchStaffs(staffs.value[0]?.department_id)
       return true
@@ -0,0 +1,65 @@
+/// <reference types="vitest" />
+
+import { afterEach, describe, expect, it, vi } from 'vitest'
+import { affectsDepartment, subscribeChanges } from './changeStream'
+
+class FakeEventSource {
+  static instances: FakeEventSource[] = []
+  listeners: Record<string, Array<(message: MessageEvent) => void>> = {}
+  closed = false
+
+  constructor(public url: string) {
+    FakeEventSource.instances.push(this)
+  }
+
+  addEventListener(type: string, listener: (message: MessageEvent) => void): void {
+    ;(this.listeners[type] ||= []).push(listener)
+  }
+
+  emit(type: string, data: unknown): void {
+    this.listeners[type]?.forEach((listener) =>
+      listener({ data: JSON.stringify(data) } as MessageEvent)
+    )
+  }
+
+  close(): void {
+    this.closed = true
+  }
+}
+
+describe('change stream', () => {
+  afterEach(() => {
+    vi.useRealTimers()
+    vi.unstubAllGlobals()
+    FakeEventSource.instances = []
+  })
+
+  it('delivers a burst of events as one batch', () => {
+    vi.useFakeTimers()
+    vi.stubGlobal('EventSource', FakeEventSource)
+    const onChanges = vi.fn()
+
+    const unsubscribe = subscribeChanges(onChanges, 100)
+    const source = FakeEventSource.instances[0]
+    expect(source.url).toBe('/api/events')
+
+    source.emit('overtime', { type: 'overtime', staff_id: 1, department_id: 1 })
+    source.emit('confirm', { type: 'confirm', department_id: 2 })
+    expect(onChanges).not.toHaveBeenCalled()
+
+    vi.advanceTimersByTime(100)
+    expect(onChanges).toHaveBeenCalledTimes(1)
+    expect(onChanges.mock.calls[0][0]).toHaveLength(2)
+
+    unsubscribe()
+    expect(source.closed).toBe(true)
+  })
+
+  it('matches events to a department by id, name or resync', () => {
+    const department = { id: 1, name: '制造部' }
+    expect(affectsDepartment([{ type: 'overtime', department_id: 1 }], department)).toBe(true)
+    expect(affectsDepartment([{ type: 'operation', department: '制造部' }], department)).toBe(true)
+    expect(affectsDepartment([{ type: 'resync' }], department)).toBe(true)
+    expect(affectsDepartment([{ type: 'overtime', department_id: 2 }], department)).toBe(false)
+  })
+})
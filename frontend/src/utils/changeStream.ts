@@ -0,0 +1,76 @@
+export type ChangeEvent = {
+  type: string
+  department_id?: number
+  department?: string
+  [key: string]: unknown
+}
+
+export const CHANGE_EVENT_TYPES = [
+  'overtime',
+  'overtime_bulk',
+  'operation',
+  'confirm',
+  'unconfirm',
+  'staff',
+  'resync'
+] as const
+
+/**
+ * Listen to the server's change stream (`/api/events`).
+ * Events arriving within `delayMs` are delivered together, so a burst of
+ * changes triggers one refetch. Returns a function that closes the stream.
+ */
+export const subscribeChanges = (
+  onChanges: (events: ChangeEvent[]) => void,
+  delayMs = 300
+): (() => void) => {
+  if (typeof EventSource === 'undefined') {
+    return () => {}
+  }
+
+  const source = new EventSource('/api/events', { withCredentials: true })
+  let pending: ChangeEvent[] = []
+  let timer: ReturnType<typeof setTimeout> | null = null
+
+  const flush = (): void => {
+    timer = null
+    const events = pending
+    pending = []
+    onChanges(events)
+  }
+
+  const handle = (message: MessageEvent): void => {
+    try {
+      pending.push(JSON.parse(message.data) as ChangeEvent)
+    } catch (error) {
+      console.error('Invalid change event:', error)
+      return
+    }
+    if (timer === null) {
+      timer = setTimeout(flush, delayMs)
+    }
+  }
+
+  CHANGE_EVENT_TYPES.forEach((type) => {
+    source.addEventListener(type, handle as EventListener)
+  })
+
+  return () => {
+    if (timer !== null) {
+      clearTimeout(timer)
+    }
+    source.close()
+  }
+}
+
+/** Whether any event in the batch may change the given department's view. */
+export const affectsDepartment = (
+  events: ChangeEvent[],
+  department: { id: number; name?: string }
+): boolean =>
+  events.some(
+    (event) =>
+      event.type === 'resync' ||
+      event.department_id === department.id ||
+      (department.name !== undefined && event.department === department.name)
+  )
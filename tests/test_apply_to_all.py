@@ -0,0 +1,54 @@
+import os
+import sys
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.models import (  # noqa: E402
+    Department,
+    DepartmentOperation,
+    OvertimeWeek,
+    Staff,
+)
+from app.services.overtime import OvertimeService, get_date_by_token  # noqa: E402
+
+
+def test_apply_to_all_updates_and_inserts_week_rows(db_session):
+    """一次 UPDATE + 一次 INSERT ... SELECT 覆盖整个部门，返回受影响人数。"""
+    db_session.add_all(
+        [Department(id=1, name="制造部"), Department(id=2, name="品质部")]
+    )
+    db_session.commit()
+    db_session.add_all(
+        [
+            Staff(id=1, name="甲", department_id=1),
+            Staff(id=2, name="乙", department_id=1),
+            Staff(id=3, name="丙", department_id=1),
+            Staff(id=4, name="丁", department_id=2),
+        ]
+    )
+    db_session.add(OvertimeWeek(staff_id=1, sun="bg-3"))
+    db_session.add(OvertimeWeek(staff_id=4))
+    db_session.commit()
+
+    affected = OvertimeService(db_session).apply_to_all(1, "bg-2", "sat")
+
+    assert affected == 3
+    db_session.expire_all()
+    weeks = {w.staff_id: w for w in db_session.query(OvertimeWeek).all()}
+    assert [weeks[i].sat for i in (1, 2, 3)] == ["bg-2", "bg-2", "bg-2"]
+    assert weeks[1].sun == "bg-3"
+    assert weeks[2].sun == "bg-1"
+    assert weeks[4].sat == "bg-1"
+
+    op = db_session.query(DepartmentOperation).one()
+    assert (op.department_name, op.date) == ("制造部", get_date_by_token("sat"))
+
+
+def test_apply_to_all_empty_department(db_session):
+    """部门没有人员时返回 0，且不写操作记录。"""
+    db_session.add(Department(id=1, name="制造部"))
+    db_session.commit()
+
+    assert OvertimeService(db_session).apply_to_all(1, "bg-2", "sat") == 0
+    assert db_session.query(DepartmentOperation).count() == 0
@@ -0,0 +1,110 @@
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.main import app  # noqa: E402
+from app.database import get_db  # noqa: E402
+from app.export_cache import export_cache  # noqa: E402
+from app.models import Department  # noqa: E402
+from app.services.exports import OvertimeTableExportService  # noqa: E402
+
+SLOW_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 2000000) "
+    "SELECT count(*) FROM c"
+)
+
+
+async def _race(temp_db):
+    """并发发出一个慢导出请求和多个快请求，返回各自的完成时间。"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{temp_db}")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            started = time.perf_counter()
+
+            async def timed(coro):
+                response = await coro
+                return response, time.perf_counter() - started
+
+            slow = asyncio.ensure_future(
+                timed(
+                    client.get(
+                        "/api/exports/overtime-table", params={"date": "2026-03-07"}
+                    )
+                )
+            )
+            await asyncio.sleep(0.05)
+            fast = await asyncio.gather(
+                *[timed(client.get("/api/departments")) for _ in range(5)]
+            )
+            return await slow, fast
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def no_export_cache(monkeypatch):
+    """这里要测的是渲染本身，关闭 PDF 缓存以免命中上一个用例的结果。"""
+    monkeypatch.setattr(export_cache, "enabled", False)
+
+
+def _seed(db_session):
+    db_session.add(Department(id=1, name="制造部"))
+    db_session.commit()
+
+
+def test_slow_query_does_not_block_other_requests(db_session, temp_db, monkeypatch):
+    """慢查询在 aiosqlite 线程上执行，其它请求不被阻塞。"""
+    _seed(db_session)
+    original = OvertimeTableExportService.build_department_rows
+
+    def slow_rows(self, export_date):
+        self.db.execute(SLOW_QUERY).scalar()
+        return original(self, export_date)
+
+    monkeypatch.setattr(OvertimeTableExportService, "build_department_rows", slow_rows)
+
+    (slow_response, slow_elapsed), fast = asyncio.run(_race(temp_db))
+
+    assert slow_response.status_code == 200
+    for response, elapsed in fast:
+        assert response.status_code == 200
+        assert elapsed < slow_elapsed
+
+
+def test_slow_render_does_not_block_other_requests(db_session, temp_db, monkeypatch):
+    """PDF 渲染在线程池中执行，其它请求不被阻塞。"""
+    _seed(db_session)
+
+    def slow_render(self, export_date, rows, overflow=None):
+        time.sleep(0.5)
+        return b"%PDF-1.4"
+
+    monkeypatch.setattr(OvertimeTableExportService, "render_pdf", slow_render)
+
+    (slow_response, slow_elapsed), fast = asyncio.run(_race(temp_db))
+
+    assert slow_response.status_code == 200
+    assert slow_elapsed >= 0.5
+    for response, elapsed in fast:
+        assert response.status_code == 200
+        assert elapsed < 0.4
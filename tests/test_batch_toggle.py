@@ -0,0 +1,104 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+import os
+import sys
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.main import app  # noqa: E402
+from app.models import (  # noqa: E402
+    Department,
+    DepartmentOperation,
+    OvertimeWeek,
+    Staff,
+)
+from app.database import get_db  # noqa: E402
+from app.services.overtime import get_date_by_token  # noqa: E402
+
+client = TestClient(app)
+
+
+def _seed(db_session, count=5):
+    db_session.add_all(
+        [Department(id=1, name="制造部"), Department(id=2, name="品质部")]
+    )
+    db_session.commit()
+    staffs = [
+        Staff(name=f"员工{i}", department_id=1 if i % 2 else 2) for i in range(count)
+    ]
+    db_session.add_all(staffs)
+    db_session.commit()
+    return staffs
+
+
+def test_batch_toggle_single_commit(db_session):
+    """批量切换在一个事务内写入所有状态和每个部门/日期一条操作记录。"""
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        staffs = _seed(db_session)
+        commits = []
+        event.listen(db_session, "after_commit", lambda session: commits.append(1))
+
+        response = client.post(
+            "/api/overtime/batch-toggle",
+            json={
+                "changes": [
+                    {"staff_id": staff.id, "status": "bg-2", "day": "sat"}
+                    for staff in staffs
+                ]
+                + [{"staff_id": staffs[0].id, "status": "bg-3", "day": "sun"}]
+            },
+        )
+        assert response.status_code == 200
+        assert response.json()["updated"] == len(staffs) + 1
+        assert len(commits) == 1
+
+        weeks = {w.staff_id: w for w in db_session.query(OvertimeWeek).all()}
+        assert all(weeks[staff.id].sat == "bg-2" for staff in staffs)
+        assert weeks[staffs[0].id].sun == "bg-3"
+
+        ops = {
+            (op.department_name, op.date)
+            for op in db_session.query(DepartmentOperation).all()
+        }
+        assert ops == {
+            ("制造部", get_date_by_token("sat")),
+            ("品质部", get_date_by_token("sat")),
+            (staffs[0].department.name, get_date_by_token("sun")),
+        }
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_batch_toggle_validates_before_writing(db_session):
+    """任一条目无效时整个批次都不写入。"""
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        staffs = _seed(db_session, count=2)
+
+        response = client.post(
+            "/api/overtime/batch-toggle",
+            json={
+                "changes": [
+                    {"staff_id": staffs[0].id, "status": "bg-2", "day": "sat"},
+                    {"staff_id": 9999, "status": "bg-2", "day": "sat"},
+                ]
+            },
+        )
+        assert response.status_code == 404
+        assert db_session.query(OvertimeWeek).count() == 0
+        assert db_session.query(DepartmentOperation).count() == 0
+
+        response = client.post(
+            "/api/overtime/batch-toggle",
+            json={
+                "changes": [{"staff_id": staffs[0].id, "status": "bg-9", "day": "sat"}]
+            },
+        )
+        assert response.status_code == 400
+
+        response = client.post("/api/overtime/batch-toggle", json={"changes": []})
+        assert response.status_code == 400
+    finally:
+        app.dependency_overrides.clear()
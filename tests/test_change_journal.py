@@ -0,0 +1,133 @@
+import os
+import sys
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.main import app  # noqa: E402
+from app.database import get_db  # noqa: E402
+from app.models import Department, OvertimeWeek, Staff  # noqa: E402
+from app.services.changes import (  # noqa: E402
+    ChangeJournalService,
+    compact_change_journal,
+)
+from app.services.department import delete_department_operation  # noqa: E402
+
+client = TestClient(app)
+
+
+def _seed(db_session):
+    db_session.add_all(
+        [Department(id=1, name="制造部"), Department(id=2, name="品质部")]
+    )
+    db_session.add_all(
+        [
+            Staff(id=1, name="张三", department_id=1),
+            Staff(id=2, name="李四", department_id=2),
+        ]
+    )
+    db_session.add_all([OvertimeWeek(staff_id=1), OvertimeWeek(staff_id=2)])
+    db_session.commit()
+
+
+def test_changes_since_cursor(db_session):
+    """按游标增量返回变更行：每行只出现一次且为当前值，未变化的写入不产生记录。"""
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        _seed(db_session)
+        cursor = client.get("/api/overtime/changes").json()["cursor"]
+
+        client.post(
+            "/api/overtime/toggle", json={"staff_id": 1, "status": "bg-2", "day": "sat"}
+        )
+        client.post(
+            "/api/overtime/toggle", json={"staff_id": 1, "status": "bg-3", "day": "sat"}
+        )
+        body = client.get("/api/overtime/changes", params={"since": cursor}).json()
+        assert body["reset"] is False and body["has_more"] is False
+        assert [
+            (row["staff_id"], row["sat"], row["deleted"]) for row in body["overtime"]
+        ] == [(1, "bg-3", False)]
+        assert [row["department_name"] for row in body["operations"]] == ["制造部"]
+
+        # 游标之后没有新变更；同值写入不记入日志
+        cursor = body["cursor"]
+        client.post(
+            "/api/overtime/toggle", json={"staff_id": 1, "status": "bg-3", "day": "sat"}
+        )
+        body = client.get("/api/overtime/changes", params={"since": cursor}).json()
+        assert body["overtime"] == []
+
+        # 按部门过滤
+        cursor = body["cursor"]
+        client.post(
+            "/api/overtime/toggle", json={"staff_id": 2, "status": "bg-2", "day": "sun"}
+        )
+        body = client.get(
+            "/api/overtime/changes", params={"since": cursor, "dept_id": 1}
+        ).json()
+        assert body["overtime"] == [] and body["operations"] == []
+        body = client.get(
+            "/api/overtime/changes", params={"since": cursor, "dept_id": 2}
+        ).json()
+        assert [row["staff_id"] for row in body["overtime"]] == [2]
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_changes_report_deletes_moves_and_pages(db_session):
+    """删除的行带 deleted 标记；员工调部门时两个部门都能看到；分页通过 has_more 继续。"""
+    _seed(db_session)
+    service = ChangeJournalService(db_session)
+    cursor = service.get_changes(0)["cursor"]
+
+    op_date = date(2024, 6, 1)
+    db_session.execute(
+        text(
+            "INSERT INTO department_operations (department_name, date) "
+            "VALUES ('制造部', :d)"
+        ),
+        {"d": op_date},
+    )
+    db_session.commit()
+    delete_department_operation(db_session, "制造部", op_date)
+    db_session.commit()
+    db_session.query(Staff).filter(Staff.id == 1).update({"department_id": 2})
+    db_session.commit()
+
+    body = service.get_changes(cursor, department_id=1)
+    assert [(row["date"], row["deleted"]) for row in body["operations"]] == [
+        ("2024-06-01", True)
+    ]
+    assert [(row["staff_id"], row["department_id"]) for row in body["overtime"]] == [
+        (1, 2)
+    ]
+
+    first = service.get_changes(cursor, limit=1)
+    assert first["has_more"] is True and first["operations"] and not first["overtime"]
+    rest = service.get_changes(first["cursor"])
+    assert rest["has_more"] is False and rest["cursor"] == body["cursor"]
+
+
+def test_compaction_resets_stale_cursors(db_session):
+    """压缩后过旧的游标返回 reset，客户端需重新拉取快照；最新游标仍可继续。"""
+    _seed(db_session)
+    service = ChangeJournalService(db_session)
+    for status in ("bg-2", "bg-3", "bg-1"):
+        db_session.query(OvertimeWeek).filter(OvertimeWeek.staff_id == 1).update(
+            {"sat": status}
+        )
+        db_session.commit()
+    latest = service.get_changes(0)["cursor"]
+
+    assert compact_change_journal(db_session, max_rows=1) > 0
+    assert db_session.execute(text("SELECT COUNT(*) FROM change_journal")).scalar() == 1
+
+    stale = service.get_changes(0)
+    assert stale["reset"] is True and stale["cursor"] == latest
+    current = service.get_changes(latest)
+    assert current["reset"] is False and current["overtime"] == []
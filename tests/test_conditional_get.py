@@ -0,0 +1,87 @@
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.main import app  # noqa: E402
+from app.database import get_db  # noqa: E402
+from app.models import Department, OvertimeWeek, Staff  # noqa: E402
+from app.read_cache import read_cache  # noqa: E402
+from app.utils.http_cache import etag_matches  # noqa: E402
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def seeded(db_session):
+    db_session.add_all(
+        [Department(id=1, name="制造部"), Department(id=2, name="品质部")]
+    )
+    db_session.add_all(
+        [
+            Staff(id=1, name="张三", department_id=1),
+            Staff(id=2, name="李四", department_id=2),
+        ]
+    )
+    db_session.add_all([OvertimeWeek(staff_id=1), OvertimeWeek(staff_id=2)])
+    db_session.commit()
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        yield db_session
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize(
+    "path,cookies",
+    [
+        ("/api/staffs", {"department": "1"}),
+        ("/api/overtime/status?dept_id=1", None),
+        ("/api/info/statistics", None),
+        ("/api/overtime/statistics/matrix", None),
+    ],
+)
+def test_if_none_match_returns_304_until_data_changes(seeded, path, cookies):
+    """携带相同 ETag 的请求返回 304 且不查询；数据变化后返回新的 ETag。"""
+    first = client.get(path, cookies=cookies)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+
+    counts = (read_cache.hits, read_cache.misses)
+    again = client.get(path, cookies=cookies, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+    assert (read_cache.hits, read_cache.misses) == counts
+
+    client.post(
+        "/api/overtime/toggle", json={"staff_id": 1, "status": "bg-2", "day": "sat"}
+    )
+    changed = client.get(path, cookies=cookies, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_etag_scoped_to_department(seeded):
+    """其他部门的修改不会改变本部门的 ETag。"""
+    etag = client.get("/api/staffs", cookies={"department": "1"}).headers["etag"]
+    client.post(
+        "/api/overtime/toggle", json={"staff_id": 2, "status": "bg-3", "day": "sat"}
+    )
+    response = client.get(
+        "/api/staffs", cookies={"department": "1"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+def test_etag_matches_header_forms():
+    """If-None-Match 支持列表、弱校验前缀与通配符。"""
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
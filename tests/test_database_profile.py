@@ -0,0 +1,46 @@
+import os
+import sys
+
+from sqlalchemy import create_engine, text
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.database import SQLiteProfile, install_sqlite_profile  # noqa: E402
+
+
+def _pragma(conn, name):
+    return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_profile_applied_to_every_connection(temp_db):
+    """每个新连接都应用 WAL / synchronous / mmap / cache 等设置。"""
+    engine = create_engine(f"sqlite:///{temp_db}")
+    install_sqlite_profile(engine, SQLiteProfile())
+    try:
+        for _ in range(2):
+            with engine.connect() as conn:
+                assert _pragma(conn, "journal_mode").lower() == "wal"
+                assert _pragma(conn, "synchronous") == 1  # NORMAL
+                assert _pragma(conn, "mmap_size") == 256 * 1024 * 1024
+                assert _pragma(conn, "cache_size") == -64000
+                assert _pragma(conn, "temp_store") == 2  # MEMORY
+                assert _pragma(conn, "busy_timeout") == 20000
+            engine.dispose()
+    finally:
+        engine.dispose()
+
+
+def test_profile_from_env(monkeypatch):
+    """环境变量可覆盖设置，空值表示保持 SQLite 默认值。"""
+    monkeypatch.setenv("SQLITE_SYNCHRONOUS", "FULL")
+    monkeypatch.setenv("SQLITE_MMAP_SIZE", "")
+    monkeypatch.setenv("SQLITE_BUSY_TIMEOUT_MS", "5000")
+
+    profile = SQLiteProfile.from_env()
+
+    assert profile.synchronous == "FULL"
+    assert profile.mmap_size is None
+    assert profile.busy_timeout == 5000
+    assert "PRAGMA busy_timeout=5000" in profile.pragmas()
+    assert not any("mmap_size" in stmt for stmt in profile.pragmas())
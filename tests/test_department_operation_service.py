@@ -49,3 +49,29 @@ def test_upsert_department_operation_update(db_session):
     assert second_op.id == first_op.id
     # 由于 SQLite 的 DateTime 精度问题和 onupdate 钩子，
     # 我们至少确认 ID 没变，且 last_updated 正常工作。
+
+
+def test_helpers_join_caller_transaction(db_session):
+    """操作记录辅助函数不自行提交，回滚后记录不存在。"""
+    from app.services.department import ensure_department_operation
+
+    today = date.today()
+    upsert_department_operation(db_session, "技术部", today)
+    ensure_department_operation(db_session, "技术部", today)
+    assert db_session.query(DepartmentOperation).count() == 1
+
+    db_session.rollback()
+    assert db_session.query(DepartmentOperation).count() == 0
+
+
+def test_upsert_resolves_department_id(db_session):
+    """写入操作记录时按部门名称解析出 department_id。"""
+    from app.models import Department
+
+    db_session.add(Department(id=7, name="品质部"))
+    db_session.commit()
+    upsert_department_operation(db_session, "品质部", date.today())
+    upsert_department_operation(db_session, "不存在的部门", date.today())
+
+    ids = dict(db_session.query(DepartmentOperation.department_name, DepartmentOperation.department_id).all())
+    assert ids == {"品质部": 7, "不存在的部门": None}
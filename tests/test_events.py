@@ -0,0 +1,156 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.database import Base  # noqa: E402
+from app.events import EventBroker, broker, queue_event  # noqa: E402
+from app.models import Department, Staff  # noqa: E402
+from app.routers.events import _stream  # noqa: E402
+from app.services.overtime import OvertimeService  # noqa: E402
+from app.write_queue import WriteQueue  # noqa: E402
+
+
+@pytest.fixture
+def session_factory(temp_db):
+    engine = create_engine(
+        f"sqlite:///{temp_db}",
+        connect_args={"check_same_thread": False, "isolation_level": None},
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = factory()
+    db.add(Department(id=1, name="制造部"))
+    db.add_all(
+        [
+            Staff(id=1, name="张三", department_id=1),
+            Staff(id=2, name="李四", department_id=1),
+        ]
+    )
+    db.commit()
+    db.close()
+    try:
+        yield factory
+    finally:
+        engine.dispose()
+
+
+async def _collect(subscription, timeout=0.2):
+    items = []
+    try:
+        while True:
+            items.append(await asyncio.wait_for(subscription.get(), timeout))
+    except asyncio.TimeoutError:
+        return items
+
+
+def test_events_published_after_commit_only(session_factory):
+    """事件在提交后才发布；回滚的事务不产生事件。"""
+
+    async def scenario():
+        async with broker.subscribe() as subscription:
+            db = session_factory()
+            try:
+                queue_event(db, "overtime", staff_id=2)
+                db.rollback()
+                await asyncio.to_thread(
+                    OvertimeService(db).toggle_staff_status, 1, "bg-2", "sat"
+                )
+            finally:
+                db.close()
+            return await _collect(subscription)
+
+    items = asyncio.run(scenario())
+    assert items[0] == {
+        "type": "overtime",
+        "staff_id": 1,
+        "department_id": 1,
+        "day": "sat",
+        "status": "bg-2",
+    }
+    assert [item["type"] for item in items] == ["overtime", "operation"]
+
+
+def test_failed_write_queue_unit_drops_its_events(session_factory):
+    """写入队列中失败单元的事件被丢弃，同批其他单元的事件照常发布。"""
+
+    def failing(session):
+        queue_event(session, "overtime", staff_id=99)
+        raise RuntimeError("boom")
+
+    async def scenario():
+        async with broker.subscribe() as subscription:
+            writer = WriteQueue(session_factory, window_ms=200)
+            writer.start()
+            try:
+                futures = [
+                    writer.submit(
+                        lambda s: OvertimeService(s).toggle_staff_status(
+                            1, "bg-3", "sun"
+                        )
+                    ),
+                    writer.submit(failing),
+                    writer.submit(
+                        lambda s: OvertimeService(s).toggle_staff_status(
+                            2, "bg-3", "sun"
+                        )
+                    ),
+                ]
+                await asyncio.to_thread(
+                    lambda: [f.exception(timeout=10) for f in futures]
+                )
+            finally:
+                writer.stop()
+            return await _collect(subscription)
+
+    items = asyncio.run(scenario())
+    overtime = [item["staff_id"] for item in items if item["type"] == "overtime"]
+    assert overtime == [1, 2]
+
+
+def test_slow_subscriber_gets_resync_instead_of_unbounded_backlog():
+    """积压超过队列上限时清空积压并只保留一个 resync 事件。"""
+
+    async def scenario():
+        local = EventBroker(queue_size=4)
+        async with local.subscribe() as subscription:
+            local.publish([{"type": "overtime", "staff_id": i} for i in range(10)])
+            return await _collect(subscription)
+
+    items = asyncio.run(scenario())
+    assert len(items) <= 4
+    assert {"type": "resync"} in items
+
+
+def test_sse_stream_formats_events():
+    """SSE 流先发送 retry，再以 event/data 格式推送事件。"""
+
+    async def scenario():
+        stream = _stream()
+        first = await stream.__anext__()
+        pending = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.05)
+        broker.publish(
+            [{"type": "confirm", "department_id": 1, "department": "制造部"}]
+        )
+        chunk = await asyncio.wait_for(pending, 2)
+        await stream.aclose()
+        return first, chunk
+
+    first, chunk = asyncio.run(scenario())
+    assert first.startswith("retry:")
+    event_line, data_line = chunk.strip().split("\n")
+    assert event_line == "event: confirm"
+    assert json.loads(data_line[len("data: ") :]) == {
+        "type": "confirm",
+        "department_id": 1,
+        "department": "制造部",
+    }
+    assert broker.subscriber_count == 0
@@ -0,0 +1,112 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.database import get_db  # noqa: E402
+from app.export_cache import ExportCache  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import (  # noqa: E402
+    Department,
+    DepartmentOperation,
+    OvertimeHistory,
+    Staff,
+)
+from app.routers import exports as exports_router  # noqa: E402
+from app.services.exports import OvertimeTableExportService  # noqa: E402
+
+
+def _key(index):
+    return f"{index:032x}"
+
+
+def test_cache_spills_to_disk_and_evicts_oldest(tmp_path):
+    """内存超限的条目落盘，磁盘超限时淘汰最久未用的文件；重启后仍能命中磁盘条目。"""
+    cache = ExportCache(memory_bytes=100, directory=str(tmp_path), disk_bytes=250)
+    for index in range(3):
+        cache.put(_key(index), bytes([index]) * 60)
+
+    # 内存只留最新一份，其余两份落盘
+    assert sorted(os.listdir(tmp_path)) == [f"{_key(0)}.pdf", f"{_key(1)}.pdf"]
+    assert cache.get(_key(0)) == bytes([0]) * 60
+    assert cache.metrics()["disk_hits"] == 1
+
+    for index in range(3, 6):
+        cache.put(_key(index), bytes([index]) * 60)
+    metrics = cache.metrics()
+    assert metrics["disk_bytes"] <= 250
+    assert metrics["evictions"] >= 1
+    # 最久未用的 key 1 被淘汰，刚读过的 key 0 仍在磁盘上
+    assert not (tmp_path / f"{_key(1)}.pdf").exists()
+    assert (tmp_path / f"{_key(0)}.pdf").exists()
+
+    reopened = ExportCache(memory_bytes=100, directory=str(tmp_path), disk_bytes=250)
+    assert reopened.get(_key(0)) == bytes([0]) * 60
+    assert reopened.get(_key(1)) is None
+    assert reopened.get("../not-a-key") is None
+
+
+@pytest.fixture
+def cached_client(db_session, tmp_path, monkeypatch):
+    cache = ExportCache(
+        memory_bytes=1 << 20, directory=str(tmp_path), disk_bytes=1 << 20
+    )
+    monkeypatch.setattr(exports_router, "export_cache", cache)
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        yield TestClient(app), cache
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_repeated_export_is_served_from_cache(db_session, cached_client, monkeypatch):
+    """同一天重复下载：带 ETag 返回 304，不带则直接返回缓存内容而不重新渲染；数据变化后 ETag 改变。"""
+    client, cache = cached_client
+    export_date = date(2026, 3, 7)
+    db_session.add(Department(id=1, name="制造部"))
+    db_session.add(Staff(id=1, name="张三", department_id=1))
+    db_session.add(
+        DepartmentOperation(department_name="制造部", department_id=1, date=export_date)
+    )
+    db_session.add(
+        OvertimeHistory(date=export_date, staff_id=1, department_id=1, status="bg-2")
+    )
+    db_session.commit()
+    params = {"date": export_date.isoformat()}
+
+    first = client.get("/api/exports/overtime-table", params=params)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Content-Length"] == str(len(first.content))
+
+    not_modified = client.get(
+        "/api/exports/overtime-table", params=params, headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+
+    original = OvertimeTableExportService.render_pdf
+
+    def no_render(*args, **kwargs):
+        raise AssertionError("cached exports must not be re-rendered")
+
+    monkeypatch.setattr(OvertimeTableExportService, "render_pdf", no_render)
+    again = client.get("/api/exports/overtime-table", params=params)
+    assert again.status_code == 200
+    assert again.content == first.content
+    assert again.headers["ETag"] == etag
+    assert cache.metrics()["hits"] == 1
+    monkeypatch.setattr(OvertimeTableExportService, "render_pdf", original)
+
+    db_session.add(Staff(id=2, name="李四", department_id=1))
+    db_session.add(
+        OvertimeHistory(date=export_date, staff_id=2, department_id=1, status="bg-3")
+    )
+    db_session.commit()
+    changed = client.get("/api/exports/overtime-table", params=params)
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
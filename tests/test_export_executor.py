@@ -0,0 +1,65 @@
+import os
+import sys
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.export_executor import ExportBusy, ExportExecutor  # noqa: E402
+from app.main import app  # noqa: E402
+from app.routers import exports as exports_router  # noqa: E402
+
+
+def test_executor_rejects_when_full_and_records_timings():
+    """工作线程和等待队列都占满后立即拒绝，并记录排队与渲染耗时。"""
+    executor = ExportExecutor(workers=1, queue_depth=1)
+    release = threading.Event()
+    try:
+        running = executor.submit(release.wait, 5)
+        queued = executor.submit(lambda: "done")
+        with pytest.raises(ExportBusy) as exc_info:
+            executor.submit(lambda: "rejected")
+        assert exc_info.value.retry_after >= 1
+
+        metrics = executor.metrics()
+        assert metrics["in_flight"] == 2
+        assert metrics["queued"] == 1
+        assert metrics["rejected"] == 1
+
+        release.set()
+        assert running.result(5) is True
+        assert queued.result(5) == "done"
+        # 释放后重新接受任务
+        assert executor.submit(lambda: 42).result(5) == 42
+    finally:
+        release.set()
+        executor.shutdown()
+
+    metrics = executor.metrics()
+    assert metrics["in_flight"] == 0
+    assert metrics["completed"] == 3
+    assert metrics["queue_wait"]["count"] == 3
+    assert metrics["render"]["max_ms"] > 0
+
+
+def test_export_route_returns_503_when_saturated(db_session, monkeypatch):
+    """导出池饱和时接口返回 503 并带 Retry-After；指标接口可读取计数。"""
+
+    class SaturatedExecutor(ExportExecutor):
+        def submit(self, fn, *args, **kwargs):
+            self.rejected += 1
+            raise ExportBusy(7)
+
+    monkeypatch.setattr(exports_router, "export_executor", SaturatedExecutor())
+    client = TestClient(app)
+
+    response = client.get("/api/exports/overtime-table", params={"date": "2026-03-07"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+
+    metrics = client.get("/api/exports/metrics").json()
+    assert metrics["rejected"] == 1
+    assert set(metrics["render"]) == {"count", "avg_ms", "max_ms"}
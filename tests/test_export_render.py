@@ -0,0 +1,156 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.services.exports import (  # noqa: E402
+    CONTINUED_MARKER,
+    NAME_FONT_SIZES,
+    OVERFLOW_CONTINUE,
+    TEMPLATE_ROWS,
+    TITLE_CLEAR_BOX,
+    DepartmentExportRow,
+    NameRun,
+    OvertimeTableExportService,
+    get_compiled_template,
+    glyph_widths,
+)
+
+
+def _rows(names):
+    return [
+        DepartmentExportRow(
+            template_name=row.template_name,
+            department_id=row.department_id,
+            row_top=row.row_top,
+            row_bottom=row.row_bottom,
+            name_runs=[
+                NameRun(name, index % 2 == 1) for index, name in enumerate(names)
+            ],
+            remark_count=len(names),
+        )
+        for row in TEMPLATE_ROWS
+    ]
+
+
+def test_compiled_template_is_cleared_and_reused():
+    """模板只编译一次，标题区和各行单元格已预先清白；每次渲染只嵌入一张背景图，并以表单对象引用。"""
+    template = get_compiled_template()
+    assert get_compiled_template() is template
+    assert template.cleared_rows == {
+        (row.row_top, row.row_bottom) for row in TEMPLATE_ROWS
+    }
+
+    left, top, right, bottom = TITLE_CLEAR_BOX
+    assert template.image.crop((left, top, right, bottom)).getcolors() == [
+        ((right - left) * (bottom - top), (255, 255, 255))
+    ]
+
+    pdf = OvertimeTableExportService().render_pdf(
+        date(2026, 3, 7), _rows(["张三", "李四"])
+    )
+    assert pdf.startswith(b"%PDF")
+    assert pdf.count(b"/Subtype /Image") == 1
+    assert pdf.count(b"/Subtype /Form") == 1
+
+
+def test_glyph_widths_match_reportlab_and_split_fits_box():
+    """逐字宽度表缩放后与 stringWidth 一致；超长姓名一次切分，每段都不超过单元格宽度。"""
+    from reportlab.pdfbase import pdfmetrics
+
+    service = OvertimeTableExportService()
+    service._register_font()
+    widths = glyph_widths()
+    text = "张三（ABC）·李四xyz、"
+    for font_size in (9, 12.5, 16):
+        assert widths.width(text, font_size) == pdfmetrics.stringWidth(
+            text, widths.font_name, font_size
+        )
+
+    long_name = "欧阳" * 60
+    runs = service._measure_runs([NameRun(long_name, True), NameRun("王五", False)])
+    assert [run.text for run in runs] == [f"{long_name}、", "王五"]
+
+    segments = service._split_runs(runs, 12, 80.0)
+    assert "".join(text for text, _, _ in segments) == f"{long_name}、王五"
+    assert len(segments) > 2
+    for text, _, width in segments:
+        assert width <= 80.0
+        assert width == pdfmetrics.stringWidth(text, widths.font_name, 12)
+
+
+def _large_department(count):
+    """制造部 count 人、其余部门各 2 人。"""
+    rows = _rows(["张三", "李四"])
+    names = [NameRun(f"员工{index:03d}", index % 3 == 0) for index in range(count)]
+    rows[0] = DepartmentExportRow(
+        rows[0].template_name,
+        rows[0].department_id,
+        rows[0].row_top,
+        rows[0].row_bottom,
+        names,
+        count,
+    )
+    return rows
+
+
+def test_fit_picks_largest_size_that_fits():
+    """二分查找得到的字号与逐档尝试得到的最大可放下字号一致。"""
+    service = OvertimeTableExportService()
+    service._register_font()
+    row = TEMPLATE_ROWS[0]
+    box_width = 457 - 76 - 12
+    box_height = row.row_bottom - row.row_top - 12
+
+    for count in (2, 12, 25, 40, 55, 70):
+        measured = service._measure_runs(
+            [NameRun(f"员工{i:03d}", False) for i in range(count)]
+        )
+        expected = next(
+            font_size
+            for font_size in NAME_FONT_SIZES
+            if len(
+                service._wrap_segments(
+                    service._split_runs(measured, font_size, box_width), box_width
+                )
+            )
+            <= box_height // (font_size + 3)
+        )
+        layout = service._fit_names(measured, box_width, box_height)
+        assert not layout.overflow
+        assert layout.font_size == expected
+
+
+def test_overflow_continues_on_next_page():
+    """续页模式下，放不下的姓名按顺序排到续页，单元格末尾标注“（续）”，不丢字。"""
+    import re
+
+    service = OvertimeTableExportService()
+    rows = _large_department(240)
+
+    truncated = service.render_pdf(date(2026, 3, 7), rows)
+    continued = service.render_pdf(date(2026, 3, 7), rows, OVERFLOW_CONTINUE)
+    assert re.search(rb"/Count 1\b", truncated)
+    assert re.search(rb"/Count 2\b", continued)
+
+    row = TEMPLATE_ROWS[0]
+    measured = service._measure_runs(rows[0].name_runs)
+    layout = service._fit_names(
+        measured, 457 - 76 - 12, row.row_bottom - row.row_top - 12
+    )
+    assert layout.font_size == NAME_FONT_SIZES[-1] and layout.overflow
+    service._mark_continued(layout, 457 - 76 - 12)
+    assert layout.lines[-1][-1][0] == CONTINUED_MARKER
+    cell = "".join(text for line in layout.lines for text, _, _ in line)
+    assert cell.endswith(CONTINUED_MARKER)
+    rest = "".join(text for text, _, _ in layout.overflow)
+    assert cell[: -len(CONTINUED_MARKER)] + rest == "".join(
+        run.text for run in measured
+    )
+
+    with pytest.raises(ValueError):
+        service.render_pdf(date(2026, 3, 7), rows, "bogus")
@@ -0,0 +1,132 @@
+import os
+import sys
+from datetime import date, timedelta
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.models import Department, OvertimeWeek, Staff  # noqa: E402
+from app.routers.info import _build_statistics  # noqa: E402
+from app.services.department import upsert_department_operation  # noqa: E402
+
+TOKENS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def test_statistics_only_counts_current_week_operations(db_session):
+    """统计只看滚动周内的操作记录，上周同一天的历史记录不生效。"""
+    today = date.today()
+    token = TOKENS[today.weekday()]
+    db_session.add_all(
+        [Department(id=1, name="制造部"), Department(id=2, name="品质部")]
+    )
+    db_session.add_all(
+        [
+            Staff(id=1, name="张三", department_id=1),
+            Staff(id=2, name="李四", department_id=2),
+        ]
+    )
+    db_session.add_all(
+        [
+            OvertimeWeek(staff_id=1, **{token: "bg-2"}),
+            OvertimeWeek(staff_id=2, **{token: "bg-3"}),
+        ]
+    )
+    db_session.commit()
+    upsert_department_operation(db_session, "制造部", today)
+    for weeks in range(1, 53):
+        upsert_department_operation(
+            db_session, "品质部", today - timedelta(weeks=weeks)
+        )
+    db_session.commit()
+
+    days = _build_statistics(db_session)["days"]
+
+    assert days[token] == {"normal": {"制造部": ["张三"]}, "evection": {}}
+
+
+def _python_statistics(db_session):
+    """旧实现：逐行逐天在 Python 中分组，作为输出格式的参照。"""
+    from sqlalchemy import text
+    from app.models import DepartmentOperation
+
+    today = date.today()
+    week = {
+        t: today + timedelta(days=i - today.weekday()) for i, t in enumerate(TOKENS)
+    }
+    active_set = {
+        (op.department_id, op.date)
+        for op in db_session.query(
+            DepartmentOperation.department_id, DepartmentOperation.date
+        )
+    }
+    rows = db_session.execute(
+        text(
+            """
+        SELECT s.name AS staff_name, d.id AS dept_id, d.name AS dept_name,
+            COALESCE(ow.mon, 'bg-1') AS mon, COALESCE(ow.tue, 'bg-1') AS tue,
+            COALESCE(ow.wed, 'bg-1') AS wed, COALESCE(ow.thu, 'bg-1') AS thu,
+            COALESCE(ow.fri, 'bg-1') AS fri, COALESCE(ow.sat, 'bg-1') AS sat,
+            COALESCE(ow.sun, 'bg-1') AS sun
+        FROM staffs s
+        JOIN departments d ON s.department_id = d.id
+        LEFT JOIN overtime_weeks_labels ow ON ow.staff_id = s.id
+        ORDER BY d.name, s.name
+    """
+        )
+    ).fetchall()
+    days = {day: {"normal": {}, "evection": {}} for day in TOKENS}
+    for row in rows:
+        for day in TOKENS:
+            if (row.dept_id, week[day]) not in active_set:
+                continue
+            status = getattr(row, day)
+            if status == "bg-2":
+                days[day]["normal"].setdefault(row.dept_name, []).append(row.staff_name)
+            elif status == "bg-3":
+                days[day]["evection"].setdefault(row.dept_name, []).append(
+                    row.staff_name
+                )
+    return days
+
+
+def test_sql_aggregation_matches_python_grouping(db_session):
+    """SQL 聚合的输出与原先 Python 分组的结果逐字节一致。"""
+    import json
+    import random
+
+    rng = random.Random(7)
+    today = date.today()
+    monday = today - timedelta(days=today.weekday())
+    db_session.add_all(
+        [Department(id=i, name=f"部门{(i * 7) % 10}") for i in range(1, 11)]
+    )
+    names = [f"员工{n:03d}" for n in range(200)]
+    rng.shuffle(names)
+    db_session.add_all(
+        [
+            Staff(id=i, name=names[i - 1], department_id=rng.randint(1, 10))
+            for i in range(1, 201)
+        ]
+    )
+    db_session.add_all(
+        [
+            OvertimeWeek(
+                staff_id=i,
+                **{t: rng.choice(["bg-1", "bg-2", "bg-3", None]) for t in TOKENS},
+            )
+            for i in range(1, 181)
+        ]
+    )
+    db_session.commit()
+    for dept_id in range(1, 11):
+        for offset in rng.sample(range(7), 4):
+            upsert_department_operation(
+                db_session, f"部门{(dept_id * 7) % 10}", monday + timedelta(days=offset)
+            )
+    db_session.commit()
+
+    stats = _build_statistics(db_session)
+
+    assert json.dumps(stats["days"], ensure_ascii=False) == json.dumps(
+        _python_statistics(db_session), ensure_ascii=False
+    )
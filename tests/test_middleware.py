@@ -2,10 +2,43 @@
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app import main
+from app.database import Base, get_db
 from app.main import app
+from app.migrations import run_migrations
 
 client = TestClient(app)
 
+
+@pytest.fixture(scope="module", autouse=True)
+def _temporary_database(tmp_path_factory):
+    # The app lifespan migrates the real database, so the schema is built
+    # in a temporary file here and routes and /health are pointed at it.
+    path = tmp_path_factory.mktemp("middleware") / "test.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = TestSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    patch = pytest.MonkeyPatch()
+    patch.setattr(main, "engine", engine)
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield
+    finally:
+        app.dependency_overrides.clear()
+        patch.undo()
+        engine.dispose()
+
 class TestSecurityMiddleware:
     """Test security validation middleware."""
     
@@ -0,0 +1,299 @@
+import os
+import sys
+from datetime import date
+
+from sqlalchemy import create_engine, inspect, text
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app import models  # noqa: E402,F401  注册所有模型
+from app.database import Base  # noqa: E402
+from app.migrations import run_migrations  # noqa: E402
+
+
+def test_unique_index_migration_dedupes_old_table(temp_db):
+    """旧库中重复的 (部门, 日期) 记录只保留最新一条，并补上唯一索引。"""
+    engine = create_engine(f"sqlite:///{temp_db}")
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE department_operations ("
+                    "id INTEGER PRIMARY KEY, department_name VARCHAR NOT NULL, "
+                    "date DATE NOT NULL, last_updated DATETIME)"
+                )
+            )
+            for op_id, updated in (
+                (1, "2026-03-06 08:00:00"),
+                (2, "2026-03-06 09:00:00"),
+            ):
+                conn.execute(
+                    text(
+                        "INSERT INTO department_operations "
+                        "VALUES (:id, '制造部', '2026-03-07', :updated)"
+                    ),
+                    {"id": op_id, "updated": updated},
+                )
+        Base.metadata.create_all(bind=engine)
+
+        run_migrations(engine)
+        run_migrations(engine)
+
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT id FROM department_operations")).fetchall()
+        assert [row.id for row in rows] == [2]
+        indexes = {
+            ix["name"]: ix
+            for ix in inspect(engine).get_indexes("department_operations")
+        }
+        assert indexes["ux_department_operations_department_date"]["unique"]
+    finally:
+        engine.dispose()
+
+
+def test_department_id_migration_backfills_from_names(temp_db):
+    """旧库补上 department_id 列，并按部门名称回填；未知部门保持为空。"""
+    engine = create_engine(f"sqlite:///{temp_db}")
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE department_operations ("
+                    "id INTEGER PRIMARY KEY, department_name VARCHAR NOT NULL, "
+                    "date DATE NOT NULL, last_updated DATETIME)"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO department_operations VALUES "
+                    "(1, '制造部', '2026-03-07', NULL), (2, '已撤销部门', '2026-03-07', NULL)"
+                )
+            )
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO departments (id, name) VALUES (5, '制造部')")
+            )
+
+        run_migrations(engine)
+        run_migrations(engine)
+
+        with engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT id, department_id FROM department_operations ORDER BY id")
+            ).fetchall()
+        assert [tuple(row) for row in rows] == [(1, 5), (2, None)]
+        indexes = {
+            ix["name"] for ix in inspect(engine).get_indexes("department_operations")
+        }
+        assert "ix_department_operations_department_id_date" in indexes
+    finally:
+        engine.dispose()
+
+
+def test_overtime_weeks_rebuilt_with_status_codes(temp_db):
+    """旧库的 'bg-N' 文本列重建为整数编码；触发器与兼容视图随之重建，读取结果不变。"""
+    from app.models import OvertimeWeek
+
+    engine = create_engine(f"sqlite:///{temp_db}")
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE overtime_weeks (id INTEGER PRIMARY KEY, "
+                    "staff_id INTEGER NOT NULL UNIQUE, "
+                    "mon VARCHAR NOT NULL, tue VARCHAR NOT NULL, "
+                    "wed VARCHAR NOT NULL, thu VARCHAR NOT NULL, fri VARCHAR NOT NULL, "
+                    "sat VARCHAR NOT NULL, sun VARCHAR NOT NULL)"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO overtime_weeks VALUES "
+                    "(1, 1, 'bg-1', 'bg-1', 'bg-1', 'bg-1', 'bg-1', 'bg-2', 'bg-3')"
+                )
+            )
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO departments (id, name) VALUES (1, '制造部')")
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO staffs (id, name, department_id) VALUES (1, '张三', 1)"
+                )
+            )
+
+        run_migrations(engine)
+        run_migrations(engine)
+
+        with engine.begin() as conn:
+            assert conn.execute(
+                text("SELECT sat, sun FROM overtime_weeks")
+            ).fetchone() == (1, 2)
+            assert conn.execute(
+                text("SELECT sat, sun FROM overtime_weeks_labels")
+            ).fetchone() == ("bg-2", "bg-3")
+            conn.execute(text("UPDATE overtime_weeks SET mon = 1 WHERE staff_id = 1"))
+            versions = conn.execute(
+                text("SELECT version FROM data_versions WHERE scope = 'dept:1'")
+            ).scalar()
+        assert versions >= 1
+
+        with engine.connect() as conn:
+            record = conn.execute(OvertimeWeek.__table__.select()).fetchone()
+        assert (record.mon, record.sat, record.sun) == ("bg-2", "bg-2", "bg-3")
+    finally:
+        engine.dispose()
+
+
+def test_overtime_history_seeded_from_rolling_week(temp_db):
+    """历史表为空时，用当前滚动周的非空状态补种一次；之后不再重复写入。"""
+    from datetime import timedelta
+
+    engine = create_engine(f"sqlite:///{temp_db}")
+    try:
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO departments (id, name) VALUES (1, '制造部')")
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO staffs (id, name, department_id) VALUES (1, '张三', 1)"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO overtime_weeks "
+                    "(staff_id, mon, tue, wed, thu, fri, sat, sun) "
+                    "VALUES (1, 0, 0, 0, 0, 0, 1, 2)"
+                )
+            )
+
+        run_migrations(engine)
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM overtime_history WHERE status = 2"))
+        run_migrations(engine)
+
+        monday = date.today() - timedelta(days=date.today().weekday())
+        with engine.connect() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT date, staff_id, department_id, status FROM overtime_history"
+                )
+            ).fetchall()
+        assert [tuple(row) for row in rows] == [
+            ((monday + timedelta(days=5)).isoformat(), 1, 1, 1)
+        ]
+    finally:
+        engine.dispose()
+
+
+def test_versioned_migrations_backfill_weeks_once(temp_db):
+    """旧的 sat/sun 记录一次性补成周记录并登记版本；再次启动不再执行任何步骤。"""
+    from app.migrations import MIGRATIONS, pending_migrations
+
+    engine = create_engine(f"sqlite:///{temp_db}")
+    try:
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO departments (id, name) VALUES (1, '制造部')")
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO staffs (id, name, department_id) "
+                    "VALUES (1, '张三', 1), (2, '李四', 1), (3, '王五', 1)"
+                )
+            )
+            conn.execute(
+                text("INSERT INTO sat (staff_id, is_evection) VALUES (1, 0), (2, 1)")
+            )
+            conn.execute(text("INSERT INTO sun (staff_id, is_evection) VALUES (1, 1)"))
+
+        assert run_migrations(engine) == [version for version, _ in MIGRATIONS]
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT staff_id, mon, sat, sun FROM overtime_weeks "
+                    "ORDER BY staff_id"
+                )
+            ).fetchall()
+            assert [tuple(row) for row in rows] == [
+                (1, 0, 1, 2),
+                (2, 0, 2, 0),
+                (3, 0, 0, 0),
+            ]
+            conn.execute(text("DELETE FROM overtime_weeks WHERE staff_id = 3"))
+
+        assert pending_migrations(engine) == []
+        assert run_migrations(engine) == []
+        with engine.connect() as conn:
+            assert (
+                conn.execute(text("SELECT COUNT(*) FROM overtime_weeks")).scalar() == 2
+            )
+            names = (
+                conn.execute(
+                    text("SELECT name FROM schema_migrations ORDER BY version")
+                )
+                .scalars()
+                .all()
+            )
+        assert names[4] == "backfill_overtime_weeks"
+    finally:
+        engine.dispose()
+
+
+def test_department_summary_rebuilt_after_week_backfill(temp_db):
+    """旧库中既有周记录又有缺周记录的员工：补种周记录会先触发汇总表，之后的汇总迁移仍须全量重建。"""
+    from sqlalchemy.orm import Session
+
+    from app.services.overtime import check_department_summary
+
+    engine = create_engine(f"sqlite:///{temp_db}")
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE overtime_weeks (id INTEGER PRIMARY KEY, "
+                    "staff_id INTEGER NOT NULL UNIQUE, "
+                    "mon VARCHAR NOT NULL, tue VARCHAR NOT NULL, "
+                    "wed VARCHAR NOT NULL, thu VARCHAR NOT NULL, fri VARCHAR NOT NULL, "
+                    "sat VARCHAR NOT NULL, sun VARCHAR NOT NULL)"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO overtime_weeks VALUES "
+                    "(1, 1, 'bg-1', 'bg-1', 'bg-1', 'bg-1', 'bg-1', 'bg-2', 'bg-3')"
+                )
+            )
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO departments (id, name) VALUES (1, '制造部')")
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO staffs (id, name, department_id) "
+                    "VALUES (1, '张三', 1), (2, '李四', 1)"
+                )
+            )
+            # 李四没有周记录，只有旧的 sat 表记录
+            conn.execute(text("INSERT INTO sat (staff_id, is_evection) VALUES (2, 0)"))
+
+        run_migrations(engine)
+
+        with Session(engine) as session:
+            assert check_department_summary(session) == []
+            sat = session.execute(
+                text(
+                    "SELECT total_staff, internal, trip FROM department_day_summary "
+                    "WHERE department_id = 1 AND day = 'sat'"
+                )
+            ).fetchone()
+        assert tuple(sat) == (2, 2, 0)
+    finally:
+        engine.dispose()
@@ -0,0 +1,115 @@
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.main import app  # noqa: E402
+from app.database import get_db  # noqa: E402
+from app.models import Department, OvertimeHistory, Staff  # noqa: E402
+from app.services.overtime import OvertimeService, get_date_by_token  # noqa: E402
+from app.services.reports import rebuild_monthly_rollups  # noqa: E402
+
+client = TestClient(app)
+
+
+def _seed(db_session):
+    db_session.add_all(
+        [Department(id=1, name="制造部"), Department(id=2, name="品质部")]
+    )
+    db_session.add_all(
+        [
+            Staff(id=1, name="张三", department_id=1),
+            Staff(id=2, name="李四", department_id=1),
+            Staff(id=3, name="王五", department_id=2),
+        ]
+    )
+    db_session.commit()
+
+
+def _rollups(db_session):
+    return {
+        table: sorted(
+            tuple(row) for row in db_session.execute(text(f"SELECT * FROM {table}"))
+        )
+        for table in ("overtime_monthly_staff", "overtime_monthly_department")
+    }
+
+
+def test_monthly_report_follows_status_changes(db_session):
+    """状态变化时月度汇总随之增减；接口按月或按年直接读取汇总。"""
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        _seed(db_session)
+        service = OvertimeService(db_session)
+        sat = get_date_by_token("sat")
+        month = sat.strftime("%Y-%m")
+
+        service.toggle_staff_status(1, "bg-2", "sat")
+        service.apply_to_all(1, "bg-3", "sat")  # 张三改为出差，李四新增出差
+        service.toggle_staff_status(3, "bg-2", "sat")
+        service.toggle_staff_status(3, "bg-1", "sat")  # 撤销
+
+        body = client.get("/api/reports/monthly", params={"month": month}).json()
+        assert body["period"] == month
+        assert [
+            (d["department_name"], d["internal_days"], d["trip_days"])
+            for d in body["departments"]
+        ] == [("制造部", 0, 2)]
+        assert [
+            (s["staff_name"], s["internal_days"], s["trip_days"]) for s in body["staff"]
+        ] == [("张三", 0, 1), ("李四", 0, 1)]
+
+        by_year = client.get(
+            "/api/reports/monthly", params={"year": sat.year, "dept_id": 2}
+        ).json()
+        assert by_year["departments"] == [] and by_year["staff"] == []
+
+        assert client.get("/api/reports/monthly").status_code == 400
+        assert (
+            client.get("/api/reports/monthly", params={"month": "2026-13"}).status_code
+            == 400
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_rebuild_matches_incremental_rollups(db_session):
+    """从历史表重建的汇总与触发器增量维护的结果一致。"""
+    _seed(db_session)
+    rng = random.Random(3)
+    start = date(2025, 11, 20)
+    for _ in range(300):
+        day = start + timedelta(days=rng.randrange(90))
+        staff_id = rng.randint(1, 3)
+        row = db_session.get(OvertimeHistory, (day, staff_id))
+        status = rng.choice(["bg-1", "bg-2", "bg-3"])
+        if row is None:
+            db_session.add(
+                OvertimeHistory(
+                    date=day,
+                    staff_id=staff_id,
+                    department_id=staff_id // 3 + 1,
+                    status=status,
+                )
+            )
+        elif rng.random() < 0.2:
+            db_session.delete(row)
+        else:
+            row.status = status
+        db_session.commit()
+
+    incremental = _rollups(db_session)
+    # 汇总行数为零的月份在重建后不会出现
+    incremental = {
+        table: [row for row in rows if row[2] or row[3]]
+        for table, rows in incremental.items()
+    }
+    rebuild_monthly_rollups(db_session)
+    assert _rollups(db_session) == incremental
+    assert incremental["overtime_monthly_department"]
@@ -8,6 +8,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
 from app.models import Department, Staff, DepartmentOperation, OvertimeWeek
 from app.services.department import upsert_department_operation
+from app.services.overtime import get_date_by_token
 from app.services.exports import OvertimeTableExportService, TEMPLATE_ROWS
 
 def test_full_flow_op_records(db_session):
@@ -33,8 +34,8 @@ def test_full_flow_op_records(db_session):
     db_session.add_all([staff1, staff2])
     db_session.commit()
     
-    # 初始化加班记录 (测试周六)
-    test_date = date(2026, 3, 7) # 周六
+    # 初始化加班记录 (测试本周六：overtime_weeks 只保存当前滚动周)
+    test_date = get_date_by_token("sat")
     
     db_session.add(OvertimeWeek(staff_id=staff1.id, sat="bg-2"))
     db_session.add(OvertimeWeek(staff_id=staff2.id, sat="bg-2"))
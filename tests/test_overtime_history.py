@@ -0,0 +1,93 @@
+import os
+import sys
+from datetime import timedelta
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.models import Department, OvertimeHistory, OvertimeWeek, Staff  # noqa: E402
+from app.services.department import upsert_department_operation  # noqa: E402
+from app.services.exports import OvertimeTableExportService  # noqa: E402
+from app.services.info import InfoService  # noqa: E402
+from app.services.overtime import OvertimeService, get_date_by_token  # noqa: E402
+
+
+def _seed(db_session):
+    db_session.add_all(
+        [Department(id=1, name="制造部"), Department(id=2, name="品质部")]
+    )
+    db_session.add_all(
+        [
+            Staff(id=1, name="张三", department_id=1),
+            Staff(id=2, name="李四", department_id=1),
+            Staff(id=3, name="王五", department_id=2),
+        ]
+    )
+    db_session.commit()
+
+
+def _history(db_session):
+    return {
+        (row.staff_id, row.date): (row.department_id, row.status)
+        for row in db_session.query(OvertimeHistory)
+    }
+
+
+def test_writes_record_history_by_date(db_session):
+    """单个切换、批量切换和整部门设置都会按具体日期写入历史表，重复写入覆盖同一行。"""
+    _seed(db_session)
+    service = OvertimeService(db_session)
+    sat, sun = get_date_by_token("sat"), get_date_by_token("sun")
+
+    service.toggle_staff_status(1, "bg-2", "sat")
+    service.toggle_staff_status(1, "bg-3", "sat")
+    service.batch_toggle([(3, "bg-2", "sun")])
+    service.apply_to_all(1, "bg-3", "sun")
+
+    assert _history(db_session) == {
+        (1, sat): (1, "bg-3"),
+        (3, sun): (2, "bg-2"),
+        (1, sun): (1, "bg-3"),
+        (2, sun): (1, "bg-3"),
+    }
+
+
+def test_past_week_export_and_info_read_history(db_session):
+    """过去日期的导出与统计从历史表读取，不受当前周 overtime_weeks 的影响。"""
+    _seed(db_session)
+    past = get_date_by_token("sat") - timedelta(days=14)
+    db_session.add_all(
+        [
+            OvertimeHistory(staff_id=1, date=past, department_id=1, status="bg-2"),
+            OvertimeHistory(staff_id=2, date=past, department_id=1, status="bg-3"),
+            OvertimeHistory(staff_id=3, date=past, department_id=2, status="bg-2"),
+            OvertimeHistory(
+                staff_id=1,
+                date=past + timedelta(days=1),
+                department_id=1,
+                status="bg-1",
+            ),
+            # 当前周的数据不应出现在过去日期的结果里
+            OvertimeWeek(staff_id=1, sat="bg-1"),
+            OvertimeWeek(staff_id=2, sat="bg-2"),
+        ]
+    )
+    db_session.commit()
+    upsert_department_operation(db_session, "制造部", past)
+    db_session.commit()
+
+    rows = OvertimeTableExportService(db_session).build_department_rows(past)
+    row = next(r for r in rows if r.department_id == 1)
+    assert [(run.text, run.underlined) for run in row.name_runs] == [
+        ("张三", False),
+        ("李四", True),
+    ]
+    # 品质部当天没有操作记录，被过滤
+    assert next(r for r in rows if r.department_id == 2).name_runs == []
+
+    days = InfoService(db_session).get_statistics(week=past)["days"]
+    assert days["sat"] == {
+        "normal": {"制造部": ["张三"]},
+        "evection": {"制造部": ["李四"]},
+    }
+    assert days["sun"] == {"normal": {}, "evection": {}}
@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import sys
+
+from fastapi.testclient import TestClient
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.main import app  # noqa: E402
+from app.database import get_db  # noqa: E402
+from app.models import Department, OvertimeWeek, Staff  # noqa: E402
+from app.read_cache import read_cache  # noqa: E402
+
+client = TestClient(app)
+
+
+def _seed(db_session):
+    db_session.add_all(
+        [Department(id=1, name="制造部"), Department(id=2, name="品质部")]
+    )
+    db_session.add_all(
+        [
+            Staff(id=1, name="张三", department_id=1),
+            Staff(id=2, name="李四", department_id=2),
+        ]
+    )
+    db_session.add_all([OvertimeWeek(staff_id=1), OvertimeWeek(staff_id=2)])
+    db_session.commit()
+
+
+def test_staff_list_cached_per_department(db_session):
+    """员工列表按部门缓存：本部门修改后失效，其他部门的修改不影响命中。"""
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        _seed(db_session)
+        dept1 = {"department": "1"}
+        assert client.get("/api/staffs", cookies=dept1).json()[0]["sat"] == "bg-1"
+
+        hits = read_cache.hits
+        client.get("/api/staffs", cookies=dept1)
+        assert read_cache.hits == hits + 1
+
+        # 其他部门的修改不会让本部门缓存失效
+        client.post(
+            "/api/overtime/toggle", json={"staff_id": 2, "status": "bg-2", "day": "sat"}
+        )
+        client.get("/api/staffs", cookies=dept1)
+        assert read_cache.hits == hits + 2
+
+        client.post(
+            "/api/overtime/toggle", json={"staff_id": 1, "status": "bg-3", "day": "sat"}
+        )
+        assert client.get("/api/staffs", cookies=dept1).json()[0]["sat"] == "bg-3"
+        assert read_cache.hits == hits + 2
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_cache_sees_commits_from_other_connections(db_session, temp_db):
+    """其他进程（另一个连接）直接写库后，缓存通过 data_version 感知并失效。"""
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        _seed(db_session)
+        dept1 = {"department": "1"}
+        assert client.get("/api/staffs", cookies=dept1).json()[0]["sat"] == "bg-1"
+
+        other = sqlite3.connect(temp_db)
+        with other:
+            other.execute("UPDATE overtime_weeks SET sat = 1 WHERE staff_id = 1")
+        other.close()
+
+        assert client.get("/api/staffs", cookies=dept1).json()[0]["sat"] == "bg-2"
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_info_statistics_invalidated_by_any_department(db_session):
+    """跨部门统计依赖全局版本，任一部门的修改都会使其失效。"""
+    from datetime import date
+    from app.services.overtime import DAY_TOKENS
+
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        _seed(db_session)
+        token = DAY_TOKENS[date.today().weekday()]
+        assert client.get("/api/info/statistics").json()["days"][token]["normal"] == {}
+
+        client.post(
+            "/api/overtime/toggle", json={"staff_id": 2, "status": "bg-2", "day": token}
+        )
+        days = client.get("/api/info/statistics").json()["days"]
+        assert days[token]["normal"] == {"品质部": ["李四"]}
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_version_probe_runs_off_event_loop(db_session, monkeypatch):
+    """版本探测（连接、PRAGMA、查询）在线程池中执行，不占用事件循环线程。"""
+    import asyncio
+    import threading
+
+    from app.read_cache import ReadCache
+
+    probe_threads = []
+    loop_threads = []
+    original = ReadCache._snapshot
+
+    def recording_snapshot(self, db):
+        try:
+            asyncio.get_running_loop()
+            loop_threads.append(threading.current_thread())
+        except RuntimeError:
+            probe_threads.append(threading.current_thread())
+        return original(self, db)
+
+    monkeypatch.setattr(ReadCache, "_snapshot", recording_snapshot)
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        _seed(db_session)
+        response = client.get("/api/staffs", cookies={"department": "1"})
+        assert response.status_code == 200
+        assert response.headers["etag"]
+    finally:
+        app.dependency_overrides.clear()
+
+    assert probe_threads and not loop_threads
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+# 确保后端路径在 sys.path 中
+BACKEND = os.path.join(os.path.dirname(__file__), "..", "backend")
+sys.path.append(BACKEND)
+
+from app.main import app  # noqa: E402
+
+
+def test_import_touches_neither_database_nor_reportlab(tmp_path):
+    """导入 app.main 不连接数据库、不创建 static 目录，也不加载 reportlab / Pillow。"""
+    database = tmp_path / "missing" / "db.sqlite"
+    code = (
+        "import sys, app.main; "
+        "print(sorted(m for m in ('reportlab', 'PIL') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path,
+        env={
+            **os.environ,
+            "PYTHONPATH": os.path.abspath(BACKEND),
+            "SQLITE_DATABASE_URL": f"sqlite:///{database}",
+        },
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
+    assert not (tmp_path / "static").exists()
+
+
+def test_health_reports_startup_phases():
+    """启动阶段在 lifespan 中计时，并通过 /health 返回。"""
+    with TestClient(app) as client:
+        data = client.get("/health").json()
+    assert data["status"] == "ok"
+    assert data["database"] == "ok"
+    assert {"import", "schema", "migrations", "startup"} <= set(data["startup"])
@@ -0,0 +1,109 @@
+import os
+import sys
+
+from sqlalchemy import text
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.models import Department, OvertimeWeek, Staff  # noqa: E402
+from app.services.overtime import (  # noqa: E402
+    DAY_TOKENS,
+    OvertimeService,
+    check_department_summary,
+    rebuild_department_summary,
+)
+
+
+def test_matrix_matches_per_department_statistics(db_session):
+    """矩阵一次返回所有部门、所有日期的计数，与逐个部门/日期的统计一致。"""
+    db_session.add_all(
+        [
+            Department(id=1, name="制造部"),
+            Department(id=2, name="品质部"),
+            Department(id=3, name="空部门"),
+        ]
+    )
+    db_session.add_all(
+        [
+            Staff(id=1, name="张三", department_id=1),
+            Staff(id=2, name="李四", department_id=1),
+            Staff(id=3, name="王五", department_id=2),
+        ]
+    )
+    # 李四没有周记录，按无加班计
+    db_session.add_all(
+        [
+            OvertimeWeek(staff_id=1, sat="bg-2", sun="bg-3"),
+            OvertimeWeek(staff_id=3, mon="bg-3", sat="bg-2"),
+        ]
+    )
+    db_session.commit()
+    service = OvertimeService(db_session)
+
+    matrix = service.get_statistics_matrix()
+    assert matrix["days"] == list(DAY_TOKENS)
+    rows = {row["department_id"]: row for row in matrix["departments"]}
+    assert rows[1]["days"]["sat"] == {"internal": 1, "trip": 0, "none": 1}
+    assert rows[1]["days"]["sun"] == {"internal": 0, "trip": 1, "none": 1}
+    assert rows[3]["total_staff"] == 0
+    assert rows[3]["days"]["mon"] == {"internal": 0, "trip": 0, "none": 0}
+
+    for department_id, row in rows.items():
+        for day in DAY_TOKENS:
+            counts = row["days"][day]
+            assert service.get_department_statistics(department_id, day) == {
+                "department_name": row["department_name"],
+                "total_staff": row["total_staff"],
+                "internal_overtime": counts["internal"],
+                "business_trip": counts["trip"],
+                "no_overtime": counts["none"],
+            }
+
+
+def test_summary_follows_writes_and_reports_drift(db_session):
+    """汇总表随状态修改、人员调动和删除保持一致；人为改坏后检查能发现并可重建。"""
+    db_session.add_all(
+        [Department(id=1, name="制造部"), Department(id=2, name="品质部")]
+    )
+    db_session.add_all(
+        [
+            Staff(id=1, name="张三", department_id=1),
+            Staff(id=2, name="李四", department_id=1),
+            Staff(id=3, name="王五", department_id=2),
+        ]
+    )
+    db_session.commit()
+    service = OvertimeService(db_session)
+    service.toggle_staff_status(1, "bg-2", "sat")
+    service.batch_toggle([(2, "bg-3", "sat"), (3, "bg-2", "sun")])
+    service.apply_to_all(2, "bg-3", "mon")
+
+    # 调动：张三连同本周状态一起转到品质部
+    db_session.get(Staff, 1).department_id = 2
+    db_session.commit()
+    db_session.execute(text("DELETE FROM overtime_weeks WHERE staff_id = 2"))
+    db_session.execute(text("DELETE FROM staffs WHERE id = 3"))
+    db_session.commit()
+
+    assert check_department_summary(db_session) == []
+    assert service.get_department_statistics(2, "sat") == {
+        "department_name": "品质部",
+        "total_staff": 1,
+        "internal_overtime": 1,
+        "business_trip": 0,
+        "no_overtime": 0,
+    }
+
+    db_session.execute(
+        text(
+            "UPDATE department_day_summary SET internal = internal + 5 "
+            "WHERE department_id = 2 AND day = 'sat'"
+        )
+    )
+    db_session.commit()
+    assert check_department_summary(db_session) == [
+        {"department_id": 2, "day": "sat", "expected": (1, 1, 0), "actual": (1, 6, 0)}
+    ]
+    rebuild_department_summary(db_session)
+    assert check_department_summary(db_session) == []
@@ -0,0 +1,115 @@
+import os
+import sys
+import threading
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# 确保后端路径在 sys.path 中
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.database import Base  # noqa: E402
+from app.models import Department, OvertimeWeek, Staff  # noqa: E402
+from app.services.overtime import OvertimeService  # noqa: E402
+from app.write_queue import WriteQueue  # noqa: E402
+
+
+@pytest.fixture
+def writer_env(temp_db):
+    engine = create_engine(
+        f"sqlite:///{temp_db}",
+        connect_args={"check_same_thread": False, "isolation_level": None},
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = session_factory()
+    db.add(Department(id=1, name="制造部"))
+    db.add_all([Staff(id=i, name=f"员工{i}", department_id=1) for i in range(1, 41)])
+    db.commit()
+    db.close()
+
+    try:
+        yield session_factory
+    finally:
+        engine.dispose()
+
+
+def test_group_commit_resolves_each_future(writer_env):
+    """同一窗口内的多个写入共享一次提交，各自拿到自己的结果。"""
+    session_factory = writer_env
+    writer = WriteQueue(session_factory, window_ms=200, max_batch=100)
+    writer.start()
+    try:
+        barrier = threading.Barrier(40)
+        futures = {}
+
+        def submit(staff_id):
+            barrier.wait()
+            futures[staff_id] = writer.submit(
+                lambda session: OvertimeService(session).toggle_staff_status(
+                    staff_id, "bg-2", "sat"
+                )
+                and staff_id
+            )
+
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(1, 41)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert {i: f.result(timeout=10) for i, f in futures.items()} == {
+            i: i for i in range(1, 41)
+        }
+        assert writer.units == 40
+        assert writer.batches < 40
+    finally:
+        writer.stop()
+
+    db = session_factory()
+    try:
+        assert db.query(OvertimeWeek).filter(OvertimeWeek.sat == "bg-2").count() == 40
+    finally:
+        db.close()
+
+
+def test_failed_unit_does_not_poison_batch(writer_env):
+    """单个失败的写入只回滚自己的 savepoint。"""
+    session_factory = writer_env
+    writer = WriteQueue(session_factory, window_ms=200)
+    writer.start()
+    try:
+        ok = writer.submit(
+            lambda session: OvertimeService(session).toggle_staff_status(
+                1, "bg-3", "sun"
+            )
+        )
+        missing = writer.submit(
+            lambda session: OvertimeService(session).toggle_staff_status(
+                999, "bg-3", "sun"
+            )
+        )
+        also_ok = writer.submit(
+            lambda session: OvertimeService(session).toggle_staff_status(
+                2, "bg-3", "sun"
+            )
+        )
+
+        assert ok.result(timeout=10) is True
+        assert also_ok.result(timeout=10) is True
+        with pytest.raises(HTTPException) as exc_info:
+            missing.result(timeout=10)
+        assert exc_info.value.status_code == 404
+        assert writer.batches == 1
+    finally:
+        writer.stop()
+
+    db = session_factory()
+    try:
+        rows = {w.staff_id: w.sun for w in db.query(OvertimeWeek).all()}
+        assert rows == {1: "bg-3", 2: "bg-3"}
+    finally:
+        db.close()